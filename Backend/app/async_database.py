@@ -0,0 +1,100 @@
+"""
+Async Database Access
+psycopg 3 connection pool for the async routers. Uses the same %s
+placeholders as psycopg2, so SQL can be shared with the sync services.
+"""
+
+from contextlib import asynccontextmanager
+from fastapi import HTTPException
+from psycopg.conninfo import make_conninfo
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool, PoolClosed
+from .config import (
+    DATABASE_URL,
+    DB_NAME,
+    DB_USER,
+    DB_PASSWORD,
+    DB_HOST,
+    DB_PORT,
+    DB_POOL_TIMEOUT,
+    DB_POOL_MAX_WAITERS,
+    ASYNC_DB_MIN_CONNECTIONS,
+    ASYNC_DB_MAX_CONNECTIONS,
+    DB_SHUTDOWN_TIMEOUT,
+)
+
+ASYNC_DB_POOL: AsyncConnectionPool | None = None
+# Set once shutdown has started; no new pool is created after that
+_POOL_CLOSING = False
+
+
+def _shutting_down() -> HTTPException:
+    return HTTPException(status_code=503, detail="Server is shutting down")
+
+
+def _conninfo() -> str:
+    if DATABASE_URL:
+        # Use DATABASE_URL for Render PostgreSQL
+        return DATABASE_URL
+    # Use individual connection parameters for local development
+    return make_conninfo(
+        dbname=DB_NAME,
+        user=DB_USER,
+        password=DB_PASSWORD,
+        host=DB_HOST,
+        port=DB_PORT,
+    )
+
+
+async def init_async_connection_pool() -> AsyncConnectionPool:
+    global ASYNC_DB_POOL
+    if _POOL_CLOSING:
+        raise _shutting_down()
+    if ASYNC_DB_POOL is None:
+        pool = AsyncConnectionPool(
+            _conninfo(),
+            min_size=ASYNC_DB_MIN_CONNECTIONS,
+            max_size=ASYNC_DB_MAX_CONNECTIONS,
+            timeout=DB_POOL_TIMEOUT,
+            max_waiting=DB_POOL_MAX_WAITERS,
+            kwargs={"row_factory": dict_row},
+            open=False,
+        )
+        await pool.open()
+        # Another task may have finished opening a pool, or shutdown may have
+        # started, while we awaited
+        if _POOL_CLOSING:
+            await pool.close()
+            raise _shutting_down()
+        if ASYNC_DB_POOL is None:
+            ASYNC_DB_POOL = pool
+        else:
+            await pool.close()
+    return ASYNC_DB_POOL
+
+
+async def close_async_connection_pool(timeout: float = DB_SHUTDOWN_TIMEOUT) -> None:
+    """Wait up to ``timeout`` seconds for borrowed connections, then close the pool.
+
+    Checkouts after this is called get a 503 instead of a new pool.
+    """
+    global ASYNC_DB_POOL, _POOL_CLOSING
+    _POOL_CLOSING = True
+    if ASYNC_DB_POOL is not None:
+        pool, ASYNC_DB_POOL = ASYNC_DB_POOL, None
+        await pool.close(timeout=timeout)
+
+
+@asynccontextmanager
+async def get_async_db_connection():
+    """Yield an async connection from the pool and return it after use.
+
+    Rows come back as plain dicts, like DictCursor rows on the sync path.
+    Raises a 503 once shutdown has started.
+    """
+    db_pool = ASYNC_DB_POOL or await init_async_connection_pool()
+    try:
+        async with db_pool.connection() as conn:
+            yield conn
+    except PoolClosed:
+        raise _shutting_down()
@@ -0,0 +1,168 @@
+"""
+In-Process Caches
+Thread-safe, bounded caches shared by the sync and async services
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from .config import (
+    JWT_CACHE_MAX_ENTRIES,
+    JWT_CACHE_TTL_SECONDS,
+    QUIZ_CACHE_MAX_ENTRIES,
+    QUIZ_CACHE_TTL_SECONDS,
+    USER_CACHE_MAX_ENTRIES,
+    USER_CACHE_TTL_SECONDS,
+)
+
+
+class VersionedLRUCache:
+    """Bounded LRU cache whose entries are tagged with a per-key content version.
+
+    Readers take ``version(key)`` before querying the database and hand it back
+    to ``put``. Writers call ``invalidate(key)`` after committing, which bumps
+    the version and drops the entry, so a value built from rows read before the
+    write is rejected instead of being cached under the new content.
+
+    Versions are stamps from one counter per cache, bumped by every
+    invalidation. Only the last ``max_invalidations`` invalidated keys keep
+    their own stamp; older ones are folded into ``_floor``, the newest stamp
+    forgotten so far. A key without its own stamp is treated as invalidated at
+    ``_floor``, so memory stays bounded and a stale put is still rejected. The
+    cost is that a read which spans more than ``max_invalidations`` other
+    invalidations is not cached.
+
+    ``ttl_seconds`` bounds how long an entry may be served; it keeps workers that
+    did not see a write from serving stale content indefinitely.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int,
+        ttl_seconds: float = 0,
+        max_invalidations: Optional[int] = None,
+    ):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_invalidations = max_invalidations or max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, tuple[int, float, Any]]" = OrderedDict()
+        # Stamp of each recently invalidated key, oldest first
+        self._invalidated: "OrderedDict[Hashable, int]" = OrderedDict()
+        self._clock = 0
+        self._floor = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    def version(self, key: Hashable) -> int:
+        """Version to hand back to ``put`` once the value for ``key`` is built."""
+        with self._lock:
+            return self._clock
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for ``key`` or ``None`` on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            version, expires_at, value = entry
+            if expires_at and expires_at <= time.monotonic():
+                del self._entries[key]
+                self._expirations += 1
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key: Hashable, version: int, value: Any, ttl_seconds: Optional[float] = None) -> bool:
+        """Cache ``value`` unless ``key`` was invalidated since ``version`` was read.
+
+        ``ttl_seconds`` overrides the cache-wide TTL for this entry.
+        """
+        if ttl_seconds is None:
+            ttl_seconds = self.ttl_seconds
+        with self._lock:
+            if self._invalidated.get(key, self._floor) > version:
+                return False
+            expires_at = time.monotonic() + ttl_seconds if ttl_seconds else 0.0
+            self._entries[key] = (version, expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+            return True
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop ``key`` and bump its version. Call after the write has committed."""
+        with self._lock:
+            self._clock += 1
+            self._invalidated[key] = self._clock
+            self._invalidated.move_to_end(key)
+            while len(self._invalidated) > self.max_invalidations:
+                _, self._floor = self._invalidated.popitem(last=False)
+            self._entries.pop(key, None)
+            self._invalidations += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "name": self.name,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / lookups, 4) if lookups else None,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "invalidations": self._invalidations,
+                "tracked_invalidations": len(self._invalidated),
+            }
+
+
+# Fully assembled getQuizQuestions payloads (utils.http_cache.CachedPayload),
+# keyed by quiz_id. Cached values are shared between requests and must not be
+# mutated by callers.
+quiz_content_cache = VersionedLRUCache(
+    "quiz_content", QUIZ_CACHE_MAX_ENTRIES, QUIZ_CACHE_TTL_SECONDS
+)
+
+# Compact answer keys used by server-side grading
+# (services.Grading_Services.AnswerKey), keyed by quiz_id
+answer_key_cache = VersionedLRUCache(
+    "answer_key", QUIZ_CACHE_MAX_ENTRIES, QUIZ_CACHE_TTL_SECONDS
+)
+
+
+def invalidate_quiz_content(quiz_id: int) -> None:
+    """Drop everything derived from a quiz's questions and answers."""
+    quiz_content_cache.invalidate(quiz_id)
+    answer_key_cache.invalidate(quiz_id)
+
+
+# Serialized getQuiz responses keyed by quiz_id, plus the getQuizzes list
+# under ALL_QUIZZES_KEY.
+ALL_QUIZZES_KEY = "all"
+quiz_cache = VersionedLRUCache("quiz", QUIZ_CACHE_MAX_ENTRIES, QUIZ_CACHE_TTL_SECONDS)
+
+# Authenticated principals (configAndAuth.get_user_principal) keyed by email;
+# configAndAuth.UNKNOWN_USER marks an email without a user
+user_principal_cache = VersionedLRUCache(
+    "user_principal", USER_CACHE_MAX_ENTRIES, USER_CACHE_TTL_SECONDS
+)
+
+# Verified JWT claims (configAndAuth.decode_access_token) keyed by the SHA-256
+# digest of the token; each entry lives until its token's exp
+verified_token_cache = VersionedLRUCache(
+    "verified_token", JWT_CACHE_MAX_ENTRIES, JWT_CACHE_TTL_SECONDS
+)
@@ -36,6 +36,118 @@ else:
 # Connection pool settings
 DB_MIN_CONNECTIONS: int = int(os.getenv("DB_MIN_CONNECTIONS", "1"))
 DB_MAX_CONNECTIONS: int = int(os.getenv("DB_MAX_CONNECTIONS", "10"))
+# Seconds a request may wait for a free connection before failing
+DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "5"))
+# Maximum number of requests allowed to queue for a connection at once
+DB_POOL_MAX_WAITERS: int = int(os.getenv("DB_POOL_MAX_WAITERS", "100"))
+# Open the pool in the background at startup instead of on the first request
+DB_WARMUP_ON_STARTUP: bool = os.getenv("DB_WARMUP_ON_STARTUP", "true").lower() in ("1", "true", "yes")
+# Seconds to wait on shutdown for in-flight queries before closing the pools
+DB_SHUTDOWN_TIMEOUT: float = float(os.getenv("DB_SHUTDOWN_TIMEOUT", "10"))
+
+# Async data-access path (psycopg 3). When enabled, the async routers take
+# precedence over the sync ones for the endpoints they implement.
+USE_ASYNC_DB: bool = os.getenv("USE_ASYNC_DB", "false").lower() in ("1", "true", "yes")
+ASYNC_DB_MIN_CONNECTIONS: int = int(os.getenv("ASYNC_DB_MIN_CONNECTIONS", "1"))
+ASYNC_DB_MAX_CONNECTIONS: int = int(os.getenv("ASYNC_DB_MAX_CONNECTIONS", "20"))
+
+# In-process cache of assembled quiz questions (getQuizQuestions)
+QUIZ_CACHE_MAX_ENTRIES: int = int(os.getenv("QUIZ_CACHE_MAX_ENTRIES", "512"))
+# Upper bound on staleness when another worker changed the quiz; 0 disables
+QUIZ_CACHE_TTL_SECONDS: float = float(os.getenv("QUIZ_CACHE_TTL_SECONDS", "60"))
+
+# Resolved users for get_current_user, keyed by token subject (email), with
+# unknown subjects cached as well. The TTL bounds how long a change made
+# outside this worker (another worker, or the database directly) goes unseen
+USER_CACHE_MAX_ENTRIES: int = int(os.getenv("USER_CACHE_MAX_ENTRIES", "10000"))
+USER_CACHE_TTL_SECONDS: float = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+
+# Verified access tokens, so a token presented again skips the signature check
+# until it expires. The TTL only applies to tokens without an exp claim;
+# JWT_CACHE_MAX_ENTRIES=0 disables the cache
+JWT_CACHE_MAX_ENTRIES: int = int(os.getenv("JWT_CACHE_MAX_ENTRIES", "10000"))
+JWT_CACHE_TTL_SECONDS: float = float(os.getenv("JWT_CACHE_TTL_SECONDS", "300"))
+
+# Group-commit ingestion for createSubmission and gradeSubmission: queue
+# submissions and write them in multi-row transactions of up to MAX_ROWS, at
+# most MAX_DELAY_MS after the first one arrives. Callers are acknowledged once
+# their batch has committed.
+SUBMISSION_BATCHING: bool = os.getenv("SUBMISSION_BATCHING", "false").lower() in ("1", "true", "yes")
+SUBMISSION_BATCH_MAX_ROWS: int = int(os.getenv("SUBMISSION_BATCH_MAX_ROWS", "200"))
+SUBMISSION_BATCH_MAX_DELAY_MS: float = float(os.getenv("SUBMISSION_BATCH_MAX_DELAY_MS", "10"))
+# Submissions allowed to wait for a batch before new ones get a 503
+SUBMISSION_QUEUE_MAX: int = int(os.getenv("SUBMISSION_QUEUE_MAX", "5000"))
+
+# Idempotency-Key support on create endpoints: how long responses are replayed,
+# how many are kept in memory, and when an unfinished claim counts as abandoned
+IDEMPOTENCY_TTL_SECONDS: float = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+IDEMPOTENCY_CACHE_MAX_ENTRIES: int = int(os.getenv("IDEMPOTENCY_CACHE_MAX_ENTRIES", "10000"))
+IDEMPOTENCY_IN_PROGRESS_SECONDS: float = float(os.getenv("IDEMPOTENCY_IN_PROGRESS_SECONDS", "60"))
+
+# In-process leaderboards: number of quizzes kept loaded, and the upper bound
+# on how long attempts committed by other workers stay invisible; 0 disables
+LEADERBOARD_MAX_QUIZZES: int = int(os.getenv("LEADERBOARD_MAX_QUIZZES", "128"))
+LEADERBOARD_TTL_SECONDS: float = float(os.getenv("LEADERBOARD_TTL_SECONDS", "300"))
+
+# Live leaderboard stream (streamLeaderboard): players pushed per quiz, the
+# minimum gap between pushes, how often the board is re-checked for attempts
+# committed by other workers, the keep-alive interval, and how many unsent
+# events a slow viewer may have before it is disconnected
+LEADERBOARD_STREAM_TOP_K: int = int(os.getenv("LEADERBOARD_STREAM_TOP_K", "10"))
+LEADERBOARD_STREAM_MIN_INTERVAL_MS: float = float(os.getenv("LEADERBOARD_STREAM_MIN_INTERVAL_MS", "250"))
+LEADERBOARD_STREAM_REFRESH_SECONDS: float = float(os.getenv("LEADERBOARD_STREAM_REFRESH_SECONDS", "30"))
+LEADERBOARD_STREAM_KEEPALIVE_SECONDS: float = float(os.getenv("LEADERBOARD_STREAM_KEEPALIVE_SECONDS", "15"))
+LEADERBOARD_STREAM_QUEUE_MAX: int = int(os.getenv("LEADERBOARD_STREAM_QUEUE_MAX", "64"))
+
+# createSubmission stores whatever score the client sends and is deprecated in
+# favour of gradeSubmission, which scores on the server. It answers 410 unless
+# this is set, for clients that have not moved over yet
+ALLOW_CLIENT_SCORED_SUBMISSIONS: bool = os.getenv("ALLOW_CLIENT_SCORED_SUBMISSIONS", "false").lower() in ("1", "true", "yes")
+
+# Longest series getSubmissionTimeSeries returns (hourly: about 83 days)
+TIME_SERIES_MAX_BUCKETS: int = int(os.getenv("TIME_SERIES_MAX_BUCKETS", "2000"))
+
+# Submission exports are read through a server-side cursor and encoded this
+# many rows at a time (also the Parquet row group size)
+EXPORT_BATCH_ROWS: int = int(os.getenv("EXPORT_BATCH_ROWS", "5000"))
+# Each running export holds a pooled connection and an open transaction until
+# the client has downloaded the last batch. At most EXPORT_MAX_CONCURRENT run
+# at once per process (more get a 503). In the export transaction, each fetch
+# may take EXPORT_STATEMENT_TIMEOUT_MS and a client may stall between batches
+# for EXPORT_IDLE_TIMEOUT_MS before the database ends it
+EXPORT_MAX_CONCURRENT: int = int(os.getenv("EXPORT_MAX_CONCURRENT", "2"))
+EXPORT_STATEMENT_TIMEOUT_MS: int = int(os.getenv("EXPORT_STATEMENT_TIMEOUT_MS", "30000"))
+EXPORT_IDLE_TIMEOUT_MS: int = int(os.getenv("EXPORT_IDLE_TIMEOUT_MS", "60000"))
+
+# Bulk quiz import limits
+IMPORT_MAX_QUESTIONS: int = int(os.getenv("IMPORT_MAX_QUESTIONS", "1000"))
+IMPORT_MAX_FILE_MB: int = int(os.getenv("IMPORT_MAX_FILE_MB", "10"))
+
+# bcrypt runs in PASSWORD_WORKERS processes (0 = inline on the request
+# thread). Default: half the cores, leaving the rest for other requests.
+# Calls beyond PASSWORD_QUEUE_MAX running or waiting are rejected with a 503
+PASSWORD_WORKERS: int = int(os.getenv("PASSWORD_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+PASSWORD_QUEUE_MAX: int = int(os.getenv("PASSWORD_QUEUE_MAX", "32"))
+
+# bcrypt cost factor for new hashes. Stored hashes with another cost (or
+# legacy plaintext) are rehashed after the user's next successful login.
+# `python -m app.maintenance calibrate-bcrypt` suggests the highest cost whose
+# hash takes at most BCRYPT_TARGET_MS on the current hardware
+BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+BCRYPT_TARGET_MS: float = float(os.getenv("BCRYPT_TARGET_MS", "250"))
+
+# Where rate limit counters live. The default keeps them in each process, so
+# with several uvicorn workers every limit is effectively multiplied by the
+# worker count. "shm:///dev/shm/quiz-rate-limits" shares one table between
+# all workers on the host (app.rate_limit_storage); SLOTS bounds the number of
+# tracked keys (40 bytes each) and STRIPES the number of independent locks
+RATE_LIMIT_STORAGE_URI: str = os.getenv("RATE_LIMIT_STORAGE_URI", "memory://")
+RATE_LIMIT_SHM_SLOTS: int = int(os.getenv("RATE_LIMIT_SHM_SLOTS", "65536"))
+RATE_LIMIT_SHM_STRIPES: int = int(os.getenv("RATE_LIMIT_SHM_STRIPES", "64"))
+# How hits are counted: "sliding-window-counter" weighs the previous fixed
+# window by its overlap with the last full period, so a client cannot send
+# twice the limit across a window boundary; "fixed-window" is the old behaviour
+RATE_LIMIT_STRATEGY: str = os.getenv("RATE_LIMIT_STRATEGY", "sliding-window-counter")
 
 # JWT configuration
 JWT_SECRET_KEY: str = os.getenv("JWT_SECRET_KEY", "PROJECT")
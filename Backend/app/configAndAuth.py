@@ -1,11 +1,18 @@
+from typing import Optional
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer
 from .database import get_db_connection
+from .cache import user_principal_cache, verified_token_cache
+from .password_pool import get_password_pool
+from .config import BCRYPT_ROUNDS
 import psycopg2.extras
+import hashlib
 import os
+import time
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -17,27 +24,43 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRES_MINUTES = int(os.getenv("JWT_EXPIRES_MINUTES", "60"))
 
 # Password hashing
-# Use only bcrypt to avoid compatibility issues
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Use only bcrypt to avoid compatibility issues. Hashes with any other cost
+# report needs_update and are replaced on the next login
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+
+# Lowest cost calibrate_bcrypt_rounds will suggest, however slow the hardware
+BCRYPT_MIN_ROUNDS = 10
+
+# Columns needed to check a login, and the subset kept for authenticated requests
+USER_CREDENTIALS_SQL = "SELECT user_id, user_email, hashed_password FROM users WHERE user_email = %s"
+USER_PRINCIPAL_SQL = "SELECT user_id, user_email, created_at FROM users WHERE user_email = %s"
+
+# Cached in place of a principal for a subject that has no user row
+UNKNOWN_USER = object()
 
 # OAuth2 (token will be provided via /login)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/Users/login")
+# Same, but yields None instead of a 401 when no token is sent
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/Users/login", auto_error=False)
 
 
 # -------------------
 # Utility functions
 # -------------------
-def verify_password(plain_password, hashed_password: str) -> bool:
-    """Check if plain password matches the hashed password"""
-    # Handle plain text passwords (legacy data)
-    if not hashed_password.startswith('$2b$') and not hashed_password.startswith('$2a$'):
-        # Plain text password - direct comparison
-        return plain_password == hashed_password
-    
+def _bcrypt_input(password: str) -> str:
     # Truncate password to 72 bytes if longer (bcrypt limitation)
-    if len(plain_password.encode('utf-8')) > 72:
-        plain_password = plain_password.encode('utf-8')[:72].decode('utf-8', errors='ignore')
-    
+    password_bytes = password.encode('utf-8')
+    if len(password_bytes) > 72:
+        return password_bytes[:72].decode('utf-8', errors='ignore')
+    return password
+
+
+def is_bcrypt_hash(hashed_password: str) -> bool:
+    return hashed_password.startswith('$2b$') or hashed_password.startswith('$2a$')
+
+
+# The two functions below run in the password worker processes (password_pool.py)
+def _verify_bcrypt(plain_password: str, hashed_password: str) -> bool:
     try:
         return pwd_context.verify(plain_password, hashed_password)
     except Exception as e:
@@ -45,13 +68,7 @@ def verify_password(plain_password, hashed_password: str) -> bool:
         return False
 
 
-def get_password_hash(password: str) -> str:
-    """Hash a password before storing in DB"""
-    # Truncate password to 72 bytes if longer (bcrypt limitation)
-    password_bytes = password.encode('utf-8')
-    if len(password_bytes) > 72:
-        password = password_bytes[:72].decode('utf-8', errors='ignore')
-        print(f"⚠️ Password truncated from {len(password_bytes)} to 72 bytes")
+def _hash_bcrypt(password: str) -> str:
     try:
         return pwd_context.hash(password)
     except Exception as e:
@@ -59,6 +76,74 @@ def get_password_hash(password: str) -> str:
         raise
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True for legacy plaintext and for hashes made with another cost factor."""
+    return not is_bcrypt_hash(hashed_password) or pwd_context.needs_update(hashed_password)
+
+
+def calibrate_bcrypt_rounds(target_ms: float, samples: int = 3):
+    """Highest cost factor whose hash takes at most ``target_ms`` here.
+
+    Returns ``(rounds, timings)`` where ``timings`` maps each cost tried to its
+    median milliseconds. Never suggests less than BCRYPT_MIN_ROUNDS.
+    """
+    timings = {}
+    rounds = BCRYPT_MIN_ROUNDS
+    for candidate in range(4, 32):
+        context = pwd_context.copy(bcrypt__rounds=candidate)
+        durations = []
+        for _ in range(samples):
+            started = time.perf_counter()
+            context.hash("calibration password")
+            durations.append((time.perf_counter() - started) * 1000)
+        timings[candidate] = sorted(durations)[samples // 2]
+        if timings[candidate] > target_ms:
+            break
+        rounds = max(rounds, candidate)
+    return rounds, timings
+
+
+def _run_password_work(fn, *args):
+    pool = get_password_pool()
+    return pool.run(fn, *args) if pool is not None else fn(*args)
+
+
+async def _run_password_work_async(fn, *args):
+    pool = get_password_pool()
+    if pool is None:
+        return await run_in_threadpool(fn, *args)
+    return await pool.run_async(fn, *args)
+
+
+def verify_password(plain_password, hashed_password: str) -> bool:
+    """Check if plain password matches the hashed password"""
+    # Handle plain text passwords (legacy data)
+    if not is_bcrypt_hash(hashed_password):
+        # Plain text password - direct comparison
+        return plain_password == hashed_password
+    return _run_password_work(_verify_bcrypt, _bcrypt_input(plain_password), hashed_password)
+
+
+async def verify_password_async(plain_password, hashed_password: str) -> bool:
+    """``verify_password`` for async callers; does not hold a threadpool thread."""
+    if not is_bcrypt_hash(hashed_password):
+        return plain_password == hashed_password
+    return await _run_password_work_async(
+        _verify_bcrypt, _bcrypt_input(plain_password), hashed_password
+    )
+
+
+def get_password_hash(password: str) -> str:
+    """Hash a password before storing in DB"""
+    password = _bcrypt_input(password)
+    return _run_password_work(_hash_bcrypt, password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """``get_password_hash`` for async callers."""
+    return await _run_password_work_async(_hash_bcrypt, _bcrypt_input(password))
+
+
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     """Create JWT token"""
     to_encode = data.copy()
@@ -69,17 +154,41 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
+def _invalid_token() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid or expired token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
 def decode_access_token(token: str):
-    """Decode and validate JWT"""
+    """Decode and validate JWT
+
+    Verified claims are cached by token digest until the token's exp; only
+    tokens that pass verification are cached.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    cached = verified_token_cache.get(key)
+    if cached is not None:
+        # The exp check jwt.decode makes (whole seconds, expired once now > exp),
+        # against the wall clock rather than the cache's monotonic one
+        if "exp" in cached and int(cached["exp"]) < int(time.time()):
+            raise _invalid_token()
+        return dict(cached)
+
+    version = verified_token_cache.version(key)
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except JWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise _invalid_token()
+
+    ttl = None
+    if "exp" in payload:
+        ttl = int(payload["exp"]) + 1 - time.time()
+    if ttl is None or ttl > 0:
+        verified_token_cache.put(key, version, dict(payload), ttl)
+    return payload
 
 
 # -------------------
@@ -89,12 +198,38 @@ def get_user_from_db(email: str):
     """Fetch user by email from PostgreSQL"""
     with get_db_connection() as conn:
         cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
-        cur.execute("SELECT * FROM users WHERE user_email = %s", (email,))
+        cur.execute(USER_CREDENTIALS_SQL, (email,))
         user = cur.fetchone()
         cur.close()
         return user
 
 
+def get_user_principal(email: str):
+    """User id, email and creation time for ``email``, or None if there is no such user.
+
+    Served from user_principal_cache when possible; a miss costs one query.
+    """
+    cached = user_principal_cache.get(email)
+    if cached is not None:
+        return None if cached is UNKNOWN_USER else dict(cached)
+
+    version = user_principal_cache.version(email)
+    with get_db_connection() as conn:
+        cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
+        cur.execute(USER_PRINCIPAL_SQL, (email,))
+        row = cur.fetchone()
+        cur.close()
+
+    principal = dict(row) if row is not None else None
+    user_principal_cache.put(email, version, principal if principal is not None else UNKNOWN_USER)
+    return dict(principal) if principal is not None else None
+
+
+def invalidate_user(email: str) -> None:
+    """Forget the cached principal for ``email``. Call after committing a change to the user."""
+    user_principal_cache.invalidate(email)
+
+
 def authenticate_user(email: str, password: str):
     """Check email + password against DB"""
     user = get_user_from_db(email)
@@ -114,7 +249,12 @@ def get_current_user(token: str = Depends(oauth2_scheme)):
     if email is None:
         raise HTTPException(status_code=401, detail="Invalid authentication")
 
-    user = get_user_from_db(email)
+    user = get_user_principal(email)
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
     return user
+
+
+def get_optional_user(token: Optional[str] = Depends(optional_oauth2_scheme)):
+    """``get_current_user`` for routes that also serve anonymous requests; None without a token."""
+    return get_current_user(token) if token else None
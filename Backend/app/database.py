@@ -1,6 +1,11 @@
+import logging
+import threading
+import time
+from collections import deque
 import psycopg2
-from psycopg2 import pool
+from psycopg2 import extensions, pool
 from contextlib import contextmanager
+from fastapi import HTTPException
 from .config import (
     DATABASE_URL,
     DB_NAME,
@@ -10,74 +15,280 @@ from .config import (
     DB_PORT,
     DB_MIN_CONNECTIONS,
     DB_MAX_CONNECTIONS,
+    DB_POOL_TIMEOUT,
+    DB_POOL_MAX_WAITERS,
+    DB_SHUTDOWN_TIMEOUT,
 )
 
-DB_POOL: pool.SimpleConnectionPool | None = None
 
-def init_connection_pool() -> None:
+class PoolTimeout(pool.PoolError):
+    """Raised when no connection could be checked out within the pool timeout."""
+
+
+class BoundedConnectionPool:
+    """Thread-safe connection pool with a bounded, first-come-first-served wait queue.
+
+    ``SimpleConnectionPool`` is not thread-safe and ``ThreadedConnectionPool``
+    raises as soon as every connection is checked out. Here a checkout that finds
+    the pool exhausted waits up to ``timeout`` seconds for a connection to be
+    returned. Waiters are served strictly in arrival order and at most
+    ``max_waiters`` threads may queue at once; beyond that we fail fast.
+    """
+
+    def __init__(self, minconn, maxconn, *args, timeout=5.0, max_waiters=100, **kwargs):
+        self.minconn = int(minconn)
+        self.maxconn = int(maxconn)
+        self.timeout = timeout
+        self.max_waiters = max_waiters
+        self.closed = False
+
+        self._args = args
+        self._kwargs = kwargs
+
+        self._lock = threading.Lock()
+        self._idle = []
+        self._in_use = set()  # id(conn) of checked-out connections
+        self._opening = 0  # slots reserved by threads that are connecting
+        self._waiters = deque()
+        self._all_returned = threading.Condition(self._lock)
+
+        for _ in range(self.minconn):
+            self._idle.append(self._connect())
+
+    def _connect(self):
+        return psycopg2.connect(*self._args, **self._kwargs)
+
+    def _size(self) -> int:
+        return len(self._idle) + len(self._in_use) + self._opening
+
+    def _checkout_locked(self):
+        """Take an idle connection or reserve a slot for a new one (lock held).
+
+        Returns the connection, ``True`` when a new connection must be opened,
+        or ``None`` when the pool is exhausted.
+        """
+        while self._idle:
+            conn = self._idle.pop()
+            if conn.closed:
+                continue
+            self._in_use.add(id(conn))
+            return conn
+        if self._size() < self.maxconn:
+            self._opening += 1
+            return True
+        return None
+
+    def _notify_next_locked(self) -> None:
+        """Hand the freed capacity to the longest-waiting thread (lock held)."""
+        if self._waiters and (self._idle or self._size() < self.maxconn):
+            self._waiters[0].notify()
+
+    def getconn(self, timeout: float | None = None):
+        """Check out a connection, waiting up to ``timeout`` seconds if exhausted."""
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+
+        with self._lock:
+            if self.closed:
+                raise pool.PoolError("connection pool is closed")
+
+            # New arrivals only skip the queue when nobody is already waiting
+            result = None if self._waiters else self._checkout_locked()
+
+            if result is None:
+                if len(self._waiters) >= self.max_waiters:
+                    raise PoolTimeout("connection pool exhausted and wait queue is full")
+
+                waiter = threading.Condition(self._lock)
+                self._waiters.append(waiter)
+                try:
+                    while True:
+                        if self._waiters[0] is waiter:
+                            result = self._checkout_locked()
+                            if result is not None:
+                                break
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            raise PoolTimeout(
+                                f"no database connection available within {self.timeout}s"
+                            )
+                        waiter.wait(remaining)
+                        if self.closed:
+                            raise pool.PoolError("connection pool is closed")
+                finally:
+                    self._waiters.remove(waiter)
+                    self._notify_next_locked()
+
+        if result is not True:
+            return result
+
+        # Open the new connection outside the lock so returns are not blocked
+        try:
+            conn = self._connect()
+        except Exception:
+            with self._lock:
+                self._opening -= 1
+                self._notify_next_locked()
+            raise
+        with self._lock:
+            self._opening -= 1
+            self._in_use.add(id(conn))
+        return conn
+
+    def putconn(self, conn, close: bool = False) -> None:
+        """Return a connection to the pool, resetting any open transaction."""
+        if not (close or self.closed or conn.closed):
+            status = conn.info.transaction_status
+            if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+                # Server connection lost
+                close = True
+            elif status != extensions.TRANSACTION_STATUS_IDLE:
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    close = True
+
+        with self._lock:
+            self._in_use.discard(id(conn))
+            if close or self.closed or conn.closed:
+                conn.close()
+            else:
+                self._idle.append(conn)
+            if not self._in_use:
+                self._all_returned.notify_all()
+            self._notify_next_locked()
+
+    def drain(self, timeout: float) -> bool:
+        """Wait up to ``timeout`` seconds for every checked-out connection to return."""
+        with self._lock:
+            return self._all_returned.wait_for(lambda: not self._in_use, timeout)
+
+    def closeall(self) -> None:
+        """Close idle connections; checked-out ones are closed when returned."""
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+            for conn in self._idle:
+                conn.close()
+            self._idle.clear()
+            for waiter in self._waiters:
+                waiter.notify()
+
+
+DB_POOL: BoundedConnectionPool | None = None
+_POOL_INIT_LOCK = threading.Lock()
+# Set once shutdown has started; no new pool is created after that
+_POOL_CLOSING = False
+
+
+def _shutting_down() -> HTTPException:
+    return HTTPException(status_code=503, detail="Server is shutting down")
+
+
+def init_connection_pool() -> BoundedConnectionPool:
     global DB_POOL
-    if DB_POOL is None:
+    with _POOL_INIT_LOCK:
+        if _POOL_CLOSING:
+            raise _shutting_down()
+        if DB_POOL is not None:
+            return DB_POOL
         if DATABASE_URL:
             # Use DATABASE_URL for Render PostgreSQL
-            DB_POOL = pool.SimpleConnectionPool(
-                minconn=DB_MIN_CONNECTIONS,
-                maxconn=DB_MAX_CONNECTIONS,
+            DB_POOL = BoundedConnectionPool(
+                DB_MIN_CONNECTIONS,
+                DB_MAX_CONNECTIONS,
                 dsn=DATABASE_URL,
+                timeout=DB_POOL_TIMEOUT,
+                max_waiters=DB_POOL_MAX_WAITERS,
             )
         else:
             # Use individual connection parameters for local development
-            DB_POOL = pool.SimpleConnectionPool(
-                minconn=DB_MIN_CONNECTIONS,
-                maxconn=DB_MAX_CONNECTIONS,
+            DB_POOL = BoundedConnectionPool(
+                DB_MIN_CONNECTIONS,
+                DB_MAX_CONNECTIONS,
                 dbname=DB_NAME,
                 user=DB_USER,
                 password=DB_PASSWORD,
                 host=DB_HOST,
                 port=DB_PORT,
+                timeout=DB_POOL_TIMEOUT,
+                max_waiters=DB_POOL_MAX_WAITERS,
             )
+        return DB_POOL
+
 
 @contextmanager
 def get_db_connection():
-    """Yield a database connection from the pool and return it after use."""
-    if DB_POOL is None:
-        init_connection_pool()
+    """Yield a database connection from the pool and return it after use.
 
-    assert DB_POOL is not None
-    conn = DB_POOL.getconn()
+    Raises a 503 once shutdown has started.
+    """
+    # The connection goes back to the pool it came from, even if shutdown
+    # has detached that pool from DB_POOL in the meantime
+    db_pool = DB_POOL or init_connection_pool()
+    try:
+        conn = db_pool.getconn()
+    except pool.PoolError:
+        if db_pool.closed:
+            raise _shutting_down()
+        raise
     try:
         yield conn
     finally:
-        DB_POOL.putconn(conn)
+        db_pool.putconn(conn)
+
+
+def close_connection_pool(timeout: float = DB_SHUTDOWN_TIMEOUT) -> None:
+    """Let in-flight queries finish (up to ``timeout`` seconds), then close the pool.
+
+    Checkouts after this is called get a 503 instead of a new pool.
+    """
+    global DB_POOL, _POOL_CLOSING
+    with _POOL_INIT_LOCK:
+        _POOL_CLOSING = True
+        db_pool, DB_POOL = DB_POOL, None
+    if db_pool is None:
+        return
+    if not db_pool.drain(timeout):
+        logging.warning("Closing database pool with connections still checked out")
+    db_pool.closeall()
+
 
-try:
-    with get_db_connection() as conn:
+def warm_up_connection_pool() -> bool:
+    """Open the pool and check one connection so the first request does not pay for it.
+
+    Called in the background from the app lifespan; a failure is logged with
+    setup hints instead of stopping the process, and the pool is retried
+    lazily by the next request.
+    """
+    try:
+        with get_db_connection() as conn:
+            conn.cursor().execute("SELECT 1")
+        if DATABASE_URL:
+            logging.info("✅ Successfully connected to Render PostgreSQL database: %s", DB_NAME)
+        else:
+            logging.info("✅ Successfully connected to database: %s", DB_NAME)
+        return True
+    except psycopg2.OperationalError as e:
+        hint = [
+            "❌ DATABASE CONNECTION FAILED!",
+            f"Error: {str(e)}",
+            "💡 SOLUTION:",
+        ]
         if DATABASE_URL:
-            print(f"✅ Successfully connected to database: {DB_NAME}")
-            print(f"✅ Successfully connected to Render PostgreSQL database")
+            hint += [
+                "   Render DATABASE_URL is set but connection failed.",
+                "   Check if your Render PostgreSQL database is running and accessible.",
+            ]
         else:
-            print(f"✅ Successfully connected to database: {DB_NAME}")
-except psycopg2.OperationalError as e:
-    print("\n" + "=" * 70)
-    print("❌ DATABASE CONNECTION FAILED!")
-    print("=" * 70)
-    print(f"Error: {str(e)}")
-    print("\n💡 SOLUTION:")
-    if DATABASE_URL:
-        print("   Render DATABASE_URL is set but connection failed.")
-        print("   Check if your Render PostgreSQL database is running and accessible.")
-    else:
-        print("   1. Create a file named '.env' in the Backend folder")
-        print("   2. Add your database credentials:")
-        print(f"      DB_NAME={DB_NAME}")
-        print(f"      DB_USER={DB_USER}")
-        print(f"      DB_PASSWORD=YOUR_ACTUAL_POSTGRES_PASSWORD")
-        print(f"      DB_HOST={DB_HOST}")
-        print(f"      DB_PORT={DB_PORT}")
-        print("\n   Example .env file content:")
-        print("   DB_NAME=QuizApp")
-        print("   DB_USER=postgres")
-        print("   DB_PASSWORD=your_actual_password")
-        print("   DB_HOST=localhost")
-        print("   DB_PORT=5432")
-    print("=" * 70 + "\n")
-    raise
+            hint += [
+                "   1. Create a file named '.env' in the Backend folder",
+                "   2. Add your database credentials:",
+                f"      DB_NAME={DB_NAME}",
+                f"      DB_USER={DB_USER}",
+                "      DB_PASSWORD=YOUR_ACTUAL_POSTGRES_PASSWORD",
+                f"      DB_HOST={DB_HOST}",
+                f"      DB_PORT={DB_PORT}",
+            ]
+        logging.error("\n".join(hint))
+        return False
@@ -0,0 +1,193 @@
+"""
+In-Process Leaderboards
+Ordered best-attempt-per-user rankings, loaded from the quiz_leaderboard
+summary table and updated incrementally as submissions are committed
+"""
+
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, List, Optional
+
+from .config import LEADERBOARD_MAX_QUIZZES, LEADERBOARD_TTL_SECONDS
+
+
+class QuizLeaderboard:
+    """Best attempt per user for one quiz, kept in rank order.
+
+    Players are ordered by best score (highest first), then by when that score
+    was reached (earliest first), then by user_id so every player has a distinct
+    position. ``_keys`` holds the sort key of every player in that order, so a
+    rank lookup or the start of a page is a binary search.
+    """
+
+    __slots__ = ("_keys", "_entries", "_lock")
+
+    def __init__(self, rows=()):
+        # rows must arrive in rank order (see LEADERBOARD_LOAD_SQL)
+        self._keys = []
+        self._entries = {}
+        for row in rows:
+            key = self.sort_key(row["best_score"], row["submitted_at"], row["user_id"])
+            self._keys.append(key)
+            self._entries[row["user_id"]] = (key, row["submission_id"])
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def sort_key(score: int, submitted_at: datetime, user_id: int) -> tuple:
+        return (-score, submitted_at, user_id)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def offer(self, user_id: int, score: int, submitted_at: datetime, submission_id: int) -> bool:
+        """Record an attempt; returns True if it is the user's new best.
+
+        Offering the same attempt twice is a no-op.
+        """
+        key = self.sort_key(score, submitted_at, user_id)
+        with self._lock:
+            current = self._entries.get(user_id)
+            if current is not None:
+                if current[0] <= key:
+                    return False
+                del self._keys[bisect_left(self._keys, current[0])]
+            insort(self._keys, key)
+            self._entries[user_id] = (key, submission_id)
+            return True
+
+    def rank(self, user_id: int) -> Optional[dict]:
+        """Rank and best attempt of ``user_id``, or None if they have no attempts."""
+        with self._lock:
+            current = self._entries.get(user_id)
+            if current is None:
+                return None
+            key, submission_id = current
+            return self._entry(bisect_left(self._keys, key) + 1, key, submission_id)
+
+    def page(self, limit: int, after: Optional[tuple] = None) -> List[dict]:
+        """Up to ``limit`` players ranked after the sort key ``after``."""
+        with self._lock:
+            start = bisect_right(self._keys, after) if after is not None else 0
+            return [
+                self._entry(start + offset + 1, key, self._entries[key[2]][1])
+                for offset, key in enumerate(self._keys[start:start + limit])
+            ]
+
+    @staticmethod
+    def _entry(rank: int, key: tuple, submission_id: int) -> dict:
+        return {
+            "rank": rank,
+            "user_id": key[2],
+            "best_score": -key[0],
+            "submitted_at": key[1],
+            "submission_id": submission_id,
+        }
+
+
+class LeaderboardRegistry:
+    """Bounded LRU of loaded leaderboards, keyed by quiz_id.
+
+    A leaderboard is loaded from the database on first use and then kept
+    current by ``offer`` calls made after each submission commits. Offers for a
+    quiz that is being loaded are queued and replayed onto the loaded board, so
+    attempts committed while the load query ran are not lost. ``ttl_seconds``
+    bounds how long attempts committed by other workers can stay invisible.
+    """
+
+    def __init__(self, max_quizzes: int, ttl_seconds: float = 0):
+        self.max_quizzes = max_quizzes
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._boards: "OrderedDict[int, tuple[float, QuizLeaderboard]]" = OrderedDict()
+        self._pending: dict[int, list] = {}
+        self._listeners: List[Callable[[int], None]] = []
+        self._hits = 0
+        self._loads = 0
+        self._evictions = 0
+
+    def get(self, quiz_id: int) -> Optional[QuizLeaderboard]:
+        """The loaded leaderboard for ``quiz_id``, or None if it must be (re)loaded."""
+        with self._lock:
+            entry = self._boards.get(quiz_id)
+            if entry is None:
+                return None
+            expires_at, board = entry
+            if expires_at and expires_at <= time.monotonic():
+                del self._boards[quiz_id]
+                return None
+            self._boards.move_to_end(quiz_id)
+            self._hits += 1
+            return board
+
+    def begin_load(self, quiz_id: int) -> None:
+        """Start queueing offers for ``quiz_id``. Call before the load query."""
+        with self._lock:
+            self._pending.setdefault(quiz_id, [])
+
+    def cancel_load(self, quiz_id: int) -> None:
+        """Stop queueing offers after a failed load."""
+        with self._lock:
+            self._pending.pop(quiz_id, None)
+
+    def install(self, quiz_id: int, board: QuizLeaderboard) -> QuizLeaderboard:
+        """Store a freshly loaded board and return the board to use.
+
+        If another request installed one while this one was loading, that board
+        is kept and returned instead.
+        """
+        with self._lock:
+            self._loads += 1
+            pending = self._pending.pop(quiz_id, ())
+            entry = self._boards.get(quiz_id)
+            if entry is not None:
+                return entry[1]
+            for offer in pending:
+                board.offer(*offer)
+            expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else 0.0
+            self._boards[quiz_id] = (expires_at, board)
+            while len(self._boards) > self.max_quizzes:
+                self._boards.popitem(last=False)
+                self._evictions += 1
+            return board
+
+    def offer(self, quiz_id: int, user_id: int, score: int, submitted_at: datetime, submission_id: int) -> None:
+        """Apply a committed attempt to the quiz's board if it is loaded or loading."""
+        with self._lock:
+            entry = self._boards.get(quiz_id)
+            pending = self._pending.get(quiz_id)
+            if pending is not None:
+                pending.append((user_id, score, submitted_at, submission_id))
+        if entry is not None and entry[1].offer(user_id, score, submitted_at, submission_id):
+            for listener in self._listeners:
+                listener(quiz_id)
+
+    def add_listener(self, listener: Callable[[int], None]) -> None:
+        """Call ``listener(quiz_id)`` whenever an offer changes a loaded board.
+
+        Listeners run on the thread that made the offer and must not block.
+        """
+        self._listeners.append(listener)
+
+    def invalidate(self, quiz_id: int) -> None:
+        """Forget a quiz's board, e.g. after the quiz was deleted."""
+        with self._lock:
+            self._boards.pop(quiz_id, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "name": "leaderboard",
+                "size": len(self._boards),
+                "max_entries": self.max_quizzes,
+                "ttl_seconds": self.ttl_seconds,
+                "players": sum(len(board) for _, board in self._boards.values()),
+                "hits": self._hits,
+                "loads": self._loads,
+                "evictions": self._evictions,
+            }
+
+
+leaderboards = LeaderboardRegistry(LEADERBOARD_MAX_QUIZZES, LEADERBOARD_TTL_SECONDS)
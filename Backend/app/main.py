@@ -1,4 +1,7 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import HTTPException
 import logging
@@ -9,11 +12,23 @@ from .routers import (
     Quiz_routers,
     Answer_routers,
     PDF_MCQ_routers,
+    Metrics_routers,
+    Async_User_routers,
+    Async_Submission_routers,
+    Async_Question_routers,
+    Async_Quiz_routers,
+    Async_Answer_routers,
 )
+from .config import USE_ASYNC_DB, DB_WARMUP_ON_STARTUP
+from .database import close_connection_pool, warm_up_connection_pool
+from .async_database import init_async_connection_pool, close_async_connection_pool
+from .services.PDF_MCQ_Services import init_groq_llm, close_groq_llm
+from .services.Submission_Batch_Services import close_submission_writer
+from .services.Leaderboard_Stream_Services import leaderboard_broadcaster
+from .password_pool import close_password_pool
 from fastapi.middleware.cors import CORSMiddleware
-from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
-from .rate_limiter import limiter
+from .rate_limiter import limiter, rate_limit_exceeded_handler
 from pathlib import Path
 from dotenv import load_dotenv
 import os
@@ -27,11 +42,41 @@ logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
 )
 
-app = FastAPI(title="Quiz App API")
+
+async def _warm_up():
+    """Open the database pools and create the LLM client in the background."""
+    await run_in_threadpool(warm_up_connection_pool)
+    if USE_ASYNC_DB:
+        try:
+            await init_async_connection_pool()
+        except Exception as e:
+            logging.error("Async database pool warm-up failed: %s", e)
+    await run_in_threadpool(init_groq_llm)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Nothing connects at import time; pools are created lazily on first use,
+    # or here in the background so the port is bound immediately.
+    warm_up_task = asyncio.create_task(_warm_up()) if DB_WARMUP_ON_STARTUP else None
+    yield
+    if warm_up_task is not None and not warm_up_task.done():
+        warm_up_task.cancel()
+    leaderboard_broadcaster.close()
+    # Uvicorn has stopped accepting requests; commit queued submissions and
+    # let in-flight queries drain
+    await run_in_threadpool(close_submission_writer)
+    await run_in_threadpool(close_password_pool)
+    await close_async_connection_pool()
+    await run_in_threadpool(close_connection_pool)
+    close_groq_llm()
+
+
+app = FastAPI(title="Quiz App API", lifespan=lifespan)
 
 # Add rate limiter to app state
 app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
 
 
 @app.exception_handler(HTTPException)
@@ -49,6 +94,8 @@ async def http_exception_handler(request: Request, exc: HTTPException):
                 "path": str(request.url.path),
             },
         },
+        # e.g. Retry-After on 503s, WWW-Authenticate on 401s
+        headers=exc.headers,
     )
 
 
@@ -93,12 +140,22 @@ app.add_middleware(
     expose_headers=["*"],
 )
 
+# With USE_ASYNC_DB the async routers are registered first, so they serve every
+# endpoint they implement; the sync routers still answer the remaining ones.
+if USE_ASYNC_DB:
+    app.include_router(Async_User_routers.router, tags=["Users"])
+    app.include_router(Async_Submission_routers.router, tags=["Submissions"])
+    app.include_router(Async_Question_routers.router, tags=["Questions"])
+    app.include_router(Async_Quiz_routers.router, tags=["Quizzes"])
+    app.include_router(Async_Answer_routers.router, tags=["Answers"])
+
 app.include_router(User_routers.router, tags=["Users"])
 app.include_router(Submission_routers.router, tags=["Submissions"])
 app.include_router(Question_routers.router, tags=["Questions"])
 app.include_router(Quiz_routers.router, tags=["Quizzes"])
 app.include_router(Answer_routers.router, tags=["Answers"])
 app.include_router(PDF_MCQ_routers.router, tags=["PDF MCQ Generator"])
+app.include_router(Metrics_routers.router, tags=["Metrics"])
 
 @app.get("/")
 def home():
@@ -0,0 +1,104 @@
+"""
+Maintenance Commands
+Create the summary tables and indexes, and recompute them from the base
+tables, e.g. after bulk imports or manual data fixes.
+
+Usage:
+    python -m app.maintenance migrate
+    python -m app.maintenance rebuild-stats [--quiz-id ID]
+    python -m app.maintenance backfill-rollups [--quiz-id ID]
+    python -m app.maintenance analyze-items [--quiz-id ID]
+    python -m app.maintenance prune-idempotency-keys
+    python -m app.maintenance calibrate-bcrypt [--target-ms MS]
+"""
+
+import argparse
+import logging
+from .database import get_db_connection
+from .schema import ensure_schema
+from .services.Quiz_Stats_Services import rebuild_quiz_stats, rebuild_hourly_rollups
+from .services.Item_Analysis_Services import analyze_quiz, analyze_all_quizzes
+from .services.Idempotency_Services import prune_idempotency_keys
+from .configAndAuth import calibrate_bcrypt_rounds
+from .config import BCRYPT_ROUNDS, BCRYPT_TARGET_MS
+
+
+def rebuild_stats(quiz_id=None) -> int:
+    """Recompute the per-quiz summary tables for one quiz, or for every quiz when ``quiz_id`` is None."""
+    with get_db_connection() as conn:
+        cur = conn.cursor()
+        rows = rebuild_quiz_stats(cur, quiz_id)
+        conn.commit()
+        cur.close()
+    logging.info("Rebuilt quiz_stats for %s quizzes", rows)
+    return rows
+
+
+def backfill_rollups(quiz_id=None) -> int:
+    """Recompute quiz_hourly_stats for one quiz, or for every quiz when ``quiz_id`` is None."""
+    with get_db_connection() as conn:
+        cur = conn.cursor()
+        rows = rebuild_hourly_rollups(cur, quiz_id)
+        conn.commit()
+        cur.close()
+    logging.info("Wrote %s hourly rollup rows", rows)
+    return rows
+
+
+def calibrate_bcrypt(target_ms: float) -> int:
+    """Time bcrypt at increasing cost on this machine and print the suggested BCRYPT_ROUNDS."""
+    rounds, timings = calibrate_bcrypt_rounds(target_ms)
+    for candidate, ms in timings.items():
+        print(f"rounds={candidate:>2}  {ms:8.1f} ms")
+    print(f"Target {target_ms:.0f} ms: set BCRYPT_ROUNDS={rounds} (currently {BCRYPT_ROUNDS})")
+    if timings.get(rounds, 0) > target_ms:
+        print("Even the minimum cost is slower than the target on this hardware")
+    return rounds
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.maintenance")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("migrate", help="create missing summary tables and indexes")
+
+    stats = commands.add_parser("rebuild-stats", help="recompute per-quiz aggregates")
+    stats.add_argument("--quiz-id", type=int, default=None, help="only this quiz")
+
+    rollups = commands.add_parser("backfill-rollups", help="recompute hourly submission rollups")
+    rollups.add_argument("--quiz-id", type=int, default=None, help="only this quiz")
+
+    items = commands.add_parser("analyze-items", help="recompute per-question item analysis")
+    items.add_argument("--quiz-id", type=int, default=None, help="only this quiz")
+
+    commands.add_parser("prune-idempotency-keys", help="delete expired idempotency keys")
+
+    calibrate = commands.add_parser("calibrate-bcrypt", help="suggest BCRYPT_ROUNDS for this hardware")
+    calibrate.add_argument(
+        "--target-ms", type=float, default=BCRYPT_TARGET_MS, help="hash latency to aim for"
+    )
+
+    args = parser.parse_args(argv)
+    if args.command == "calibrate-bcrypt":
+        # Needs no database
+        calibrate_bcrypt(args.target_ms)
+        return
+    ensure_schema()
+    if args.command == "migrate":
+        return
+    if args.command == "rebuild-stats":
+        rebuild_stats(args.quiz_id)
+    elif args.command == "backfill-rollups":
+        backfill_rollups(args.quiz_id)
+    elif args.command == "analyze-items":
+        if args.quiz_id is None:
+            analyze_all_quizzes()
+        else:
+            analyze_quiz(args.quiz_id)
+    elif args.command == "prune-idempotency-keys":
+        logging.info("Deleted %s expired idempotency keys", prune_idempotency_keys())
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -16,10 +16,20 @@ class UpdateQuestionBase(BaseModel):
 class Answer(BaseModel):
     answer_id: int
     answer_text: str
-    is_correct: bool
 
 
 class QuestionAndAnswerModel(BaseModel):
     question_id: int
     question_text: str
     answers: List[Answer]
+
+
+# Answer key, only served to the quiz's creator (getQuizAnswerKey)
+class KeyedAnswer(Answer):
+    is_correct: bool
+
+
+class QuestionAnswerKeyModel(BaseModel):
+    question_id: int
+    question_text: str
+    answers: List[KeyedAnswer]
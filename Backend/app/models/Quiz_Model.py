@@ -1,6 +1,6 @@
 from fastapi import FastAPI
 from pydantic import BaseModel,EmailStr,Field
-from typing import Annotated,Optional
+from typing import Annotated,List,Optional
 
 from datetime import datetime
 
@@ -9,4 +9,30 @@ class QuizBase(BaseModel):
     quiz_title: Annotated[str,Field(...)]
     created_by: Annotated[str,Field(...)]
     created_at: Annotated[datetime,Field(default_factory=datetime.now)]
-    
\ No newline at end of file
+    
+
+class QuizCatalogItem(QuizBase):
+    question_count: int = 0
+    attempt_count: int = 0
+
+
+class QuizCatalogPage(BaseModel):
+    items: List[QuizCatalogItem]
+    next_cursor: Optional[str] = None
+
+
+class ImportAnswer(BaseModel):
+    answer_text: str
+    is_correct: bool = False
+
+
+class ImportQuestion(BaseModel):
+    question_text: str
+    answers: List[ImportAnswer]
+
+
+class QuizImport(BaseModel):
+    quiz_title: Annotated[str,Field(...)]
+    created_by: Annotated[str,Field(...)]
+    created_at: Annotated[datetime,Field(default_factory=datetime.now)]
+    questions: List[ImportQuestion]
@@ -1,6 +1,6 @@
 from fastapi import FastAPI
 from pydantic import BaseModel,EmailStr,Field
-from typing import Annotated,Optional
+from typing import Annotated,List,Optional
 from datetime import datetime
 
 class SubmissionBase(BaseModel):
@@ -9,3 +9,44 @@ class SubmissionBase(BaseModel):
     quiz_id: Annotated[int, Field(...)]
     score: Annotated[int,Field(...)]
     submitted_at : Optional[datetime] = None
+
+
+class SubmissionHistoryPage(BaseModel):
+    items: List[SubmissionBase]
+    next_cursor: Optional[str] = None
+
+
+class SelectedAnswer(BaseModel):
+    question_id: int
+    answer_id: int
+
+
+class GradeSubmission(BaseModel):
+    user_id: Annotated[int,Field(...)]
+    quiz_id: Annotated[int,Field(...)]
+    answers: List[SelectedAnswer]
+
+
+class GradedSubmission(BaseModel):
+    submission_id: int
+    user_id: int
+    quiz_id: int
+    score: int
+    total_questions: int
+    percentage: Optional[float] = None
+    submitted_at: Optional[datetime] = None
+
+
+class LeaderboardEntry(BaseModel):
+    rank: int
+    user_id: int
+    best_score: int
+    submitted_at: datetime
+    submission_id: int
+
+
+class LeaderboardPage(BaseModel):
+    quiz_id: int
+    total_players: int
+    items: List[LeaderboardEntry]
+    next_cursor: Optional[str] = None
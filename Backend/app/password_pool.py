@@ -0,0 +1,139 @@
+"""
+Password Worker Pool
+bcrypt hashing and verification run in a small pool of worker processes
+(PASSWORD_WORKERS) instead of on request threads, so a burst of logins uses
+at most that many cores and leaves the rest for other endpoints.
+
+At most PASSWORD_QUEUE_MAX calls may be running or waiting; beyond that new
+calls fail fast with a 503 instead of queueing behind work that will not
+finish in time. PASSWORD_WORKERS=0 runs the work inline on the caller's
+thread, as before.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional
+
+from fastapi import HTTPException
+
+from .config import DB_SHUTDOWN_TIMEOUT, PASSWORD_QUEUE_MAX, PASSWORD_WORKERS
+
+
+class PasswordWorkerPool:
+    """Process pool with a bound on calls in flight."""
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._closed = False
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # Called with self._lock held. Workers are spawned rather than forked:
+        # forking a process that runs threads and holds pooled connections is unsafe
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    def submit(self, fn: Callable, *args) -> Future:
+        """Schedule ``fn(*args)`` in a worker; raises a 503 when the pool is saturated."""
+        with self._lock:
+            if self._closed:
+                raise HTTPException(status_code=503, detail="Server is shutting down")
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise HTTPException(
+                    status_code=503,
+                    detail="Too many sign-ins in progress, retry shortly",
+                    headers={"Retry-After": "1"},
+                )
+            executor = self._get_executor()
+            # Reserve the slot; the executor is called outside the lock because
+            # its manager thread runs _done
+            self._pending += 1
+        try:
+            future = executor.submit(fn, *args)
+        except RuntimeError:
+            # Broken (a worker died, e.g. killed for memory) or shut down;
+            # a broken pool is replaced on the next call
+            with self._lock:
+                self._pending -= 1
+                if self._executor is executor:
+                    self._executor = None
+            raise HTTPException(status_code=503, detail="Password workers are unavailable, retry shortly")
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, future: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+            self._completed += 1
+            broken = not future.cancelled() and isinstance(future.exception(), BrokenProcessPool)
+            if broken and self._executor is not None:
+                # Later submissions would fail too
+                logging.error("Password worker pool broke, restarting it")
+                self._executor = None
+
+    def run(self, fn: Callable, *args):
+        """Run ``fn(*args)`` in a worker and wait for the result."""
+        return self.submit(fn, *args).result()
+
+    async def run_async(self, fn: Callable, *args):
+        """Await ``fn(*args)`` from a worker without holding a thread."""
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Let running calls finish and stop the workers."""
+        with self._lock:
+            self._closed = True
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            # ProcessPoolExecutor.shutdown has no timeout; cancel what has not started
+            waiter = threading.Thread(
+                target=executor.shutdown, kwargs={"cancel_futures": True}, daemon=True
+            )
+            waiter.start()
+            waiter.join(timeout)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "pending": self._pending,
+                "max_pending": self.max_pending,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+
+_POOL: Optional[PasswordWorkerPool] = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_password_pool() -> Optional[PasswordWorkerPool]:
+    """The process-wide pool, or None when PASSWORD_WORKERS is 0."""
+    global _POOL
+    if PASSWORD_WORKERS <= 0:
+        return None
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = PasswordWorkerPool(PASSWORD_WORKERS, PASSWORD_QUEUE_MAX)
+        return _POOL
+
+
+def close_password_pool(timeout: float = DB_SHUTDOWN_TIMEOUT) -> None:
+    global _POOL
+    with _POOL_LOCK:
+        pool, _POOL = _POOL, None
+    if pool is not None:
+        pool.close(timeout)
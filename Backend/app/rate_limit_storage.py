@@ -0,0 +1,372 @@
+"""
+Shared-Memory Rate Limit Storage
+A ``limits`` storage backend (scheme ``shm://``) that keeps fixed-window
+and sliding-window counters in a memory-mapped file, so every worker process
+on the host enforces the same limits instead of one copy of them each.
+
+The file is a fixed-size hash table of ``slots`` entries split into
+``stripes``. A key lives in one stripe and is looked up among PROBE_SLOTS
+slots of it; updates take that stripe's lock, which is a thread lock plus an
+fcntl byte-range lock (record locks only exclude other processes). When
+every probed slot is taken by a live key, the least recently used one is
+evicted, so the table never grows and cold keys make room for hot ones.
+
+For the sliding-window-counter strategy a slot holds both windows of a key:
+the count of the current fixed window and of the one before it, which
+``limits`` weighs by how much of the previous window still overlaps the
+sliding one. Checking and counting happen under one lock, so concurrent
+hits never overshoot the limit.
+
+    storage_uri="shm:///dev/shm/quiz-rate-limits"
+
+POSIX only (fcntl); app.rate_limiter imports it only when configured.
+"""
+
+import fcntl
+import hashlib
+import logging
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Optional
+from urllib.parse import urlparse
+
+from limits.storage import SlidingWindowCounterSupport, Storage
+
+DEFAULT_PATH = "/dev/shm/quiz-rate-limits"
+
+# magic, layout version, slots per stripe, stripes
+_HEADER = struct.Struct("<8sIII")
+_MAGIC = b"QZRLSHM\x00"
+_LAYOUT_VERSION = 2
+_HEADER_SIZE = 64
+
+# Per-stripe counters: evictions, rejected sliding-window hits
+_STRIPE_STATS = struct.Struct("<QQ")
+_EVICTIONS, _REJECTS = 0, 1
+
+# key hash (0 = empty), count in the current window, count in the previous
+# window, end of the current window, end of the slot's useful life, last used.
+# Times are time.time()
+_SLOT = struct.Struct("<QIIddd")
+_EMPTY_SLOT = bytes(_SLOT.size)
+_MAX_COUNT = 2**32 - 1
+
+# Slots examined per lookup; bounds the cost of a miss
+PROBE_SLOTS = 8
+
+
+def key_hash(key: str) -> int:
+    """Non-zero 64-bit digest under which ``key`` is stored."""
+    value = int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little")
+    return value or 1
+
+
+class SharedMemoryStorage(Storage, SlidingWindowCounterSupport):
+    """Rate limit counters in an mmap shared by all processes that open ``path``."""
+
+    STORAGE_SCHEME = ["shm"]
+
+    def __init__(
+        self,
+        uri: Optional[str] = None,
+        wrap_exceptions: bool = False,
+        slots: int = 65536,
+        stripes: int = 64,
+        **options,
+    ):
+        parsed = urlparse(uri or "")
+        self.path = (parsed.netloc + parsed.path) or DEFAULT_PATH
+        self.stripes = max(1, int(stripes))
+        self.stripe_slots = max(PROBE_SLOTS, int(slots) // self.stripes)
+        self.slots = self.stripe_slots * self.stripes
+        self._stats_offset = _HEADER_SIZE
+        self._slots_offset = _HEADER_SIZE + _STRIPE_STATS.size * self.stripes
+        self.size = self._slots_offset + _SLOT.size * self.slots
+        self._thread_locks = [threading.Lock() for _ in range(self.stripes)]
+
+        self._fd = self._open()
+        try:
+            self._map = mmap.mmap(self._fd, self.size, mmap.MAP_SHARED)
+        except Exception:
+            os.close(self._fd)
+            raise
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    def _open(self) -> int:
+        """Open the table, laying it out if this process is the first to use it."""
+        header = _HEADER.pack(_MAGIC, _LAYOUT_VERSION, self.stripe_slots, self.stripes)
+        while True:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                # flock does not interact with the fcntl record locks used for stripes
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                if self._adopt(fd, header):
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+                    return fd
+            except BaseException:
+                os.close(fd)
+                raise
+            # Closing drops the flock
+            os.close(fd)
+
+    def _adopt(self, fd: int, header: bytes) -> bool:
+        """Lay out or validate the file behind ``fd``; False when the path must be reopened."""
+        try:
+            if os.fstat(fd).st_ino != os.stat(self.path).st_ino:
+                return False
+        except FileNotFoundError:
+            return False
+        size = os.fstat(fd).st_size
+        if size == 0:
+            os.ftruncate(fd, self.size)
+            os.pwrite(fd, header, 0)
+            return True
+        if size == self.size and os.pread(fd, _HEADER.size, 0) == header:
+            return True
+        # Left by a run with another layout. It is replaced rather than resized
+        # so processes still mapping it are unaffected; every worker of one
+        # deployment must use the same slots and stripes
+        logging.warning("Rate limit table %s has another layout, replacing it", self.path)
+        os.unlink(self.path)
+        return False
+
+    @property
+    def base_exceptions(self):
+        return (OSError, ValueError)
+
+    def _lock(self, stripe: int) -> None:
+        self._thread_locks[stripe].acquire()
+        try:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, 1, stripe)
+        except BaseException:
+            self._thread_locks[stripe].release()
+            raise
+
+    def _unlock(self, stripe: int) -> None:
+        try:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, stripe)
+        finally:
+            self._thread_locks[stripe].release()
+
+    def _locate(self, hashed: int) -> tuple[int, int]:
+        stripe = hashed % self.stripes
+        return stripe, (hashed // self.stripes) % self.stripe_slots
+
+    def _offset(self, stripe: int, index: int) -> int:
+        return self._slots_offset + _SLOT.size * (stripe * self.stripe_slots + index)
+
+    def _find(self, hashed: int, stripe: int, start: int, now: float, create: bool) -> Optional[int]:
+        """Offset of ``hashed``'s slot, claiming one when ``create``. Stripe lock held."""
+        free = None
+        coldest = None
+        coldest_used = None
+        for probe in range(PROBE_SLOTS):
+            offset = self._offset(stripe, (start + probe) % self.stripe_slots)
+            slot_key, _, _, _, keep_until, last_used = _SLOT.unpack_from(self._map, offset)
+            if slot_key == hashed:
+                return offset
+            if not create:
+                continue
+            if slot_key == 0 or keep_until <= now:
+                if free is None:
+                    free = offset
+            elif coldest_used is None or last_used < coldest_used:
+                coldest, coldest_used = offset, last_used
+        if not create:
+            return None
+        if free is not None:
+            return free
+        self._count(stripe, _EVICTIONS)
+        return coldest
+
+    def _count(self, stripe: int, field: int) -> None:
+        """Bump one of ``stripe``'s shared counters. Stripe lock held."""
+        offset = self._stats_offset + _STRIPE_STATS.size * stripe
+        values = list(_STRIPE_STATS.unpack_from(self._map, offset))
+        values[field] += 1
+        _STRIPE_STATS.pack_into(self._map, offset, *values)
+
+    def incr(self, key: str, expiry: float, amount: int = 1) -> int:
+        hashed = key_hash(key)
+        stripe, start = self._locate(hashed)
+        now = time.time()
+        self._lock(stripe)
+        try:
+            offset = self._find(hashed, stripe, start, now, create=True)
+            slot_key, count, _, expires_at, _, _ = _SLOT.unpack_from(self._map, offset)
+            if slot_key != hashed or expires_at <= now:
+                count, expires_at = 0, now + expiry
+            count = min(count + amount, _MAX_COUNT)
+            _SLOT.pack_into(self._map, offset, hashed, count, 0, expires_at, expires_at, now)
+            return count
+        finally:
+            self._unlock(stripe)
+
+    def _read(self, key: str) -> tuple[int, float]:
+        """(count, expires at) of a live key, touching it; (0, 0.0) otherwise."""
+        hashed = key_hash(key)
+        stripe, start = self._locate(hashed)
+        now = time.time()
+        self._lock(stripe)
+        try:
+            offset = self._find(hashed, stripe, start, now, create=False)
+            if offset is None:
+                return 0, 0.0
+            _, count, previous, expires_at, keep_until, _ = _SLOT.unpack_from(self._map, offset)
+            if expires_at <= now:
+                return 0, 0.0
+            _SLOT.pack_into(self._map, offset, hashed, count, previous, expires_at, keep_until, now)
+            return count, expires_at
+        finally:
+            self._unlock(stripe)
+
+    def get(self, key: str) -> int:
+        return self._read(key)[0]
+
+    def get_expiry(self, key: str) -> float:
+        return self._read(key)[1] or time.time()
+
+    def clear(self, key: str) -> None:
+        hashed = key_hash(key)
+        stripe, start = self._locate(hashed)
+        self._lock(stripe)
+        try:
+            offset = self._find(hashed, stripe, start, time.time(), create=False)
+            if offset is not None:
+                self._map[offset : offset + _SLOT.size] = _EMPTY_SLOT
+        finally:
+            self._unlock(stripe)
+
+    @staticmethod
+    def _windows(slot: tuple, expiry: int, now: float) -> tuple[int, int, float]:
+        """(previous count, current count, current window end) of a slot at ``now``.
+
+        Windows are aligned to multiples of ``expiry`` like limits' own
+        sliding window keys; a slot last written one window ago has its
+        current count become the previous one.
+        """
+        window_end = (int(now / expiry) + 1) * expiry
+        _, count, previous, slot_window_end, _, _ = slot
+        if slot_window_end == window_end:
+            return previous, count, window_end
+        if slot_window_end == window_end - expiry:
+            return count, 0, window_end
+        return 0, 0, window_end
+
+    @staticmethod
+    def _window_ttls(previous: int, expiry: int, now: float) -> tuple[float, float]:
+        # Same arithmetic as limits.storage.MemoryStorage
+        previous_ttl = (1 - (((now - expiry) / expiry) % 1)) * expiry if previous else 0.0
+        current_ttl = (1 - ((now / expiry) % 1)) * expiry + expiry
+        return previous_ttl, current_ttl
+
+    def acquire_sliding_window_entry(self, key: str, limit: int, expiry: int, amount: int = 1) -> bool:
+        if amount > limit:
+            return False
+        hashed = key_hash(key)
+        stripe, start = self._locate(hashed)
+        now = time.time()
+        self._lock(stripe)
+        try:
+            offset = self._find(hashed, stripe, start, now, create=True)
+            slot = _SLOT.unpack_from(self._map, offset)
+            if slot[0] != hashed:
+                slot = (hashed, 0, 0, 0.0, 0.0, 0.0)
+            previous, count, window_end = self._windows(slot, expiry, now)
+            previous_ttl, _ = self._window_ttls(previous, expiry, now)
+            weighted = previous * previous_ttl / expiry + count
+            accepted = math.floor(weighted) + amount <= limit
+            if accepted:
+                count = min(count + amount, _MAX_COUNT)
+            else:
+                self._count(stripe, _REJECTS)
+            # The previous window matters until the current one ends
+            _SLOT.pack_into(
+                self._map, offset, hashed, count, previous, window_end, window_end + expiry, now
+            )
+            return accepted
+        finally:
+            self._unlock(stripe)
+
+    def get_sliding_window(self, key: str, expiry: int) -> tuple[int, float, int, float]:
+        hashed = key_hash(key)
+        stripe, start = self._locate(hashed)
+        now = time.time()
+        self._lock(stripe)
+        try:
+            offset = self._find(hashed, stripe, start, now, create=False)
+            slot = _SLOT.unpack_from(self._map, offset) if offset is not None else None
+        finally:
+            self._unlock(stripe)
+        previous, count = 0, 0
+        if slot is not None:
+            previous, count, _ = self._windows(slot, expiry, now)
+        previous_ttl, current_ttl = self._window_ttls(previous, expiry, now)
+        return previous, previous_ttl, count, current_ttl
+
+    def clear_sliding_window(self, key: str, expiry: int) -> None:
+        self.clear(key)
+
+    def check(self) -> bool:
+        return not self._map.closed
+
+    def reset(self) -> Optional[int]:
+        now = time.time()
+        cleared = 0
+        empty = bytes(_SLOT.size * self.stripe_slots)
+        for stripe in range(self.stripes):
+            self._lock(stripe)
+            try:
+                for index in range(self.stripe_slots):
+                    slot_key, _, _, _, keep_until, _ = _SLOT.unpack_from(
+                        self._map, self._offset(stripe, index)
+                    )
+                    cleared += slot_key != 0 and keep_until > now
+                start = self._offset(stripe, 0)
+                self._map[start : start + len(empty)] = empty
+            finally:
+                self._unlock(stripe)
+        return cleared
+
+    def stats(self) -> dict:
+        """Table size, live keys, evictions and sliding-window rejects across all processes.
+
+        Scans the table.
+        """
+        now = time.time()
+        live = 0
+        evictions = 0
+        rejects = 0
+        for stripe in range(self.stripes):
+            self._lock(stripe)
+            try:
+                stripe_evictions, stripe_rejects = _STRIPE_STATS.unpack_from(
+                    self._map, self._stats_offset + _STRIPE_STATS.size * stripe
+                )
+                evictions += stripe_evictions
+                rejects += stripe_rejects
+                for index in range(self.stripe_slots):
+                    slot_key, _, _, _, keep_until, _ = _SLOT.unpack_from(
+                        self._map, self._offset(stripe, index)
+                    )
+                    live += slot_key != 0 and keep_until > now
+            finally:
+                self._unlock(stripe)
+        return {
+            "path": self.path,
+            "slots": self.slots,
+            "stripes": self.stripes,
+            "live_keys": live,
+            "occupancy": round(live / self.slots, 4),
+            "evictions": evictions,
+            "rejects": rejects,
+        }
+
+    def close(self) -> None:
+        if not self._map.closed:
+            self._map.close()
+            os.close(self._fd)
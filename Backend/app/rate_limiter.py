@@ -3,8 +3,103 @@ Rate Limiter Configuration
 Centralized rate limiter instance for use across all routers
 """
 
-from slowapi import Limiter
+import threading
+from collections import Counter
+
+from fastapi import HTTPException, Request
+from slowapi import Limiter, _rate_limit_exceeded_handler
+from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
 
-# Initialize rate limiter with IP-based key function
-limiter = Limiter(key_func=get_remote_address)
+from .config import (
+    RATE_LIMIT_SHM_SLOTS,
+    RATE_LIMIT_SHM_STRIPES,
+    RATE_LIMIT_STORAGE_URI,
+    RATE_LIMIT_STRATEGY,
+)
+from .configAndAuth import decode_access_token
+
+# Other storages do not accept the table geometry options
+storage_options = {}
+if RATE_LIMIT_STORAGE_URI.startswith("shm://"):
+    # Importing registers the scheme with limits; it needs fcntl, so it is
+    # only imported where it is used (not available on Windows)
+    from . import rate_limit_storage  # noqa: F401
+
+    storage_options = {"slots": RATE_LIMIT_SHM_SLOTS, "stripes": RATE_LIMIT_SHM_STRIPES}
+
+
+def ip_key(request: Request) -> str:
+    """The client IP, whatever token the request carries."""
+    return f"ip:{get_remote_address(request)}"
+
+
+def rate_limit_key(request: Request) -> str:
+    """The signed-in user for requests with a valid bearer token, else the client IP.
+
+    Keying on the user keeps users behind one NAT (a school, an office) from
+    sharing a quota. Invalid or expired tokens count against the IP, so
+    sending garbage tokens does not get a fresh quota. Routes an attacker can
+    call with tokens of accounts they made (login, registration) use
+    ``ip_key`` instead, so extra accounts do not buy extra attempts.
+    """
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        try:
+            subject = decode_access_token(token).get("sub")
+        except HTTPException:
+            subject = None
+        if subject:
+            return f"user:{subject}"
+    return ip_key(request)
+
+
+limiter = Limiter(
+    key_func=rate_limit_key,
+    strategy=RATE_LIMIT_STRATEGY,
+    storage_uri=RATE_LIMIT_STORAGE_URI,
+    storage_options=storage_options,
+)
+
+
+class RejectCounter:
+    """429s sent by this process, by path and by key kind (user or ip)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_path: Counter = Counter()
+        self._by_kind: Counter = Counter()
+
+    def record(self, path: str, key: str) -> None:
+        with self._lock:
+            self._by_path[path] += 1
+            self._by_kind[key.partition(":")[0]] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "total": sum(self._by_path.values()),
+                "by_kind": dict(self._by_kind),
+                "by_path": dict(self._by_path.most_common()),
+            }
+
+
+rate_limit_rejects = RejectCounter()
+
+
+def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
+    """slowapi's 429 response, counted in rate_limit_rejects."""
+    # The route's own key_func, e.g. ip_key on login
+    rate_limit_rejects.record(request.url.path, exc.limit.key_func(request))
+    return _rate_limit_exceeded_handler(request, exc)
+
+
+def rate_limit_stats() -> dict:
+    storage = limiter._storage
+    return {
+        "strategy": RATE_LIMIT_STRATEGY,
+        "storage": RATE_LIMIT_STORAGE_URI.partition("://")[0],
+        "rejects": rate_limit_rejects.stats(),
+        # Bucket table occupancy; only the shared table has a fixed size
+        "table": storage.stats() if hasattr(storage, "stats") else None,
+    }
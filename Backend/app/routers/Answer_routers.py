@@ -13,13 +13,13 @@ router = APIRouter(prefix="/Answers", tags=["Answers"])
 
 
 @router.get("/getAnswer")
-@limiter.limit("60/minute")  # 60 requests per minute per IP
+@limiter.limit("60/minute")  # 60 requests per minute per user or IP
 def get_Answer_By_Question(request: Request, question_id: int):
     return get_all_answers_by_question(question_id)
 
 
 @router.post("/createAnswer")
-@limiter.limit("30/minute")  # 30 answer creations per minute per IP
+@limiter.limit("30/minute")  # 30 answer creations per minute per user or IP
 def create_Answer(request: Request, answer: AnswerBase):
     # Validate and sanitize answer text
     answer.answer_text = validate_answer_text(answer.answer_text)
@@ -27,7 +27,7 @@ def create_Answer(request: Request, answer: AnswerBase):
 
 
 @router.put("/editAnswer")
-@limiter.limit("30/minute")  # 30 edits per minute per IP
+@limiter.limit("30/minute")  # 30 edits per minute per user or IP
 def edit_Answer(request: Request, answer: UpdateAnswer):
     # Validate and sanitize answer text
     answer.answer_text = validate_answer_text(answer.answer_text)
@@ -35,6 +35,6 @@ def edit_Answer(request: Request, answer: UpdateAnswer):
 
 
 @router.delete("/deleteAnswer")
-@limiter.limit("20/minute")  # 20 deletions per minute per IP
+@limiter.limit("20/minute")  # 20 deletions per minute per user or IP
 def delete_Question(request: Request, question_id: int, answer_id: int):
     return delete_answer(question_id, answer_id)
@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Request
+from ..models.Answer_Model import AnswerBase, UpdateAnswer
+from ..services.Async_Answer_Services import (
+    create_answer,
+    get_all_answers_by_question,
+    update_answer_of_question,
+    delete_answer,
+)
+from ..utils.validation import validate_answer_text
+from ..rate_limiter import limiter
+
+router = APIRouter(prefix="/Answers", tags=["Answers"])
+
+
+@router.get("/getAnswer")
+@limiter.limit("60/minute")  # 60 requests per minute per user or IP
+async def get_Answer_By_Question_async(request: Request, question_id: int):
+    return await get_all_answers_by_question(question_id)
+
+
+@router.post("/createAnswer")
+@limiter.limit("30/minute")  # 30 answer creations per minute per user or IP
+async def create_Answer_async(request: Request, answer: AnswerBase):
+    # Validate and sanitize answer text
+    answer.answer_text = validate_answer_text(answer.answer_text)
+    return await create_answer(answer)
+
+
+@router.put("/editAnswer")
+@limiter.limit("30/minute")  # 30 edits per minute per user or IP
+async def edit_Answer_async(request: Request, answer: UpdateAnswer):
+    # Validate and sanitize answer text
+    answer.answer_text = validate_answer_text(answer.answer_text)
+    return await update_answer_of_question(answer)
+
+
+@router.delete("/deleteAnswer")
+@limiter.limit("20/minute")  # 20 deletions per minute per user or IP
+async def delete_Answer_async(request: Request, question_id: int, answer_id: int):
+    return await delete_answer(question_id, answer_id)
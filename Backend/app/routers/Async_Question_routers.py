@@ -0,0 +1,80 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Header, Request
+from ..models.Question_Model import (
+    QuestionAndAnswerModel,
+    QuestionAnswerKeyModel,
+    QuestionBase,
+    UpdateQuestionBase,
+)
+
+from ..services.Async_Question_Services import (
+    get_question_by_id,
+    get_question_by_quiz,
+    get_quiz_questions_payload,
+    get_quiz_answer_key,
+    create_question,
+    edit_question,
+    delete_question,
+)
+from ..utils.validation import validate_question_text
+from ..utils.http_cache import conditional_json_response
+from ..services.Async_Idempotency_Services import run_idempotent
+from ..services.Async_Quiz_Services import require_quiz_owner
+from ..rate_limiter import limiter
+from ..configAndAuth import get_current_user
+
+router = APIRouter(prefix="/Questions", tags=["Questions"])
+
+
+@router.get("/getQuestion")
+@limiter.limit("60/minute")  # 60 requests per minute per user or IP
+async def get_Question_async(request: Request, question_id: int):
+    return await get_question_by_id(question_id)
+
+
+@router.get("/getQuestionByQuiz")
+@limiter.limit("60/minute")  # 60 requests per minute per user or IP
+async def get_Quiz_Question_async(request: Request, quiz_id: int, question_id: int):
+    return await get_question_by_quiz(quiz_id, question_id)
+
+
+@router.get("/getQuizQuestions", response_model=List[QuestionAndAnswerModel])
+@limiter.limit("60/minute")  # 60 requests per minute per user or IP
+async def get_Quiz_Questions_async(request: Request, quiz_id: int):
+    return conditional_json_response(request, await get_quiz_questions_payload(quiz_id))
+
+
+@router.get("/getQuizAnswerKey", response_model=List[QuestionAnswerKeyModel])
+@limiter.limit("60/minute")  # 60 requests per minute per user
+async def get_Quiz_Answer_Key_async(request: Request, quiz_id: int, user=Depends(get_current_user)):
+    """Questions with the correct answers marked, for the quiz's creator only."""
+    await require_quiz_owner(quiz_id, user)
+    return await get_quiz_answer_key(quiz_id)
+
+
+@router.post("/createQuestion")
+@limiter.limit("30/minute")  # 30 question creations per minute per user or IP
+async def create_Question_async(
+    request: Request,
+    question: QuestionBase,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+):
+    # Validate and sanitize question text
+    question.question_text = validate_question_text(question.question_text)
+    return await run_idempotent(
+        "createQuestion", idempotency_key, question, lambda: create_question(question)
+    )
+
+
+@router.put("/editQuestion")
+@limiter.limit("30/minute")  # 30 edits per minute per user or IP
+async def edit_Question_async(request: Request, quetion: UpdateQuestionBase):
+    # Validate and sanitize question text
+    quetion.question_text = validate_question_text(quetion.question_text)
+    return await edit_question(quetion)
+
+
+@router.delete("/deleteQuestion")
+@limiter.limit("20/minute")  # 20 deletions per minute per user or IP
+async def delete_Question_async(request: Request, quiz_id: int, question_id: int):
+    return await delete_question(quiz_id, question_id)
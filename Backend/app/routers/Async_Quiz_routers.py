@@ -0,0 +1,74 @@
+from typing import Optional
+from fastapi import APIRouter, Header, Query, Request
+from ..models.Quiz_Model import QuizBase, QuizCatalogPage
+from ..services.Async_Quiz_Services import (
+    create_quiz,
+    get_quiz_payload,
+    get_quizzes_payload,
+    get_quiz_catalog,
+    edit_quiz,
+    delete_quiz,
+)
+from ..utils.validation import sanitize_quiz_title, sanitize_creator_name, sanitize_string
+from ..utils.http_cache import conditional_json_response
+from ..services.Async_Idempotency_Services import run_idempotent
+from ..rate_limiter import limiter
+
+router = APIRouter(prefix="/Quizzes", tags=["Quizzes"])
+
+
+@router.get("/getQuiz")
+@limiter.limit("60/minute")  # 60 requests per minute per user or IP
+async def get_Quiz_async(request: Request, quiz_id: int):
+    return conditional_json_response(request, await get_quiz_payload(quiz_id))
+
+
+@router.get("/getQuizzes")
+@limiter.limit("60/minute")  # 60 requests per minute per user or IP
+async def get_Quizzes_async(request: Request):
+    return conditional_json_response(request, await get_quizzes_payload())
+
+
+@router.get("/getQuizCatalog", response_model=QuizCatalogPage)
+@limiter.limit("60/minute")  # 60 requests per minute per user or IP
+async def get_Quiz_Catalog_async(
+    request: Request,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    created_by: Optional[str] = None,
+    title_prefix: Optional[str] = None,
+):
+    # Match the sanitized form the values were stored in
+    if created_by:
+        created_by = sanitize_string(created_by, max_length=100)
+    if title_prefix:
+        title_prefix = sanitize_string(title_prefix, max_length=200)
+    return await get_quiz_catalog(limit, cursor, created_by, title_prefix)
+
+
+@router.post("/createQuiz")
+@limiter.limit("20/minute")  # 20 quiz creations per minute per user or IP
+async def create_Quiz_async(
+    request: Request,
+    quiz: QuizBase,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+):
+    # Validate and sanitize inputs
+    quiz.quiz_title = sanitize_quiz_title(quiz.quiz_title)
+    quiz.created_by = sanitize_creator_name(quiz.created_by)
+    return await run_idempotent("createQuiz", idempotency_key, quiz, lambda: create_quiz(quiz))
+
+
+@router.put("/editQuiz")
+@limiter.limit("30/minute")  # 30 edits per minute per user or IP
+async def edit_Quiz_async(request: Request, quiz_id: int, quiz_title: str, created_by: str):
+    # Validate and sanitize inputs
+    quiz_title = sanitize_quiz_title(quiz_title)
+    created_by = sanitize_creator_name(created_by)
+    return await edit_quiz(quiz_id, quiz_title, created_by)
+
+
+@router.delete("/deleteQuiz")
+@limiter.limit("10/minute")  # 10 deletions per minute per user or IP (prevent abuse)
+async def delete_Quiz_async(request: Request, quiz_id: int):
+    return await delete_quiz(quiz_id)
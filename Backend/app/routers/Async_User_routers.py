@@ -0,0 +1,57 @@
+from ..configAndAuth import create_access_token, password_needs_rehash
+from ..services.Async_User_Services import (
+    get_user,
+    create_user,
+    authenticate_user,
+    rehash_password,
+)
+from ..utils.validation import validate_email, validate_password_strength
+from fastapi.security import OAuth2PasswordRequestForm
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
+from ..models.User_Model import User
+from datetime import timedelta
+from ..rate_limiter import ip_key, limiter
+
+router = APIRouter(prefix="/Users", tags=["Users"])
+
+
+@router.get("/getUser")
+@limiter.limit("30/minute")  # 30 requests per minute per user or IP
+async def get_User_async(request: Request, user_id: int):
+    return await get_user(user_id)
+
+
+@router.post("/createUser")
+@limiter.limit("5/minute", key_func=ip_key)  # 5 registrations per minute per IP, even with a token (prevent spam)
+async def create_User_async(request: Request, user: User):
+    # Validate and sanitize email
+    user.user_email = validate_email(user.user_email)
+
+    # Validate password strength
+    validate_password_strength(user.hashed_password)
+
+    return await create_user(user)
+
+
+@router.post("/login")
+@limiter.limit("10/minute", key_func=ip_key)  # 10 login attempts per minute per IP, even with a token (prevent brute force)
+async def login_async(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    form_data: OAuth2PasswordRequestForm = Depends(),
+):
+    user = await authenticate_user(form_data.username, form_data.password)
+    if not user:
+        raise HTTPException(status_code=400, detail="Invalid username or password")
+    if password_needs_rehash(user["hashed_password"]):
+        # Upgrade plaintext or outdated-cost hashes after the response is sent
+        background_tasks.add_task(
+            rehash_password, user["user_id"], form_data.password, user["hashed_password"]
+        )
+
+    # JWT token with subject = user email
+    access_token = create_access_token(
+        data={"sub": user["user_email"], "user_id": user["user_id"]},
+        expires_delta=timedelta(minutes=60),
+    )
+    return {"access_token": access_token, "token_type": "bearer"}
@@ -0,0 +1,52 @@
+from fastapi import APIRouter, Request
+from ..cache import (
+    answer_key_cache,
+    quiz_cache,
+    quiz_content_cache,
+    user_principal_cache,
+    verified_token_cache,
+)
+from ..leaderboard import leaderboards
+from ..services.Idempotency_Services import idempotency_cache
+from ..services.Leaderboard_Stream_Services import leaderboard_broadcaster
+from ..password_pool import get_password_pool
+from ..rate_limiter import limiter, rate_limit_stats
+
+router = APIRouter(prefix="/Metrics", tags=["Metrics"])
+
+
+@router.get("/caches")
+@limiter.limit("60/minute")  # 60 requests per minute per user or IP
+def get_Cache_Metrics(request: Request):
+    """Hit/miss/eviction counters for the in-process caches."""
+    return {
+        "quiz_content": quiz_content_cache.stats(),
+        "quiz": quiz_cache.stats(),
+        "answer_key": answer_key_cache.stats(),
+        "leaderboard": leaderboards.stats(),
+        "idempotency": idempotency_cache.stats(),
+        "user_principal": user_principal_cache.stats(),
+        "verified_token": verified_token_cache.stats(),
+    }
+
+
+@router.get("/streams")
+@limiter.limit("60/minute")  # 60 requests per minute per user or IP
+def get_Stream_Metrics(request: Request):
+    """Open live leaderboard channels and viewers."""
+    return {"leaderboard": leaderboard_broadcaster.stats()}
+
+
+@router.get("/passwords")
+@limiter.limit("60/minute")  # 60 requests per minute per user or IP
+def get_Password_Metrics(request: Request):
+    """Load on the bcrypt worker pool; null when it runs inline."""
+    pool = get_password_pool()
+    return {"password_pool": pool.stats() if pool is not None else None}
+
+
+@router.get("/rateLimits")
+@limiter.limit("60/minute")  # 60 requests per minute per user or IP
+def get_Rate_Limit_Metrics(request: Request):
+    """Rejected requests (this worker) and occupancy of the shared bucket table."""
+    return rate_limit_stats()
@@ -1,11 +1,8 @@
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from ..services.PDF_MCQ_Services import process_pdf_and_generate_mcqs
-from ..services.Quiz_Services import create_quiz
-from ..services.Question_Services import create_question
-from ..services.Answer_Services import create_answer
-from ..models.Quiz_Model import QuizBase
-from ..models.Question_Model import QuestionBase
-from ..models.Answer_Model import AnswerBase
+from ..services.Quiz_Import_Services import create_quiz_with_questions
+from ..models.Quiz_Model import ImportQuestion
 from ..utils.validation import (
     validate_pdf_file,
     validate_num_questions,
@@ -14,14 +11,13 @@ from ..utils.validation import (
 )
 from datetime import datetime
 import logging
-import json
 from ..rate_limiter import limiter
 
 router = APIRouter(prefix="/PDF_MCQ", tags=["PDF MCQ Generator"])
 
 
 @router.post("/generate-mcqs")
-@limiter.limit("5/hour")  # 5 PDF processing per hour per IP (resource-intensive)
+@limiter.limit("5/hour")  # 5 PDF processing per hour per user or IP (resource-intensive)
 async def generate_mcqs_from_pdf(
     request: Request,
     file: UploadFile = File(...),
@@ -62,48 +58,24 @@ async def generate_mcqs_from_pdf(
         # If quiz_title and created_by are provided, create quiz and questions
         if quiz_title and created_by:
             try:
-                # Create quiz
-                quiz_data = QuizBase(
-                    quiz_title=quiz_title,
-                    created_by=created_by,
-                    created_at=datetime.now(),
+                # Create the quiz, its questions and all answers in one
+                # transaction, so a failure never leaves a half-built quiz
+                questions = [ImportQuestion(**mcq) for mcq in mcqs]
+                quiz_id, question_ids = await run_in_threadpool(
+                    create_quiz_with_questions,
+                    quiz_title,
+                    created_by,
+                    datetime.now(),
+                    questions,
                 )
-                quiz_result = create_quiz(quiz_data)
-                quiz_id = quiz_result.quiz_id
-
-                # Create questions and answers
-                created_questions = []
-                for mcq in mcqs:
-                    # Create question
-                    question_data = QuestionBase(
-                        quiz_id=quiz_id, question_text=mcq["question_text"]
-                    )
-                    question_result = create_question(question_data)
-                    # Extract question_id from JSONResponse
-                    response_data = json.loads(question_result.body.decode())
-                    question_id = response_data.get("Question", {}).get("question_id")
-
-                    if not question_id:
-                        raise HTTPException(
-                            status_code=500,
-                            detail="Failed to get question_id from response",
-                        )
-
-                    # Create answers
-                    for answer in mcq["answers"]:
-                        answer_data = AnswerBase(
-                            question_id=question_id,
-                            answer_text=answer["answer_text"],
-                            is_correct=answer["is_correct"],
-                        )
-                        create_answer(answer_data)
-
-                    created_questions.append(
-                        {
-                            "question_id": question_id,
-                            "question_text": mcq["question_text"],
-                        }
-                    )
+
+                created_questions = [
+                    {
+                        "question_id": question_id,
+                        "question_text": question.question_text,
+                    }
+                    for question_id, question in zip(question_ids, questions)
+                ]
 
                 result["quiz_created"] = True
                 result["quiz_id"] = quiz_id
@@ -126,7 +98,7 @@ async def generate_mcqs_from_pdf(
 
 
 @router.post("/generate-mcqs-only")
-@limiter.limit("5/hour")  # 5 PDF processing per hour per IP
+@limiter.limit("5/hour")  # 5 PDF processing per hour per user or IP
 async def generate_mcqs_only(
     request: Request, file: UploadFile = File(...), num_questions: int = Form(5)
 ):
@@ -1,7 +1,8 @@
-from typing import List
-from fastapi import APIRouter, Request
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Header, Request
 from ..models.Question_Model import (
     QuestionAndAnswerModel,
+    QuestionAnswerKeyModel,
     QuestionBase,
     UpdateQuestionBase,
 )
@@ -9,45 +10,64 @@ from ..models.Question_Model import (
 from ..services.Question_Services import (
     get_question_by_id,
     get_question_by_quiz,
-    get_quiz_questions,
+    get_quiz_questions_payload,
+    get_quiz_answer_key,
     create_question,
     edit_question,
     delete_question,
 )
 from ..utils.validation import validate_question_text
+from ..utils.http_cache import conditional_json_response
+from ..services.Idempotency_Services import run_idempotent
+from ..services.Quiz_Services import require_quiz_owner
 from ..rate_limiter import limiter
+from ..configAndAuth import get_current_user
 
 router = APIRouter(prefix="/Questions", tags=["Questions"])
 
 
 @router.get("/getQuestion")
-@limiter.limit("60/minute")  # 60 requests per minute per IP
+@limiter.limit("60/minute")  # 60 requests per minute per user or IP
 def get_Question(request: Request, question_id: int):
     return get_question_by_id(question_id)
 
 
 @router.get("/getQuestionByQuiz")
-@limiter.limit("60/minute")  # 60 requests per minute per IP
+@limiter.limit("60/minute")  # 60 requests per minute per user or IP
 def get_Quiz_Question(request: Request, quiz_id: int, question_id: int):
     return get_question_by_quiz(quiz_id, question_id)
 
 
 @router.get("/getQuizQuestions", response_model=List[QuestionAndAnswerModel])
-@limiter.limit("60/minute")  # 60 requests per minute per IP
+@limiter.limit("60/minute")  # 60 requests per minute per user or IP
 def get_Quiz_Questions(request: Request, quiz_id: int):
-    return get_quiz_questions(quiz_id)
+    return conditional_json_response(request, get_quiz_questions_payload(quiz_id))
+
+
+@router.get("/getQuizAnswerKey", response_model=List[QuestionAnswerKeyModel])
+@limiter.limit("60/minute")  # 60 requests per minute per user
+def get_Quiz_Answer_Key(request: Request, quiz_id: int, user=Depends(get_current_user)):
+    """Questions with the correct answers marked, for the quiz's creator only."""
+    require_quiz_owner(quiz_id, user)
+    return get_quiz_answer_key(quiz_id)
 
 
 @router.post("/createQuestion")
-@limiter.limit("30/minute")  # 30 question creations per minute per IP
-def create_Question(request: Request, question: QuestionBase):
+@limiter.limit("30/minute")  # 30 question creations per minute per user or IP
+def create_Question(
+    request: Request,
+    question: QuestionBase,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+):
     # Validate and sanitize question text
     question.question_text = validate_question_text(question.question_text)
-    return create_question(question)
+    return run_idempotent(
+        "createQuestion", idempotency_key, question, lambda: create_question(question)
+    )
 
 
 @router.put("/editQuestion")
-@limiter.limit("30/minute")  # 30 edits per minute per IP
+@limiter.limit("30/minute")  # 30 edits per minute per user or IP
 def edit_Question(request: Request, quetion: UpdateQuestionBase):
     # Validate and sanitize question text
     quetion.question_text = validate_question_text(quetion.question_text)
@@ -55,6 +75,6 @@ def edit_Question(request: Request, quetion: UpdateQuestionBase):
 
 
 @router.delete("/deleteQuestion")
-@limiter.limit("20/minute")  # 20 deletions per minute per IP
+@limiter.limit("20/minute")  # 20 deletions per minute per user or IP
 def delete_Question(request: Request, quiz_id: int, question_id: int):
     return delete_question(quiz_id, question_id)
@@ -1,41 +1,71 @@
-from fastapi import APIRouter, Request
-from ..models.Quiz_Model import QuizBase
+from typing import Optional
+from fastapi import APIRouter, File, Form, Header, Query, Request, UploadFile
+from ..models.Quiz_Model import QuizBase, QuizCatalogPage, QuizImport
 from ..services.Quiz_Services import (
     create_quiz,
-    get_quiz,
-    get_quizzes,
+    get_quiz_payload,
+    get_quizzes_payload,
+    get_quiz_catalog,
     edit_quiz,
     delete_quiz,
 )
-from ..utils.validation import sanitize_quiz_title, sanitize_creator_name
+from ..services.Quiz_Import_Services import (
+    import_quiz,
+    parse_import_file,
+    validate_quiz_import,
+)
+from ..utils.validation import sanitize_quiz_title, sanitize_creator_name, sanitize_string
+from ..utils.http_cache import conditional_json_response
+from ..services.Idempotency_Services import run_idempotent
 from ..rate_limiter import limiter
 
 router = APIRouter(prefix="/Quizzes", tags=["Quizzes"])
 
 
 @router.get("/getQuiz")
-@limiter.limit("60/minute")  # 60 requests per minute per IP
+@limiter.limit("60/minute")  # 60 requests per minute per user or IP
 def get_Quiz(request: Request, quiz_id: int):
-    return get_quiz(quiz_id)
+    return conditional_json_response(request, get_quiz_payload(quiz_id))
 
 
 @router.get("/getQuizzes")
-@limiter.limit("60/minute")  # 60 requests per minute per IP
+@limiter.limit("60/minute")  # 60 requests per minute per user or IP
 def get_Quizzes(request: Request):
-    return get_quizzes()
+    return conditional_json_response(request, get_quizzes_payload())
+
+
+@router.get("/getQuizCatalog", response_model=QuizCatalogPage)
+@limiter.limit("60/minute")  # 60 requests per minute per user or IP
+def get_Quiz_Catalog(
+    request: Request,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    created_by: Optional[str] = None,
+    title_prefix: Optional[str] = None,
+):
+    # Match the sanitized form the values were stored in
+    if created_by:
+        created_by = sanitize_string(created_by, max_length=100)
+    if title_prefix:
+        title_prefix = sanitize_string(title_prefix, max_length=200)
+    return get_quiz_catalog(limit, cursor, created_by, title_prefix)
 
 
 @router.post("/createQuiz")
-@limiter.limit("20/minute")  # 20 quiz creations per minute per IP
-def create_Quiz(request: Request, quiz: QuizBase):
+@limiter.limit("20/minute")  # 20 quiz creations per minute per user or IP
+def create_Quiz(
+    request: Request,
+    quiz: QuizBase,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+):
     # Validate and sanitize inputs
     quiz.quiz_title = sanitize_quiz_title(quiz.quiz_title)
     quiz.created_by = sanitize_creator_name(quiz.created_by)
-    return create_quiz(quiz)
+    return run_idempotent("createQuiz", idempotency_key, quiz, lambda: create_quiz(quiz))
 
 
 @router.put("/editQuiz")
-@limiter.limit("30/minute")  # 30 edits per minute per IP
+@limiter.limit("30/minute")  # 30 edits per minute per user or IP
 def edit_Quiz(request: Request, quiz_id: int, quiz_title: str, created_by: str):
     # Validate and sanitize inputs
     quiz_title = sanitize_quiz_title(quiz_title)
@@ -44,6 +74,33 @@ def edit_Quiz(request: Request, quiz_id: int, quiz_title: str, created_by: str):
 
 
 @router.delete("/deleteQuiz")
-@limiter.limit("10/minute")  # 10 deletions per minute per IP (prevent abuse)
+@limiter.limit("10/minute")  # 10 deletions per minute per user or IP (prevent abuse)
 def delete_Quiz(request: Request, quiz_id: int):
     return delete_quiz(quiz_id)
+
+
+@router.post("/importQuiz")
+@limiter.limit("5/minute")  # 5 bulk imports per minute per user or IP
+def import_Quiz(request: Request, quiz: QuizImport):
+    """Create a quiz with all its questions and answers in one transaction."""
+    return import_quiz(validate_quiz_import(quiz))
+
+
+@router.post("/importQuizFile")
+@limiter.limit("5/minute")  # 5 bulk imports per minute per user or IP
+def import_Quiz_File(
+    request: Request,
+    file: UploadFile = File(...),
+    quiz_title: str = Form(...),
+    created_by: str = Form(...),
+):
+    """
+    Import a quiz from a CSV (question_text,answer_text,is_correct; one row per
+    answer) or NDJSON (one question object per line) upload.
+    """
+    quiz = QuizImport(
+        quiz_title=quiz_title,
+        created_by=created_by,
+        questions=parse_import_file(file),
+    )
+    return import_quiz(validate_quiz_import(quiz))
@@ -1,35 +1,167 @@
-from fastapi import APIRouter, Request
-from ..models.Submission_Model import SubmissionBase
+from datetime import datetime
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from ..models.Submission_Model import (
+    GradeSubmission,
+    GradedSubmission,
+    LeaderboardEntry,
+    LeaderboardPage,
+    SubmissionHistoryPage,
+    SubmissionBase,
+)
 from ..services.Submission_Services import (
     get_leaderboard_by_quiz,
     get_submission_by_user,
+    get_submission_history,
     create_submission,
     get_quiz_statistics,
 )
+from ..services.Grading_Services import grade_submission
+from ..services.Leaderboard_Services import get_leaderboard_page, get_user_rank
+from ..services.Leaderboard_Stream_Services import stream_leaderboard
+from ..services.Item_Analysis_Services import get_item_statistics
+from ..services.Score_Distribution_Services import get_score_distribution
+from ..services.Time_Series_Services import get_submission_time_series
+from ..services.Export_Services import export_submissions
+from ..services.Idempotency_Services import run_idempotent
+from ..services.Quiz_Services import require_quiz_owner
 from ..rate_limiter import limiter
+from ..configAndAuth import get_optional_user
+from ..config import ALLOW_CLIENT_SCORED_SUBMISSIONS
 
 router = APIRouter(prefix="/Submissions", tags=["Submissions"])
 
 
 @router.get("/getLeaderboardByQuiz")
-@limiter.limit("60/minute")  # 60 requests per minute per IP
+@limiter.limit("60/minute")  # 60 requests per minute per user or IP
 def get_User(request: Request, quiz_id: int):
     return get_leaderboard_by_quiz(quiz_id)
 
 
+@router.get("/getLeaderboardPage", response_model=LeaderboardPage)
+@limiter.limit("60/minute")  # 60 requests per minute per user or IP
+def get_Leaderboard_Page(
+    request: Request,
+    quiz_id: int,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+):
+    """Best attempt per user in rank order, one page at a time."""
+    return get_leaderboard_page(quiz_id, limit, cursor)
+
+
+@router.get("/getUserRank", response_model=LeaderboardEntry)
+@limiter.limit("60/minute")  # 60 requests per minute per user or IP
+def get_User_Rank(request: Request, quiz_id: int, user_id: int):
+    return get_user_rank(quiz_id, user_id)
+
+
+@router.get("/streamLeaderboard")
+@limiter.limit("10/minute")  # 10 requests per minute per user or IP
+async def stream_Leaderboard(request: Request, quiz_id: int):
+    """Server-Sent Events: a snapshot of the top players, then an update
+    event whenever a submission changes them."""
+    return StreamingResponse(
+        stream_leaderboard(quiz_id),
+        media_type="text/event-stream",
+        # Stop proxies from buffering or caching the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/getSubmissionByUser")
-@limiter.limit("60/minute")  # 60 requests per minute per IP
+@limiter.limit("60/minute")  # 60 requests per minute per user or IP
 def create_User(request: Request, user_id: int):
     return get_submission_by_user(user_id)
 
 
-@router.post("/createSubmission")
-@limiter.limit("30/minute")  # 30 submissions per minute per IP
-def create_Submission(request: Request, submission: SubmissionBase):
-    return create_submission(submission)
+@router.get("/getSubmissionHistory", response_model=SubmissionHistoryPage)
+@limiter.limit("60/minute")  # 60 requests per minute per user or IP
+def get_Submission_History(
+    request: Request,
+    user_id: int,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    quiz_id: Optional[int] = None,
+    mode: Literal["all", "latest"] = "all",
+):
+    """A user's submissions, newest first; mode=latest keeps the last attempt per quiz."""
+    return get_submission_history(user_id, limit, cursor, quiz_id, mode == "latest")
+
+
+@router.post("/createSubmission", deprecated=True)
+@limiter.limit("30/minute")  # 30 submissions per minute per user or IP
+def create_Submission(
+    request: Request,
+    submission: SubmissionBase,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+):
+    """Store a score computed by the client. Deprecated: use gradeSubmission."""
+    if not ALLOW_CLIENT_SCORED_SUBMISSIONS:
+        raise HTTPException(
+            status_code=410,
+            detail="Client-scored submissions are disabled; use /Submissions/gradeSubmission",
+        )
+    return run_idempotent(
+        "createSubmission", idempotency_key, submission, lambda: create_submission(submission)
+    )
+
+
+@router.post("/gradeSubmission", response_model=GradedSubmission)
+@limiter.limit("30/minute")  # 30 submissions per minute per user or IP
+def grade_Submission(
+    request: Request,
+    submission: GradeSubmission,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+):
+    """Grade the selected answer per question on the server and store them."""
+    return run_idempotent(
+        "gradeSubmission", idempotency_key, submission, lambda: grade_submission(submission)
+    )
 
 
 @router.get("/getQuizStatistics")
-@limiter.limit("60/minute")  # 60 requests per minute per IP
-def get_Quiz_Statistics(request: Request, quiz_id: int):
-    return get_quiz_statistics(quiz_id)
+@limiter.limit("60/minute")  # 60 requests per minute per user or IP
+def get_Quiz_Statistics(
+    request: Request, quiz_id: int, include_items: bool = False, user=Depends(get_optional_user)
+):
+    if include_items:
+        # Per-answer statistics reveal the correct answers
+        require_quiz_owner(quiz_id, user)
+    statistics = get_quiz_statistics(quiz_id)
+    if include_items:
+        # Per-question item analysis from the last analyze-items run
+        statistics["items"] = get_item_statistics(quiz_id)
+    return statistics
+
+
+@router.get("/getScoreDistribution")
+@limiter.limit("60/minute")  # 60 requests per minute per user or IP
+def get_Score_Distribution(request: Request, quiz_id: int):
+    """Score histogram with median and other percentiles for a quiz."""
+    return get_score_distribution(quiz_id)
+
+
+@router.get("/getSubmissionTimeSeries")
+@limiter.limit("60/minute")  # 60 requests per minute per user or IP
+def get_Submission_Time_Series(
+    request: Request,
+    quiz_id: Optional[int] = None,
+    bucket: Literal["hour", "day"] = "hour",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+):
+    """Attempts and average score per hour or day, for one quiz or all of them."""
+    return get_submission_time_series(quiz_id, bucket, start, end)
+
+
+@router.get("/exportSubmissions")
+@limiter.limit("10/minute")  # 10 exports per minute per user or IP
+def get_Submission_Export(
+    request: Request,
+    quiz_id: int,
+    format: Literal["csv", "ndjson", "parquet"] = "csv",
+):
+    """Download every submission of a quiz, streamed as it is read."""
+    return export_submissions(quiz_id, format)
@@ -1,23 +1,23 @@
-from ..configAndAuth import authenticate_user, create_access_token
-from ..services.User_Services import get_user, create_user
+from ..configAndAuth import authenticate_user, create_access_token, password_needs_rehash
+from ..services.User_Services import get_user, create_user, rehash_password
 from ..utils.validation import validate_email, validate_password_strength
 from fastapi.security import OAuth2PasswordRequestForm
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
 from ..models.User_Model import User
 from datetime import timedelta
-from ..rate_limiter import limiter
+from ..rate_limiter import ip_key, limiter
 
 router = APIRouter(prefix="/Users", tags=["Users"])
 
 
 @router.get("/getUser")
-@limiter.limit("30/minute")  # 30 requests per minute per IP
+@limiter.limit("30/minute")  # 30 requests per minute per user or IP
 def get_User(request: Request, user_id: int):
     return get_user(user_id)
 
 
 @router.post("/createUser")
-@limiter.limit("5/minute")  # 5 registrations per minute per IP (prevent spam)
+@limiter.limit("5/minute", key_func=ip_key)  # 5 registrations per minute per IP, even with a token (prevent spam)
 def create_User(request: Request, user: User):
     # Validate and sanitize email
     user.user_email = validate_email(user.user_email)
@@ -29,11 +29,20 @@ def create_User(request: Request, user: User):
 
 
 @router.post("/login")
-@limiter.limit("10/minute")  # 10 login attempts per minute per IP (prevent brute force)
-def login(request: Request, form_data: OAuth2PasswordRequestForm = Depends()):
+@limiter.limit("10/minute", key_func=ip_key)  # 10 login attempts per minute per IP, even with a token (prevent brute force)
+def login(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    form_data: OAuth2PasswordRequestForm = Depends(),
+):
     user = authenticate_user(form_data.username, form_data.password)
     if not user:
         raise HTTPException(status_code=400, detail="Invalid username or password")
+    if password_needs_rehash(user["hashed_password"]):
+        # Upgrade plaintext or outdated-cost hashes after the response is sent
+        background_tasks.add_task(
+            rehash_password, user["user_id"], form_data.password, user["hashed_password"]
+        )
 
     # JWT token with subject = user email
     access_token = create_access_token(
@@ -0,0 +1,250 @@
+"""
+Database Schema
+Summary tables and indexes used by the read-optimized endpoints.
+Every statement is idempotent. Run them as a deploy step before starting the
+app (render.yaml does this):
+    python -m app.maintenance migrate
+
+Only DDL lives here. Rows for data that predates a summary table are written
+by `python -m app.maintenance rebuild-stats`, which migrate suggests when it
+adds one to a database that already has quizzes.
+"""
+
+import logging
+from psycopg2 import sql
+from .database import get_db_connection
+
+# Arbitrary key so concurrent workers do not race on CREATE ... IF NOT EXISTS
+SCHEMA_LOCK_ID = 72_514_001
+
+SCHEMA_STATEMENTS = [
+    # Per-quiz counters maintained in the same transaction as the writes that
+    # change them (see services/Quiz_Stats_Services.py)
+    """
+    CREATE TABLE IF NOT EXISTS quiz_stats (
+        quiz_id INTEGER PRIMARY KEY REFERENCES quiz(quiz_id) ON DELETE CASCADE,
+        question_count INTEGER NOT NULL DEFAULT 0,
+        attempt_count INTEGER NOT NULL DEFAULT 0,
+        score_sum BIGINT NOT NULL DEFAULT 0,
+        score_sq_sum BIGINT NOT NULL DEFAULT 0,
+        best_score INTEGER
+    )
+    """,
+    # Attempts per distinct score, read as a histogram by getScoreDistribution
+    """
+    CREATE TABLE IF NOT EXISTS quiz_score_counts (
+        quiz_id INTEGER NOT NULL REFERENCES quiz(quiz_id) ON DELETE CASCADE,
+        score INTEGER NOT NULL,
+        attempt_count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (quiz_id, score)
+    )
+    """,
+    # Attempts per quiz and hour, read by getSubmissionTimeSeries
+    """
+    CREATE TABLE IF NOT EXISTS quiz_hourly_stats (
+        quiz_id INTEGER NOT NULL REFERENCES quiz(quiz_id) ON DELETE CASCADE,
+        hour TIMESTAMP NOT NULL,
+        attempt_count INTEGER NOT NULL DEFAULT 0,
+        score_sum BIGINT NOT NULL DEFAULT 0,
+        best_score INTEGER,
+        PRIMARY KEY (quiz_id, hour)
+    )
+    """,
+    # Best attempt per user and quiz, maintained with every submission and
+    # read in rank order to load the in-process leaderboards (app/leaderboard.py)
+    """
+    CREATE TABLE IF NOT EXISTS quiz_leaderboard (
+        quiz_id INTEGER NOT NULL REFERENCES quiz(quiz_id) ON DELETE CASCADE,
+        user_id INTEGER NOT NULL REFERENCES users(user_id) ON DELETE CASCADE,
+        best_score INTEGER NOT NULL,
+        submitted_at TIMESTAMP NOT NULL,
+        submission_id INTEGER NOT NULL,
+        PRIMARY KEY (quiz_id, user_id)
+    )
+    """,
+    # Per-question answers of server-graded submissions
+    """
+    CREATE TABLE IF NOT EXISTS user_answers (
+        user_answer_id SERIAL PRIMARY KEY,
+        submission_id INTEGER NOT NULL REFERENCES submission(submission_id) ON DELETE CASCADE,
+        question_id INTEGER NOT NULL REFERENCES question(question_id) ON DELETE CASCADE,
+        answer_id INTEGER NOT NULL REFERENCES answer(answer_id) ON DELETE CASCADE
+    )
+    """,
+    # Item analysis results (services/Item_Analysis_Services.py)
+    """
+    CREATE TABLE IF NOT EXISTS question_item_stats (
+        question_id INTEGER PRIMARY KEY REFERENCES question(question_id) ON DELETE CASCADE,
+        quiz_id INTEGER NOT NULL REFERENCES quiz(quiz_id) ON DELETE CASCADE,
+        responses INTEGER NOT NULL,
+        p_value DOUBLE PRECISION,
+        discrimination DOUBLE PRECISION,
+        computed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS answer_item_stats (
+        answer_id INTEGER PRIMARY KEY REFERENCES answer(answer_id) ON DELETE CASCADE,
+        question_id INTEGER NOT NULL,
+        quiz_id INTEGER NOT NULL REFERENCES quiz(quiz_id) ON DELETE CASCADE,
+        selections INTEGER NOT NULL,
+        selection_rate DOUBLE PRECISION
+    )
+    """,
+    # Responses of create requests sent with an Idempotency-Key
+    # (services/Idempotency_Services.py); status_code is NULL while in progress
+    """
+    CREATE TABLE IF NOT EXISTS idempotency_keys (
+        endpoint VARCHAR(100) NOT NULL,
+        idempotency_key VARCHAR(255) NOT NULL,
+        fingerprint VARCHAR(64) NOT NULL,
+        status_code SMALLINT,
+        response_body BYTEA,
+        created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (endpoint, idempotency_key)
+    )
+    """,
+]
+
+# Columns added to tables that may predate them, as (table, column, type).
+# ALTER TABLE locks the table even when the column exists, so only the
+# missing ones are added. New score aggregates start at zero until
+# rebuild-stats recounts them.
+SCHEMA_COLUMNS = [
+    ("quiz_stats", "score_sum", "BIGINT NOT NULL DEFAULT 0"),
+    ("quiz_stats", "score_sq_sum", "BIGINT NOT NULL DEFAULT 0"),
+    ("quiz_stats", "best_score", "INTEGER"),
+]
+
+# Tables whose rows are derived from submission and quiz; when one is created
+# or extended on a database that already has quizzes, it needs rebuild-stats
+SUMMARY_TABLES = ("quiz_stats", "quiz_score_counts", "quiz_hourly_stats", "quiz_leaderboard")
+
+# Built with CREATE INDEX CONCURRENTLY so writes to submission and quiz keep
+# going during a deploy, as (name, table and columns)
+SCHEMA_INDEXES = [
+    # Time series across all quizzes
+    ("idx_quiz_hourly_stats_hour", "quiz_hourly_stats(hour)"),
+    (
+        "idx_quiz_leaderboard_rank",
+        "quiz_leaderboard(quiz_id, best_score DESC, submitted_at, user_id)",
+    ),
+    # Legacy full leaderboard (getLeaderboardByQuiz) reads in index order
+    ("idx_submission_quiz_score", "submission(quiz_id, score DESC, submitted_at)"),
+    # Keyset pagination of a user's submission history, newest first. Legacy
+    # rows without submitted_at sort as the epoch (see build_history_query)
+    (
+        "idx_submission_user_history",
+        "submission(user_id, (COALESCE(submitted_at, 'epoch'::timestamp)) DESC, submission_id DESC)",
+    ),
+    (
+        "idx_submission_user_quiz_history",
+        "submission(user_id, quiz_id, (COALESCE(submitted_at, 'epoch'::timestamp)) DESC, submission_id DESC)",
+    ),
+    ("idx_user_answers_submission", "user_answers(submission_id)"),
+    ("idx_question_item_stats_quiz", "question_item_stats(quiz_id)"),
+    ("idx_answer_item_stats_quiz", "answer_item_stats(quiz_id)"),
+    ("idx_idempotency_keys_created_at", "idempotency_keys(created_at)"),
+    # Keyset pagination of the quiz catalog
+    ("idx_quiz_created_at_id", "quiz(created_at, quiz_id)"),
+    ("idx_quiz_created_by_created_at_id", "quiz(created_by, created_at, quiz_id)"),
+    ("idx_quiz_title_prefix", "quiz(quiz_title text_pattern_ops)"),
+]
+
+MISSING_TABLES_SQL = """
+    SELECT name FROM unnest(%s::text[]) AS name WHERE to_regclass(name) IS NULL
+"""
+
+COLUMN_EXISTS_SQL = """
+    SELECT 1 FROM information_schema.columns
+    WHERE table_schema = current_schema() AND table_name = %s AND column_name = %s
+"""
+
+# A failed or interrupted CREATE INDEX CONCURRENTLY leaves an INVALID index
+# behind, which IF NOT EXISTS would then skip
+INVALID_INDEX_SQL = """
+    SELECT 1 FROM pg_index WHERE indexrelid = to_regclass(%s) AND NOT indisvalid
+"""
+
+
+def ensure_tables() -> bool:
+    """Create missing tables and columns in one transaction.
+
+    Returns True when a summary table was created or extended on a database
+    that already has quizzes, i.e. when rebuild-stats is needed.
+    """
+    with get_db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT pg_advisory_xact_lock(%s)", (SCHEMA_LOCK_ID,))
+        cur.execute(MISSING_TABLES_SQL, (list(SUMMARY_TABLES),))
+        changed = bool(cur.fetchall())
+        for statement in SCHEMA_STATEMENTS:
+            cur.execute(statement)
+        for table, column, column_type in SCHEMA_COLUMNS:
+            cur.execute(COLUMN_EXISTS_SQL, (table, column))
+            if cur.fetchone():
+                continue
+            cur.execute(
+                sql.SQL("ALTER TABLE {} ADD COLUMN IF NOT EXISTS {} {}").format(
+                    sql.Identifier(table), sql.Identifier(column), sql.SQL(column_type)
+                )
+            )
+            changed = True
+        if changed:
+            cur.execute("SELECT EXISTS (SELECT 1 FROM quiz)")
+            changed = cur.fetchone()[0]
+        conn.commit()
+        cur.close()
+    return changed
+
+
+def ensure_indexes() -> None:
+    """Build missing indexes concurrently, replacing any left INVALID by an earlier failure.
+
+    CREATE INDEX CONCURRENTLY cannot run inside a transaction, so the
+    connection is switched to autocommit and the advisory lock is held for
+    the session instead.
+    """
+    with get_db_connection() as conn:
+        conn.autocommit = True
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT pg_advisory_lock(%s)", (SCHEMA_LOCK_ID,))
+            try:
+                for name, columns in SCHEMA_INDEXES:
+                    cur.execute(INVALID_INDEX_SQL, (name,))
+                    if cur.fetchone():
+                        logging.warning("Rebuilding invalid index %s", name)
+                        cur.execute(
+                            sql.SQL("DROP INDEX CONCURRENTLY IF EXISTS {}").format(
+                                sql.Identifier(name)
+                            )
+                        )
+                    cur.execute(
+                        sql.SQL("CREATE INDEX CONCURRENTLY IF NOT EXISTS {} ON {}").format(
+                            sql.Identifier(name), sql.SQL(columns)
+                        )
+                    )
+            finally:
+                cur.execute("SELECT pg_advisory_unlock(%s)", (SCHEMA_LOCK_ID,))
+                cur.close()
+        finally:
+            # The connection goes back to the pool; everything else expects transactions
+            conn.autocommit = False
+
+
+def ensure_schema() -> None:
+    """Create any missing summary tables and indexes."""
+    needs_rebuild = ensure_tables()
+    ensure_indexes()
+    logging.info("Database schema is up to date")
+    if needs_rebuild:
+        logging.warning(
+            "New summary tables or columns are empty for existing quizzes; "
+            "run `python -m app.maintenance rebuild-stats` to fill them in"
+        )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    ensure_schema()
@@ -1,6 +1,7 @@
 import logging
 from ..models.Answer_Model import AnswerBase, UpdateAnswer
 from ..database import get_db_connection
+from ..cache import invalidate_quiz_content
 from fastapi import HTTPException
 from fastapi.responses import JSONResponse
 
@@ -13,19 +14,31 @@ def create_answer(answer: AnswerBase):
             cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
 
             cur.execute(
-                "INSERT INTO answer(question_id,answer_text,is_correct) VALUES(%s,%s,%s);",
+                """
+                WITH new_answer AS (
+                    INSERT INTO answer(question_id,answer_text,is_correct)
+                    VALUES(%s,%s,%s)
+                    RETURNING question_id
+                )
+                SELECT q.quiz_id FROM new_answer JOIN question q ON q.question_id = new_answer.question_id;
+                """,
                 (
                     answer.question_id,
                     answer.answer_text,
                     answer.is_correct,
                 ),
             )
+            row = cur.fetchone()
 
             conn.commit()
             cur.close()
 
+        if row is not None:
+            invalidate_quiz_content(row["quiz_id"])
         return JSONResponse(status_code=200, content={"Answer": "created"})
 
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(e)
         raise HTTPException(status_code=500, detail=str(e))
@@ -47,6 +60,8 @@ def get_all_answers_by_question(question_id: int):
             raise HTTPException(status_code=404, detail="No Answers found for Question")
         return [AnswerBase(**row) for row in rows]
 
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(str(e))
         raise HTTPException(status_code=500, detail=str(e))
@@ -66,7 +81,12 @@ def update_answer_of_question(answer: UpdateAnswer):
             ),
         )
             cur.execute(
-                "UPDATE answer SET answer_text = %s ,is_correct = %s WHERE question_id = %s AND answer_id = %s",
+                """
+                UPDATE answer a SET answer_text = %s ,is_correct = %s
+                FROM question q
+                WHERE q.question_id = a.question_id AND a.question_id = %s AND a.answer_id = %s
+                RETURNING q.quiz_id
+                """,
                 (
                     answer.answer_text,
                     answer.answer_true,
@@ -74,12 +94,17 @@ def update_answer_of_question(answer: UpdateAnswer):
                     answer.answer_id,
                 ),
             )
+            rows = cur.fetchall()
 
             conn.commit()
             cur.close()
 
+        for row in rows:
+            invalidate_quiz_content(row["quiz_id"])
         return JSONResponse(status_code=200, content={"Answer": "Updated"})
 
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(e)
         raise HTTPException(status_code=500, detail=str(e))
@@ -90,7 +115,11 @@ def delete_answer(question_id: int, answer_id: int):
         with get_db_connection() as conn:
             cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
             cur.execute(
-                "DELETE FROM answer WHERE question_id = %s AND answer_id = %s",
+                """
+                DELETE FROM answer a USING question q
+                WHERE q.question_id = a.question_id AND a.question_id = %s AND a.answer_id = %s
+                RETURNING q.quiz_id
+                """,
                 (
                     question_id,
                     answer_id,
@@ -99,11 +128,15 @@ def delete_answer(question_id: int, answer_id: int):
 
             if cur.rowcount == 0:
                 raise HTTPException(status_code=404, detail="Answer not found")
+            row = cur.fetchone()
 
             conn.commit()
             cur.close()
 
+        invalidate_quiz_content(row["quiz_id"])
         return JSONResponse(status_code=200, content={"Answer": "Deleted"})
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
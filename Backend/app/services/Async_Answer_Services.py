@@ -0,0 +1,120 @@
+import logging
+from ..models.Answer_Model import AnswerBase, UpdateAnswer
+from ..async_database import get_async_db_connection
+from ..cache import invalidate_quiz_content
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+
+
+async def create_answer(answer: AnswerBase):
+    try:
+        async with get_async_db_connection() as conn:
+            cur = await conn.execute(
+                """
+                WITH new_answer AS (
+                    INSERT INTO answer(question_id,answer_text,is_correct)
+                    VALUES(%s,%s,%s)
+                    RETURNING question_id
+                )
+                SELECT q.quiz_id FROM new_answer JOIN question q ON q.question_id = new_answer.question_id;
+                """,
+                (
+                    answer.question_id,
+                    answer.answer_text,
+                    answer.is_correct,
+                ),
+            )
+            row = await cur.fetchone()
+            await conn.commit()
+
+        if row is not None:
+            invalidate_quiz_content(row["quiz_id"])
+        return JSONResponse(status_code=200, content={"Answer": "created"})
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def get_all_answers_by_question(question_id: int):
+    try:
+        async with get_async_db_connection() as conn:
+            cur = await conn.execute(
+                "SELECT * FROM answer WHERE question_id = %s;",
+                (question_id,),
+            )
+            rows = await cur.fetchall()
+
+        if not rows:
+            raise HTTPException(status_code=404, detail="No Answers found for Question")
+        return [AnswerBase(**row) for row in rows]
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(str(e))
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def update_answer_of_question(answer: UpdateAnswer):
+    try:
+        async with get_async_db_connection() as conn:
+            cur = await conn.execute(
+                """
+                UPDATE answer a SET answer_text = %s ,is_correct = %s
+                FROM question q
+                WHERE q.question_id = a.question_id AND a.question_id = %s AND a.answer_id = %s
+                RETURNING q.quiz_id
+                """,
+                (
+                    answer.answer_text,
+                    answer.answer_true,
+                    answer.question_id,
+                    answer.answer_id,
+                ),
+            )
+            rows = await cur.fetchall()
+            await conn.commit()
+
+        for row in rows:
+            invalidate_quiz_content(row["quiz_id"])
+        return JSONResponse(status_code=200, content={"Answer": "Updated"})
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def delete_answer(question_id: int, answer_id: int):
+    try:
+        async with get_async_db_connection() as conn:
+            cur = await conn.execute(
+                """
+                DELETE FROM answer a USING question q
+                WHERE q.question_id = a.question_id AND a.question_id = %s AND a.answer_id = %s
+                RETURNING q.quiz_id
+                """,
+                (
+                    question_id,
+                    answer_id,
+                ),
+            )
+
+            if cur.rowcount == 0:
+                raise HTTPException(status_code=404, detail="Answer not found")
+            row = await cur.fetchone()
+
+            await conn.commit()
+
+        invalidate_quiz_content(row["quiz_id"])
+        return JSONResponse(status_code=200, content={"Answer": "Deleted"})
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(e)
+        raise HTTPException(status_code=500, detail=str(e))
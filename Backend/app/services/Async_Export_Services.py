@@ -0,0 +1,68 @@
+import logging
+from typing import AsyncIterator
+from ..async_database import get_async_db_connection
+from ..config import EXPORT_BATCH_ROWS
+from .Export_Services import (
+    EXPORT_ENCODERS,
+    EXPORT_TIMEOUTS,
+    EXPORT_TIMEOUTS_SQL,
+    QUIZ_EXISTS_SQL,
+    SUBMISSIONS_EXPORT_SQL,
+    acquire_export_slot,
+    export_response,
+    release_export_slot,
+)
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+from psycopg.rows import tuple_row
+
+
+async def _export_chunks(quiz_id: int, encoder) -> AsyncIterator[bytes]:
+    try:
+        async with get_async_db_connection() as conn:
+            await conn.execute(EXPORT_TIMEOUTS_SQL, EXPORT_TIMEOUTS)
+            async with conn.cursor(name="submission_export", row_factory=tuple_row) as cur:
+                cur.itersize = EXPORT_BATCH_ROWS
+                await cur.execute(SUBMISSIONS_EXPORT_SQL, (quiz_id,))
+                yield b""
+                yield encoder.start()
+                while True:
+                    rows = await cur.fetchmany(EXPORT_BATCH_ROWS)
+                    if not rows:
+                        break
+                    yield encoder.encode(rows)
+            await conn.commit()
+        yield encoder.finish()
+    except Exception as e:
+        logging.error("Export of quiz %s failed: %s", quiz_id, e)
+        raise
+    finally:
+        release_export_slot()
+
+
+async def export_submissions(quiz_id: int, export_format: str) -> StreamingResponse:
+    """Async counterpart of ``Export_Services.export_submissions``."""
+    acquire_export_slot()
+    handed_off = False
+    try:
+        encoder = EXPORT_ENCODERS[export_format]()
+        async with get_async_db_connection() as conn:
+            cur = await conn.execute(QUIZ_EXISTS_SQL, (quiz_id,))
+            exists = await cur.fetchone()
+
+        if exists is None:
+            raise HTTPException(status_code=404, detail="Quiz not found")
+        chunks = _export_chunks(quiz_id, encoder)
+        handed_off = True
+        await chunks.__anext__()
+        return export_response(quiz_id, encoder, chunks)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(e)
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if not handed_off:
+            release_export_slot()
@@ -0,0 +1,78 @@
+import asyncio
+import logging
+from ..models.Submission_Model import GradeSubmission
+from ..async_database import get_async_db_connection
+from ..cache import answer_key_cache
+from ..leaderboard import leaderboards
+from ..config import SUBMISSION_BATCHING
+from .Async_Question_Services import get_quiz_answer_key
+from .Grading_Services import (
+    AnswerKey,
+    GRADED_SUBMISSION_SQL,
+    build_graded_submission,
+    queue_graded_submission,
+)
+from .Quiz_Stats_Services import record_submission_async
+from fastapi import HTTPException
+
+
+async def get_answer_key(quiz_id: int) -> AnswerKey:
+    """Async counterpart of ``Grading_Services.get_answer_key``."""
+    key = answer_key_cache.get(quiz_id)
+    if key is not None:
+        return key
+
+    version = answer_key_cache.version(quiz_id)
+    key = AnswerKey(await get_quiz_answer_key(quiz_id))
+    answer_key_cache.put(quiz_id, version, key)
+    return key
+
+
+async def grade_submission(submission: GradeSubmission):
+    try:
+        key = await get_answer_key(submission.quiz_id)
+        if key.total_questions == 0:
+            raise HTTPException(status_code=404, detail="Quiz has no questions to grade")
+        score = key.grade(submission.answers)
+
+        if SUBMISSION_BATCHING:
+            future = queue_graded_submission(submission, score)
+            submission_id, submitted_at = await asyncio.wrap_future(future)
+        else:
+            async with get_async_db_connection() as conn:
+                cur = await conn.execute(
+                    GRADED_SUBMISSION_SQL,
+                    (
+                        submission.user_id,
+                        submission.quiz_id,
+                        score,
+                        [selection.question_id for selection in submission.answers],
+                        [selection.answer_id for selection in submission.answers],
+                    ),
+                )
+                row = await cur.fetchone()
+                submission_id, submitted_at = row["submission_id"], row["submitted_at"]
+                await record_submission_async(
+                    conn,
+                    submission.quiz_id,
+                    submission.user_id,
+                    score,
+                    submission_id,
+                    submitted_at,
+                )
+                await conn.commit()
+
+        leaderboards.offer(
+            submission.quiz_id,
+            submission.user_id,
+            score,
+            submitted_at,
+            submission_id,
+        )
+        return build_graded_submission(submission, key, score, submission_id, submitted_at)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(e)
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,74 @@
+import logging
+from typing import Any, Awaitable, Callable, Optional
+from ..async_database import get_async_db_connection
+from .Idempotency_Services import (
+    CLAIM_KEY_SQL,
+    STORED_RESPONSE_SQL,
+    STORE_RESPONSE_SQL,
+    RELEASE_KEY_SQL,
+    idempotency_cache,
+    request_fingerprint,
+    check_key,
+    claim_params,
+    to_response,
+    replay_response,
+    stored_outcome,
+)
+
+
+async def run_idempotent(
+    endpoint: str, key: Optional[str], payload: Any, operation: Callable[[], Awaitable[Any]]
+) -> Any:
+    """Async counterpart of ``Idempotency_Services.run_idempotent``."""
+    if key is None:
+        return await operation()
+    key = check_key(key)
+    cache_key = (endpoint, key)
+    fingerprint = request_fingerprint(payload)
+
+    cached = idempotency_cache.get(cache_key)
+    if cached is not None and cached[0] == fingerprint:
+        return replay_response(cached[1])
+
+    async with get_async_db_connection() as conn:
+        cur = await conn.execute(CLAIM_KEY_SQL, claim_params(endpoint, key, fingerprint))
+        claimed = await cur.fetchone() is not None
+        row = None
+        if not claimed:
+            cur = await conn.execute(STORED_RESPONSE_SQL, (endpoint, key))
+            row = await cur.fetchone()
+        await conn.commit()
+
+    if not claimed:
+        stored = stored_outcome(row, fingerprint)
+        idempotency_cache.put(cache_key, idempotency_cache.version(cache_key), (fingerprint, stored))
+        return replay_response(stored)
+
+    try:
+        response = to_response(await operation())
+    except BaseException:
+        await _release(endpoint, key)
+        raise
+    if not 200 <= response.status_code < 300:
+        await _release(endpoint, key)
+        return response
+
+    stored = (response.status_code, bytes(response.body))
+    try:
+        async with get_async_db_connection() as conn:
+            await conn.execute(STORE_RESPONSE_SQL, (*stored, endpoint, key))
+            await conn.commit()
+    except Exception as e:
+        # The write itself succeeded; the claim stays and expires on its own
+        logging.error("Could not store idempotent response: %s", e)
+    idempotency_cache.put(cache_key, idempotency_cache.version(cache_key), (fingerprint, stored))
+    return response
+
+
+async def _release(endpoint: str, key: str) -> None:
+    try:
+        async with get_async_db_connection() as conn:
+            await conn.execute(RELEASE_KEY_SQL, (endpoint, key))
+            await conn.commit()
+    except Exception as e:
+        logging.error("Could not release idempotency key: %s", e)
@@ -0,0 +1,26 @@
+import logging
+from ..async_database import get_async_db_connection
+from .Item_Analysis_Services import (
+    QUESTION_ITEM_STATS_SQL,
+    ANSWER_ITEM_STATS_SQL,
+    build_item_statistics,
+)
+from fastapi import HTTPException
+
+
+async def get_item_statistics(quiz_id: int) -> list:
+    """Async counterpart of ``Item_Analysis_Services.get_item_statistics``."""
+    try:
+        async with get_async_db_connection() as conn:
+            cur = await conn.execute(QUESTION_ITEM_STATS_SQL, (quiz_id,))
+            question_rows = await cur.fetchall()
+            cur = await conn.execute(ANSWER_ITEM_STATS_SQL, (quiz_id,))
+            answer_rows = await cur.fetchall()
+
+        return build_item_statistics(question_rows, answer_rows)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(e)
+        raise HTTPException(status_code=500, detail=str(e))
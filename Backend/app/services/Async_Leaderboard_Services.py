@@ -0,0 +1,50 @@
+import logging
+from typing import Optional
+from ..models.Submission_Model import LeaderboardEntry
+from ..async_database import get_async_db_connection
+from ..leaderboard import QuizLeaderboard, leaderboards
+from .Leaderboard_Services import LEADERBOARD_LOAD_SQL, build_leaderboard_page
+from fastapi import HTTPException
+
+
+async def get_leaderboard(quiz_id: int) -> QuizLeaderboard:
+    """Async counterpart of ``Leaderboard_Services.get_leaderboard``."""
+    board = leaderboards.get(quiz_id)
+    if board is not None:
+        return board
+
+    leaderboards.begin_load(quiz_id)
+    try:
+        async with get_async_db_connection() as conn:
+            cur = await conn.execute(LEADERBOARD_LOAD_SQL, (quiz_id,))
+            board = QuizLeaderboard(await cur.fetchall())
+    except Exception:
+        leaderboards.cancel_load(quiz_id)
+        raise
+    return leaderboards.install(quiz_id, board)
+
+
+async def get_leaderboard_page(quiz_id: int, limit: int, cursor: Optional[str] = None):
+    try:
+        board = await get_leaderboard(quiz_id)
+        return build_leaderboard_page(quiz_id, board, limit, cursor)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def get_user_rank(quiz_id: int, user_id: int):
+    try:
+        entry = (await get_leaderboard(quiz_id)).rank(user_id)
+        if entry is None:
+            raise HTTPException(status_code=404, detail="No Submission found for user in Quiz")
+        return LeaderboardEntry(**entry)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(e)
+        raise HTTPException(status_code=500, detail=str(e))
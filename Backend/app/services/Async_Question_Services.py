@@ -0,0 +1,175 @@
+import logging
+from ..models.Question_Model import QuestionBase, UpdateQuestionBase
+from ..async_database import get_async_db_connection
+from ..cache import quiz_content_cache, invalidate_quiz_content
+from ..utils.http_cache import CachedPayload
+from .Question_Services import QUIZ_ANSWER_KEY_SQL, QUIZ_QUESTIONS_SQL, group_answers
+from .Quiz_Stats_Services import (
+    record_questions_added_async,
+    record_questions_removed_async,
+)
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+
+
+async def create_question(question: QuestionBase):
+    try:
+        async with get_async_db_connection() as conn:
+            cur = await conn.execute(
+                "INSERT INTO question(quiz_id,question_text) VALUES(%s,%s) RETURNING *;",
+                (
+                    question.quiz_id,
+                    question.question_text,
+                ),
+            )
+            new_question = await cur.fetchone()
+            await record_questions_added_async(conn, question.quiz_id)
+            await conn.commit()
+
+        invalidate_quiz_content(question.quiz_id)
+        return JSONResponse(status_code=200, content={"Question": dict(new_question)})
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def get_question_by_quiz(quiz_id: int, question_id: int):
+    try:
+        async with get_async_db_connection() as conn:
+            cur = await conn.execute(
+                "SELECT * FROM question WHERE quiz_id = %s AND question_id = %s",
+                (
+                    quiz_id,
+                    question_id,
+                ),
+            )
+            row = await cur.fetchone()
+
+        if not row:
+            raise HTTPException(status_code=404, detail="No Question found for Quiz")
+        return QuestionBase(**row)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def get_quiz_questions(quiz_id: int):
+    return (await get_quiz_questions_payload(quiz_id)).data
+
+
+async def get_quiz_questions_payload(quiz_id: int) -> CachedPayload:
+    """Serialized getQuizQuestions payload, served from the quiz content cache."""
+    cached = quiz_content_cache.get(quiz_id)
+    if cached is not None:
+        return cached
+
+    # Read the version before querying so a concurrent write is not cached over
+    version = quiz_content_cache.version(quiz_id)
+    try:
+        async with get_async_db_connection() as conn:
+            cur = await conn.execute(QUIZ_QUESTIONS_SQL, (quiz_id,))
+            rows = await cur.fetchall()
+
+        payload = CachedPayload(group_answers(rows))
+        quiz_content_cache.put(quiz_id, version, payload)
+        return payload
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def get_quiz_answer_key(quiz_id: int) -> list:
+    """Async counterpart of ``Question_Services.get_quiz_answer_key``."""
+    try:
+        async with get_async_db_connection() as conn:
+            cur = await conn.execute(QUIZ_ANSWER_KEY_SQL, (quiz_id,))
+            rows = await cur.fetchall()
+        return group_answers(rows, with_key=True)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def get_question_by_id(question_id: int):
+    try:
+        async with get_async_db_connection() as conn:
+            cur = await conn.execute(
+                "SELECT * FROM question WHERE question_id = %s", (question_id,)
+            )
+            row = await cur.fetchone()
+
+        if not row:
+            raise HTTPException(status_code=404, detail="Question not found")
+
+        return QuestionBase(**row)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def edit_question(question: UpdateQuestionBase):
+    try:
+        async with get_async_db_connection() as conn:
+            cur = await conn.execute(
+                "UPDATE question SET question_text = %s WHERE quiz_id = %s AND question_id = %s",
+                (
+                    question.question_text,
+                    question.quiz_id,
+                    question.question_id,
+                ),
+            )
+            if cur.rowcount == 0:
+                raise HTTPException(status_code=404, detail="Question not found")
+
+            await conn.commit()
+
+        invalidate_quiz_content(question.quiz_id)
+        return JSONResponse(status_code=200, content={"Question": "Updated"})
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def delete_question(quiz_id: int, question_id: int):
+    try:
+        async with get_async_db_connection() as conn:
+            cur = await conn.execute(
+                "DELETE FROM question WHERE quiz_id = %s AND question_id = %s",
+                (
+                    quiz_id,
+                    question_id,
+                ),
+            )
+
+            if cur.rowcount == 0:
+                raise HTTPException(status_code=404, detail="Question not found")
+            await record_questions_removed_async(conn, quiz_id)
+
+            await conn.commit()
+
+        invalidate_quiz_content(quiz_id)
+        return JSONResponse(status_code=200, content={"Question": "Deleted"})
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(e)
+        raise HTTPException(status_code=500, detail=str(e))
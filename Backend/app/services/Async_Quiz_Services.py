@@ -0,0 +1,171 @@
+import logging
+from typing import Optional
+from ..models.Quiz_Model import QuizBase
+from ..async_database import get_async_db_connection
+from ..cache import ALL_QUIZZES_KEY, quiz_cache, invalidate_quiz_content
+from ..leaderboard import leaderboards
+from ..utils.http_cache import CachedPayload
+from .Quiz_Services import build_catalog_query, build_catalog_page
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+
+
+async def create_quiz(quiz: QuizBase):
+    try:
+        async with get_async_db_connection() as conn:
+            cur = await conn.execute(
+                "INSERT INTO quiz(quiz_title,created_by,created_at) VALUES(%s,%s,%s)RETURNING *;",
+                (
+                    quiz.quiz_title,
+                    quiz.created_by,
+                    quiz.created_at,
+                ),
+            )
+            new_quiz = await cur.fetchone()
+            await conn.commit()
+
+        quiz_cache.invalidate(ALL_QUIZZES_KEY)
+        return QuizBase(**new_quiz)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def get_quizzes():
+    try:
+        async with get_async_db_connection() as conn:
+            cur = await conn.execute("SELECT * FROM quiz")
+            rows = await cur.fetchall()
+
+        if not rows:
+            raise HTTPException(status_code=404, detail="No quizzes found")
+        return [QuizBase(**row) for row in rows]
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def get_quiz(quiz_id: int):
+    try:
+        async with get_async_db_connection() as conn:
+            cur = await conn.execute("SELECT * FROM quiz WHERE quiz_id = %s", (quiz_id,))
+            row = await cur.fetchone()
+
+        if row is None:
+            raise HTTPException(status_code=404, detail="Quiz not found")
+
+        return QuizBase(**row)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def require_quiz_owner(quiz_id: int, user) -> None:
+    """Async counterpart of ``Quiz_Services.require_quiz_owner``."""
+    if user is None:
+        raise HTTPException(
+            status_code=401,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    if (await get_quiz(quiz_id)).created_by != user["user_email"]:
+        raise HTTPException(status_code=403, detail="Only the creator of this quiz can do this")
+
+
+async def get_quizzes_payload() -> CachedPayload:
+    """Serialized getQuizzes response, cached until a quiz is created, edited or deleted."""
+    cached = quiz_cache.get(ALL_QUIZZES_KEY)
+    if cached is not None:
+        return cached
+
+    version = quiz_cache.version(ALL_QUIZZES_KEY)
+    payload = CachedPayload(await get_quizzes())
+    quiz_cache.put(ALL_QUIZZES_KEY, version, payload)
+    return payload
+
+
+async def get_quiz_payload(quiz_id: int) -> CachedPayload:
+    """Serialized getQuiz response, cached until the quiz is edited or deleted."""
+    cached = quiz_cache.get(quiz_id)
+    if cached is not None:
+        return cached
+
+    version = quiz_cache.version(quiz_id)
+    payload = CachedPayload(await get_quiz(quiz_id))
+    quiz_cache.put(quiz_id, version, payload)
+    return payload
+
+
+async def get_quiz_catalog(
+    limit: int,
+    cursor: Optional[str] = None,
+    created_by: Optional[str] = None,
+    title_prefix: Optional[str] = None,
+):
+    try:
+        sql, params = build_catalog_query(limit, cursor, created_by, title_prefix)
+        async with get_async_db_connection() as conn:
+            cur = await conn.execute(sql, params)
+            rows = await cur.fetchall()
+
+        return build_catalog_page(rows, limit)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def edit_quiz(quiz_id: int, quiz_title: str, created_by: str):
+    try:
+        async with get_async_db_connection() as conn:
+            cur = await conn.execute(
+                "UPDATE quiz SET quiz_title = %s,created_by = %s WHERE quiz_id = %s",
+                (quiz_title, created_by, quiz_id),
+            )
+            if cur.rowcount == 0:
+                raise HTTPException(status_code=404, detail="Quiz not found")
+
+            await conn.commit()
+
+        quiz_cache.invalidate(quiz_id)
+        quiz_cache.invalidate(ALL_QUIZZES_KEY)
+        return JSONResponse(status_code=200, content={"Quiz": "Updated"})
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def delete_quiz(quiz_id: int):
+    try:
+        async with get_async_db_connection() as conn:
+            cur = await conn.execute("DELETE FROM quiz WHERE quiz_id = %s", (quiz_id,))
+            if cur.rowcount == 0:
+                raise HTTPException(status_code=404, detail="Quiz not found")
+
+            await conn.commit()
+
+        invalidate_quiz_content(quiz_id)
+        quiz_cache.invalidate(quiz_id)
+        quiz_cache.invalidate(ALL_QUIZZES_KEY)
+        leaderboards.invalidate(quiz_id)
+        return JSONResponse(status_code=200, content={"Quiz": "Deleted"})
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(e)
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,20 @@
+import logging
+from ..async_database import get_async_db_connection
+from .Score_Distribution_Services import SCORE_DISTRIBUTION_SQL, build_score_distribution
+from fastapi import HTTPException
+
+
+async def get_score_distribution(quiz_id: int):
+    """Async counterpart of ``Score_Distribution_Services.get_score_distribution``."""
+    try:
+        async with get_async_db_connection() as conn:
+            cur = await conn.execute(SCORE_DISTRIBUTION_SQL, (quiz_id,))
+            rows = await cur.fetchall()
+
+        return build_score_distribution(quiz_id, rows)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(e)
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,141 @@
+import asyncio
+import logging
+from typing import Optional
+from ..models.Submission_Model import SubmissionBase
+from ..async_database import get_async_db_connection
+from ..leaderboard import leaderboards
+from ..config import SUBMISSION_BATCHING
+from .Submission_Batch_Services import INSERT_SUBMISSION_SQL, get_submission_writer
+from .Quiz_Stats_Services import record_submission_async
+from .Submission_Services import (
+    QUIZ_STATISTICS_SQL,
+    build_quiz_statistics,
+    build_history_query,
+    build_history_page,
+)
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+
+
+async def create_submission(submission: SubmissionBase):
+    try:
+        if SUBMISSION_BATCHING:
+            future = get_submission_writer().submit(submission)
+            submission_id, submitted_at = await asyncio.wrap_future(future)
+        else:
+            async with get_async_db_connection() as conn:
+                cur = await conn.execute(
+                    INSERT_SUBMISSION_SQL,
+                    (
+                        submission.user_id,
+                        submission.quiz_id,
+                        submission.score,
+                        submission.submitted_at,
+                    ),
+                )
+                row = await cur.fetchone()
+                submission_id, submitted_at = row["submission_id"], row["submitted_at"]
+                await record_submission_async(
+                    conn,
+                    submission.quiz_id,
+                    submission.user_id,
+                    submission.score,
+                    submission_id,
+                    submitted_at,
+                )
+                await conn.commit()
+
+        leaderboards.offer(
+            submission.quiz_id,
+            submission.user_id,
+            submission.score,
+            submitted_at,
+            submission_id,
+        )
+        return JSONResponse(status_code=200, content={"Submission": "Submitted"})
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def get_quiz_statistics(quiz_id: int):
+    """Async counterpart of ``Submission_Services.get_quiz_statistics``."""
+
+    try:
+        async with get_async_db_connection() as conn:
+            cur = await conn.execute(QUIZ_STATISTICS_SQL, (quiz_id,))
+            row = await cur.fetchone()
+
+        return build_quiz_statistics(quiz_id, row)
+
+    except HTTPException:
+        # Re-raise HTTPExceptions directly
+        raise
+    except Exception as e:
+        logging.error(e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def get_leaderboard_by_quiz(quiz_id: int):
+    try:
+        async with get_async_db_connection() as conn:
+            cur = await conn.execute(
+                "SELECT * FROM submission WHERE quiz_id = %s ORDER BY score DESC, submitted_at ASC",
+                (quiz_id,),
+            )
+            rows = await cur.fetchall()
+
+        if not rows:
+            raise HTTPException(status_code=404, detail="No Submission found for Quiz")
+        return [SubmissionBase(**row) for row in rows]
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def get_submission_by_user(user_id: int):
+    try:
+        async with get_async_db_connection() as conn:
+            cur = await conn.execute(
+                "SELECT * FROM submission WHERE user_id = %s", (user_id,)
+            )
+            rows = await cur.fetchall()
+
+        if not rows:
+            raise HTTPException(status_code=404, detail="No Submission found for user")
+        return [SubmissionBase(**row) for row in rows]
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def get_submission_history(
+    user_id: int,
+    limit: int,
+    cursor: Optional[str] = None,
+    quiz_id: Optional[int] = None,
+    latest: bool = False,
+):
+    """Async counterpart of ``Submission_Services.get_submission_history``."""
+    try:
+        sql, params = build_history_query(user_id, limit, cursor, quiz_id, latest)
+        async with get_async_db_connection() as conn:
+            cur = await conn.execute(sql, params)
+            rows = await cur.fetchall()
+
+        return build_history_page(rows, limit)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(e)
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,29 @@
+import logging
+from datetime import datetime
+from typing import Optional
+from ..async_database import get_async_db_connection
+from .Time_Series_Services import build_time_series, time_range, time_series_params
+from fastapi import HTTPException
+
+
+async def get_submission_time_series(
+    quiz_id: Optional[int],
+    bucket: str = "hour",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+):
+    """Async counterpart of ``Time_Series_Services.get_submission_time_series``."""
+    try:
+        start, end = time_range(bucket, start, end)
+        sql, params = time_series_params(quiz_id, bucket, start, end)
+        async with get_async_db_connection() as conn:
+            cur = await conn.execute(sql, params)
+            rows = await cur.fetchall()
+
+        return build_time_series(quiz_id, bucket, start, end, rows)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(e)
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,99 @@
+from ..models.User_Model import User
+from ..async_database import get_async_db_connection
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+import logging
+from datetime import datetime
+from ..configAndAuth import (
+    USER_CREDENTIALS_SQL,
+    get_password_hash_async,
+    verify_password_async,
+    invalidate_user,
+)
+from .User_Services import REHASH_PASSWORD_SQL
+
+
+async def create_user(user: User):
+    try:
+        # Hash the password before saving (truncate if too long). bcrypt is
+        # CPU-bound, so keep it off the event loop.
+        password = user.hashed_password[:72]  # bcrypt max 72 bytes
+        hashed_pw = await get_password_hash_async(password)
+
+        # Use current timestamp for created_at to avoid client-side date issues
+        created_at = datetime.utcnow()
+
+        async with get_async_db_connection() as conn:
+            cur = await conn.execute(
+                "INSERT INTO users(user_email, hashed_password, created_at) VALUES(%s, %s, %s) RETURNING user_id, user_email, created_at",
+                (
+                    user.user_email,
+                    hashed_pw,
+                    created_at,
+                ),
+            )
+            row = await cur.fetchone()
+            await conn.commit()
+        # The email may be cached as unknown
+        invalidate_user(user.user_email)
+
+        # Convert DB row (which may contain date/datetime) into JSON-serializable dict
+        if row is not None:
+            result = dict(row)
+            if "created_at" in result:
+                # handle both date and datetime objects
+                value = result["created_at"]
+                try:
+                    result["created_at"] = value.isoformat()
+                except AttributeError:
+                    result["created_at"] = str(value)
+        else:
+            result = {"message": "User created"}
+
+        return JSONResponse(status_code=201, content=result)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def get_user(user_id: int):
+    try:
+        async with get_async_db_connection() as conn:
+            cur = await conn.execute("SELECT * FROM users WHERE user_id = %s", (user_id,))
+            row = await cur.fetchone()
+
+        return User(**row)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def authenticate_user(email: str, password: str):
+    """Async counterpart of ``configAndAuth.authenticate_user``."""
+    async with get_async_db_connection() as conn:
+        cur = await conn.execute(USER_CREDENTIALS_SQL, (email,))
+        user = await cur.fetchone()
+
+    if not user:
+        return None
+    if not await verify_password_async(password, user["hashed_password"]):
+        return None
+    return user
+
+
+async def rehash_password(user_id: int, password: str, old_hash: str) -> None:
+    """Async counterpart of ``User_Services.rehash_password``."""
+    try:
+        new_hash = await get_password_hash_async(password[:72])
+        async with get_async_db_connection() as conn:
+            await conn.execute(REHASH_PASSWORD_SQL, (new_hash, user_id, old_hash))
+            await conn.commit()
+        logging.info("Rehashed password for user %s", user_id)
+    except Exception as e:
+        logging.warning("Could not rehash password for user %s: %s", user_id, e)
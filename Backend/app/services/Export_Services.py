@@ -0,0 +1,252 @@
+"""
+Submission Export
+Streams every submission of a quiz as CSV, NDJSON or Parquet.
+
+Rows are read through a server-side cursor EXPORT_BATCH_ROWS at a time and
+each batch is encoded and sent before the next is fetched, so memory stays
+flat however many submissions the quiz has. Parquet needs the optional
+pyarrow package; each batch becomes one row group.
+
+An export keeps its connection for the whole download, so only
+EXPORT_MAX_CONCURRENT run at once and the transaction has its own statement
+and idle timeouts.
+"""
+
+import csv
+import io
+import json
+import logging
+import threading
+from typing import Iterator
+from ..database import get_db_connection
+from ..config import (
+    EXPORT_BATCH_ROWS,
+    EXPORT_IDLE_TIMEOUT_MS,
+    EXPORT_MAX_CONCURRENT,
+    EXPORT_STATEMENT_TIMEOUT_MS,
+)
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+EXPORT_COLUMNS = ("submission_id", "user_id", "user_email", "quiz_id", "score", "submitted_at")
+
+# Read in idx_submission_quiz_score order, like getLeaderboardByQuiz
+SUBMISSIONS_EXPORT_SQL = """
+    SELECT s.submission_id, s.user_id, u.user_email, s.quiz_id, s.score, s.submitted_at
+    FROM submission s
+    LEFT JOIN users u ON u.user_id = s.user_id
+    WHERE s.quiz_id = %s
+    ORDER BY s.score DESC, s.submitted_at ASC
+"""
+
+QUIZ_EXISTS_SQL = "SELECT 1 FROM quiz WHERE quiz_id = %s"
+
+# Transaction-local, so the pooled connection gets its defaults back at commit
+EXPORT_TIMEOUTS_SQL = """
+    SELECT set_config('statement_timeout', %s, true),
+           set_config('idle_in_transaction_session_timeout', %s, true)
+"""
+EXPORT_TIMEOUTS = (str(EXPORT_STATEMENT_TIMEOUT_MS), str(EXPORT_IDLE_TIMEOUT_MS))
+
+# Shared by the sync and async paths; only ever acquired without blocking
+_export_slots = threading.BoundedSemaphore(EXPORT_MAX_CONCURRENT)
+
+
+def acquire_export_slot() -> None:
+    """Take one of the EXPORT_MAX_CONCURRENT export slots or raise a 503."""
+    if not _export_slots.acquire(blocking=False):
+        raise HTTPException(
+            status_code=503,
+            detail="Too many exports in progress, try again shortly",
+            headers={"Retry-After": "5"},
+        )
+
+
+def release_export_slot() -> None:
+    _export_slots.release()
+
+
+class CsvEncoder:
+    extension = "csv"
+    media_type = "text/csv; charset=utf-8"
+
+    def start(self) -> bytes:
+        return self.encode([EXPORT_COLUMNS])
+
+    def encode(self, rows) -> bytes:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerows(
+            [value.isoformat() if hasattr(value, "isoformat") else value for value in row]
+            for row in rows
+        )
+        return buffer.getvalue().encode("utf-8")
+
+    def finish(self) -> bytes:
+        return b""
+
+
+class NdjsonEncoder:
+    extension = "ndjson"
+    media_type = "application/x-ndjson"
+
+    def start(self) -> bytes:
+        return b""
+
+    def encode(self, rows) -> bytes:
+        return "".join(
+            json.dumps(dict(zip(EXPORT_COLUMNS, row)), default=_isoformat, separators=(",", ":"))
+            + "\n"
+            for row in rows
+        ).encode("utf-8")
+
+    def finish(self) -> bytes:
+        return b""
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands back whatever was written since the last drain."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+class ParquetEncoder:
+    extension = "parquet"
+    media_type = "application/vnd.apache.parquet"
+
+    def __init__(self):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise HTTPException(
+                status_code=501, detail="Parquet export requires the pyarrow package"
+            )
+        self._pa = pa
+        self._schema = pa.schema(
+            [
+                ("submission_id", pa.int64()),
+                ("user_id", pa.int64()),
+                ("user_email", pa.string()),
+                ("quiz_id", pa.int64()),
+                ("score", pa.int32()),
+                ("submitted_at", pa.timestamp("us")),
+            ]
+        )
+        self._sink = _ChunkSink()
+        self._writer = pq.ParquetWriter(self._sink, self._schema, compression="zstd")
+
+    def start(self) -> bytes:
+        return self._sink.drain()
+
+    def encode(self, rows) -> bytes:
+        columns = list(zip(*rows))
+        self._writer.write_table(
+            self._pa.Table.from_arrays(
+                [self._pa.array(column, type=field.type) for column, field in zip(columns, self._schema)],
+                schema=self._schema,
+            )
+        )
+        return self._sink.drain()
+
+    def finish(self) -> bytes:
+        self._writer.close()
+        return self._sink.drain()
+
+
+EXPORT_ENCODERS = {
+    "csv": CsvEncoder,
+    "ndjson": NdjsonEncoder,
+    "parquet": ParquetEncoder,
+}
+
+
+def _isoformat(value):
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def export_response(quiz_id: int, encoder, chunks) -> StreamingResponse:
+    filename = f"quiz-{quiz_id}-submissions.{encoder.extension}"
+    return StreamingResponse(
+        chunks,
+        media_type=encoder.media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+def _export_chunks(quiz_id: int, encoder) -> Iterator[bytes]:
+    # The query runs before the response starts (see export_submissions);
+    # later failures can only cut the body short. Owns the export slot from
+    # its first step and gives it back when done, failed or closed.
+    try:
+        with get_db_connection() as conn:
+            setup = conn.cursor()
+            setup.execute(EXPORT_TIMEOUTS_SQL, EXPORT_TIMEOUTS)
+            setup.close()
+            cur = conn.cursor(name="submission_export")
+            cur.itersize = EXPORT_BATCH_ROWS
+            cur.execute(SUBMISSIONS_EXPORT_SQL, (quiz_id,))
+            # export_submissions steps to here before the response starts
+            yield b""
+            yield encoder.start()
+            while True:
+                rows = cur.fetchmany(EXPORT_BATCH_ROWS)
+                if not rows:
+                    break
+                yield encoder.encode(rows)
+            cur.close()
+            conn.commit()
+        yield encoder.finish()
+    except Exception as e:
+        logging.error("Export of quiz %s failed: %s", quiz_id, e)
+        raise
+    finally:
+        release_export_slot()
+
+
+def export_submissions(quiz_id: int, export_format: str) -> StreamingResponse:
+    acquire_export_slot()
+    handed_off = False
+    try:
+        encoder = EXPORT_ENCODERS[export_format]()
+        with get_db_connection() as conn:
+            cur = conn.cursor()
+            cur.execute(QUIZ_EXISTS_SQL, (quiz_id,))
+            exists = cur.fetchone()
+            cur.close()
+
+        if exists is None:
+            raise HTTPException(status_code=404, detail="Quiz not found")
+        chunks = _export_chunks(quiz_id, encoder)
+        handed_off = True
+        next(chunks)
+        return export_response(quiz_id, encoder, chunks)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(e)
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if not handed_off:
+            release_export_slot()
@@ -0,0 +1,178 @@
+import logging
+from typing import Iterable, List
+from ..models.Submission_Model import (
+    GradeSubmission,
+    GradedSubmission,
+    SelectedAnswer,
+    SubmissionBase,
+)
+from ..database import get_db_connection
+from ..cache import answer_key_cache
+from ..leaderboard import leaderboards
+from ..config import SUBMISSION_BATCHING
+from .Question_Services import get_quiz_answer_key
+from .Quiz_Stats_Services import record_submission
+from .Submission_Batch_Services import get_submission_writer
+from fastapi import HTTPException
+
+import psycopg2.extras
+
+# Inserts the submission and every selected answer in one statement
+GRADED_SUBMISSION_SQL = """
+    WITH new_submission AS (
+        INSERT INTO submission(user_id,quiz_id,score,submitted_at)
+        VALUES(%s,%s,%s,CURRENT_TIMESTAMP)
+        RETURNING submission_id, submitted_at
+    ), selected AS (
+        INSERT INTO user_answers(submission_id,question_id,answer_id)
+        SELECT s.submission_id, a.question_id, a.answer_id
+        FROM new_submission s, unnest(%s::int[], %s::int[]) AS a(question_id, answer_id)
+    )
+    SELECT submission_id, submitted_at FROM new_submission;
+"""
+
+
+class AnswerKey:
+    """Correct answers for one quiz, reduced to what grading needs.
+
+    ``answer_question`` maps every answer_id to its question_id so a selection
+    can be checked against the quiz, and ``correct_answers`` is the set of
+    correct answer ids. Grading is then one dict and one set lookup per answer.
+    """
+
+    __slots__ = ("answer_question", "correct_answers", "total_questions")
+
+    def __init__(self, questions: Iterable[dict]):
+        answer_question = {}
+        correct_answers = set()
+        total_questions = 0
+        for question in questions:
+            total_questions += 1
+            for answer in question["answers"]:
+                answer_question[answer["answer_id"]] = question["question_id"]
+                if answer["is_correct"]:
+                    correct_answers.add(answer["answer_id"])
+        self.answer_question = answer_question
+        self.correct_answers = frozenset(correct_answers)
+        self.total_questions = total_questions
+
+    def grade(self, selections: List[SelectedAnswer]) -> int:
+        """Return the number of correctly answered questions.
+
+        Raises a 400 for answers that do not belong to the quiz or the question,
+        or for a question answered more than once.
+        """
+        answered = set()
+        score = 0
+        for selection in selections:
+            if self.answer_question.get(selection.answer_id) != selection.question_id:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Answer {selection.answer_id} does not belong to question {selection.question_id} of this quiz",
+                )
+            if selection.question_id in answered:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Question {selection.question_id} answered more than once",
+                )
+            answered.add(selection.question_id)
+            if selection.answer_id in self.correct_answers:
+                score += 1
+        return score
+
+
+def build_graded_submission(
+    submission: GradeSubmission, key: AnswerKey, score: int, submission_id: int, submitted_at
+) -> GradedSubmission:
+    percentage = (
+        round(score / key.total_questions * 100, 2) if key.total_questions else None
+    )
+    return GradedSubmission(
+        submission_id=submission_id,
+        user_id=submission.user_id,
+        quiz_id=submission.quiz_id,
+        score=score,
+        total_questions=key.total_questions,
+        percentage=percentage,
+        submitted_at=submitted_at,
+    )
+
+
+def queue_graded_submission(submission: GradeSubmission, score: int):
+    """Hand a graded submission and its answers to the batch writer."""
+    return get_submission_writer().submit(
+        SubmissionBase(user_id=submission.user_id, quiz_id=submission.quiz_id, score=score),
+        [(selection.question_id, selection.answer_id) for selection in submission.answers],
+    )
+
+
+def write_graded_submission(submission: GradeSubmission, score: int):
+    """Insert a graded submission with its answers and summary updates;
+    returns (submission_id, submitted_at)."""
+    with get_db_connection() as conn:
+        cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
+        cur.execute(
+            GRADED_SUBMISSION_SQL,
+            (
+                submission.user_id,
+                submission.quiz_id,
+                score,
+                [selection.question_id for selection in submission.answers],
+                [selection.answer_id for selection in submission.answers],
+            ),
+        )
+        row = cur.fetchone()
+        record_submission(
+            cur,
+            submission.quiz_id,
+            submission.user_id,
+            score,
+            row["submission_id"],
+            row["submitted_at"],
+        )
+
+        conn.commit()
+        cur.close()
+
+    return row["submission_id"], row["submitted_at"]
+
+
+def get_answer_key(quiz_id: int) -> AnswerKey:
+    """Answer key for a quiz, read from question and answer on a miss."""
+    key = answer_key_cache.get(quiz_id)
+    if key is not None:
+        return key
+
+    version = answer_key_cache.version(quiz_id)
+    key = AnswerKey(get_quiz_answer_key(quiz_id))
+    answer_key_cache.put(quiz_id, version, key)
+    return key
+
+
+def grade_submission(submission: GradeSubmission):
+    try:
+        key = get_answer_key(submission.quiz_id)
+        if key.total_questions == 0:
+            raise HTTPException(status_code=404, detail="Quiz has no questions to grade")
+        score = key.grade(submission.answers)
+
+        if SUBMISSION_BATCHING:
+            # Blocks until the batch holding this submission has committed
+            submission_id, submitted_at = queue_graded_submission(submission, score).result()
+        else:
+            submission_id, submitted_at = write_graded_submission(submission, score)
+
+        leaderboards.offer(
+            submission.quiz_id,
+            submission.user_id,
+            score,
+            submitted_at,
+            submission_id,
+        )
+        return build_graded_submission(submission, key, score, submission_id, submitted_at)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(e)
+        raise HTTPException(status_code=500, detail=str(e))
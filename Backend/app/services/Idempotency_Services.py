@@ -0,0 +1,217 @@
+"""
+Idempotency Keys
+Replay-safe create endpoints: a request carrying an Idempotency-Key header is
+executed at most once per endpoint and key; retries get the original response.
+
+Completed responses are kept in a bounded in-process TTL cache and in the
+idempotency_keys table, which other workers and restarts fall back to. A
+key is claimed in the table before the operation runs, so a retry that
+arrives while the original is still running gets a 409 instead of a second
+insert.
+"""
+
+import hashlib
+import json
+import logging
+from typing import Any, Callable, Optional, Tuple
+from ..database import get_db_connection
+from ..cache import VersionedLRUCache
+from ..config import (
+    IDEMPOTENCY_CACHE_MAX_ENTRIES,
+    IDEMPOTENCY_TTL_SECONDS,
+    IDEMPOTENCY_IN_PROGRESS_SECONDS,
+)
+from fastapi import HTTPException, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+import psycopg2.extras
+
+MAX_KEY_LENGTH = 255
+
+# Completed requests as (fingerprint, (status_code, body)), keyed by (endpoint, key)
+idempotency_cache = VersionedLRUCache(
+    "idempotency", IDEMPOTENCY_CACHE_MAX_ENTRIES, IDEMPOTENCY_TTL_SECONDS
+)
+
+# Claims the key unless another request holds it. An abandoned claim (the
+# worker died mid-request) or an expired response can be taken over.
+CLAIM_KEY_SQL = """
+    INSERT INTO idempotency_keys (endpoint, idempotency_key, fingerprint)
+    VALUES (%(endpoint)s, %(key)s, %(fingerprint)s)
+    ON CONFLICT (endpoint, idempotency_key) DO UPDATE
+    SET fingerprint = EXCLUDED.fingerprint,
+        status_code = NULL,
+        response_body = NULL,
+        created_at = CURRENT_TIMESTAMP
+    WHERE (idempotency_keys.status_code IS NULL
+           AND idempotency_keys.created_at
+               < CURRENT_TIMESTAMP - make_interval(secs => %(in_progress)s))
+       OR idempotency_keys.created_at
+               < CURRENT_TIMESTAMP - make_interval(secs => %(ttl)s)
+    RETURNING endpoint
+"""
+
+STORED_RESPONSE_SQL = """
+    SELECT fingerprint, status_code, response_body
+    FROM idempotency_keys
+    WHERE endpoint = %s AND idempotency_key = %s
+"""
+
+STORE_RESPONSE_SQL = """
+    UPDATE idempotency_keys SET status_code = %s, response_body = %s
+    WHERE endpoint = %s AND idempotency_key = %s
+"""
+
+RELEASE_KEY_SQL = """
+    DELETE FROM idempotency_keys
+    WHERE endpoint = %s AND idempotency_key = %s AND status_code IS NULL
+"""
+
+PRUNE_KEYS_SQL = """
+    DELETE FROM idempotency_keys
+    WHERE created_at < CURRENT_TIMESTAMP - make_interval(secs => %s)
+"""
+
+
+def request_fingerprint(payload: Any) -> str:
+    """Hash of the validated request body, to reject a key reused for another request.
+
+    Only fields the client sent count; defaults such as created_at=now() would
+    otherwise make every retry look like a different request.
+    """
+    if isinstance(payload, BaseModel):
+        payload = payload.model_dump(mode="json", exclude_unset=True)
+    encoded = json.dumps(jsonable_encoder(payload), sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(encoded.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def check_key(key: str) -> str:
+    key = key.strip()
+    if not key or len(key) > MAX_KEY_LENGTH or not key.isprintable():
+        raise HTTPException(
+            status_code=400,
+            detail=f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} printable characters",
+        )
+    return key
+
+
+def claim_params(endpoint: str, key: str, fingerprint: str) -> dict:
+    return {
+        "endpoint": endpoint,
+        "key": key,
+        "fingerprint": fingerprint,
+        "in_progress": IDEMPOTENCY_IN_PROGRESS_SECONDS,
+        "ttl": IDEMPOTENCY_TTL_SECONDS,
+    }
+
+
+def to_response(result: Any) -> Response:
+    """Serialize a service result the way FastAPI would."""
+    if isinstance(result, Response):
+        return result
+    return JSONResponse(content=jsonable_encoder(result))
+
+
+def replay_response(stored: Tuple[int, bytes]) -> Response:
+    status_code, body = stored
+    return Response(
+        content=body,
+        status_code=status_code,
+        media_type="application/json",
+        headers={"Idempotent-Replayed": "true"},
+    )
+
+
+def stored_outcome(row, fingerprint: str) -> Tuple[int, bytes]:
+    """The response to replay for a key another request claimed."""
+    if row is None:
+        # Released between our claim attempt and this read; let the client retry
+        raise HTTPException(status_code=409, detail="Idempotency-Key is being processed, retry shortly")
+    if row["fingerprint"] != fingerprint:
+        raise HTTPException(
+            status_code=422, detail="Idempotency-Key was already used with a different request"
+        )
+    if row["status_code"] is None:
+        raise HTTPException(status_code=409, detail="Idempotency-Key is being processed, retry shortly")
+    return row["status_code"], bytes(row["response_body"])
+
+
+def run_idempotent(
+    endpoint: str, key: Optional[str], payload: Any, operation: Callable[[], Any]
+) -> Any:
+    """Run ``operation`` once per (endpoint, key); replay its response afterwards.
+
+    Without a key the operation simply runs. Only successful (2xx) responses
+    are stored; on failure the key is released so the client can retry.
+    """
+    if key is None:
+        return operation()
+    key = check_key(key)
+    cache_key = (endpoint, key)
+    fingerprint = request_fingerprint(payload)
+
+    cached = idempotency_cache.get(cache_key)
+    if cached is not None and cached[0] == fingerprint:
+        return replay_response(cached[1])
+
+    with get_db_connection() as conn:
+        cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
+        cur.execute(CLAIM_KEY_SQL, claim_params(endpoint, key, fingerprint))
+        claimed = cur.fetchone() is not None
+        row = None
+        if not claimed:
+            cur.execute(STORED_RESPONSE_SQL, (endpoint, key))
+            row = cur.fetchone()
+        conn.commit()
+        cur.close()
+
+    if not claimed:
+        stored = stored_outcome(row, fingerprint)
+        idempotency_cache.put(cache_key, idempotency_cache.version(cache_key), (fingerprint, stored))
+        return replay_response(stored)
+
+    try:
+        response = to_response(operation())
+    except BaseException:
+        _release(endpoint, key)
+        raise
+    if not 200 <= response.status_code < 300:
+        _release(endpoint, key)
+        return response
+
+    stored = (response.status_code, bytes(response.body))
+    try:
+        with get_db_connection() as conn:
+            cur = conn.cursor()
+            cur.execute(STORE_RESPONSE_SQL, (*stored, endpoint, key))
+            conn.commit()
+            cur.close()
+    except Exception as e:
+        # The write itself succeeded; the claim stays and expires on its own
+        logging.error("Could not store idempotent response: %s", e)
+    idempotency_cache.put(cache_key, idempotency_cache.version(cache_key), (fingerprint, stored))
+    return response
+
+
+def _release(endpoint: str, key: str) -> None:
+    try:
+        with get_db_connection() as conn:
+            cur = conn.cursor()
+            cur.execute(RELEASE_KEY_SQL, (endpoint, key))
+            conn.commit()
+            cur.close()
+    except Exception as e:
+        logging.error("Could not release idempotency key: %s", e)
+
+
+def prune_idempotency_keys() -> int:
+    """Delete stored keys older than IDEMPOTENCY_TTL_SECONDS; returns rows deleted."""
+    with get_db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute(PRUNE_KEYS_SQL, (IDEMPOTENCY_TTL_SECONDS,))
+        deleted = cur.rowcount
+        conn.commit()
+        cur.close()
+    return deleted
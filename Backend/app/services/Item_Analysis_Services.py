@@ -0,0 +1,275 @@
+"""
+Item Analysis
+Per-question difficulty and discrimination, and per-answer selection rates,
+computed from the stored user_answers of server-graded submissions.
+
+A quiz's responses are loaded with COPY into flat NumPy arrays and every
+statistic is computed with whole-array passes (bincount over dense ids), so
+the cost is a few linear scans regardless of how many questions there are.
+Results are written to question_item_stats and answer_item_stats and served
+by getQuizStatistics?include_items=true.
+
+Run it with: python -m app.maintenance analyze-items [--quiz-id ID]
+"""
+
+import io
+import logging
+from typing import Optional
+from ..database import get_db_connection
+from fastapi import HTTPException
+
+import numpy as np
+import psycopg2.extras
+
+RESPONSES_COPY_SQL = """
+    COPY (
+        SELECT ua.submission_id, ua.question_id, ua.answer_id
+        FROM user_answers ua
+        JOIN submission s ON s.submission_id = ua.submission_id
+        WHERE s.quiz_id = %s
+    ) TO STDOUT
+"""
+
+QUIZ_ANSWERS_SQL = """
+    SELECT a.answer_id, a.question_id, a.is_correct
+    FROM answer a
+    JOIN question q ON q.question_id = a.question_id
+    WHERE q.quiz_id = %s
+    ORDER BY a.answer_id
+"""
+
+QUESTION_ITEM_STATS_SQL = """
+    SELECT question_id, responses, p_value, discrimination, computed_at
+    FROM question_item_stats
+    WHERE quiz_id = %s
+    ORDER BY question_id
+"""
+
+ANSWER_ITEM_STATS_SQL = """
+    SELECT s.answer_id, s.question_id, s.selections, s.selection_rate, a.is_correct
+    FROM answer_item_stats s
+    JOIN answer a ON a.answer_id = s.answer_id
+    WHERE s.quiz_id = %s
+    ORDER BY s.question_id, s.answer_id
+"""
+
+
+def load_responses(cur, quiz_id: int) -> np.ndarray:
+    """All responses to a quiz as an (n, 3) int64 array of
+    (submission_id, question_id, answer_id)."""
+    buffer = io.BytesIO()
+    cur.copy_expert(cur.mogrify(RESPONSES_COPY_SQL, (quiz_id,)).decode(), buffer)
+    # COPY text output is tab/newline separated integers
+    values = np.fromstring(buffer.getvalue().decode("ascii"), dtype=np.int64, sep=" ")
+    return values.reshape(-1, 3)
+
+
+def _correlation(n, sx, sy, sxx, syy, sxy) -> np.ndarray:
+    """Pearson correlation per group from its sums; NaN where either side is constant."""
+    numerator = n * sxy - sx * sy
+    denominator = np.sqrt((n * sxx - sx * sx) * (n * syy - sy * sy))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(denominator > 0, numerator / denominator, np.nan)
+
+
+def compute_item_statistics(
+    responses: np.ndarray,
+    answer_ids: np.ndarray,
+    answer_question_ids: np.ndarray,
+    answer_is_correct: np.ndarray,
+):
+    """Item statistics for one quiz.
+
+    ``answer_ids`` must be sorted; the three answer arrays describe every answer
+    of the quiz. Responses whose answer is not one of them are ignored.
+
+    Returns ``(questions, answers)``:
+
+    - ``questions``: dict of arrays ``question_id``, ``responses``, ``p_value``
+      (share answered correctly) and ``discrimination`` (point-biserial
+      correlation between answering the item correctly and the score on the
+      rest of the quiz).
+    - ``answers``: dict of arrays ``answer_id``, ``question_id``, ``selections``
+      and ``selection_rate`` (share of the question's responses choosing it).
+    """
+    # Dense answer index for every response; drop answers outside the quiz
+    answer_index = np.searchsorted(answer_ids, responses[:, 2])
+    answer_index = np.minimum(answer_index, len(answer_ids) - 1)
+    valid = answer_ids[answer_index] == responses[:, 2]
+    valid &= answer_question_ids[answer_index] == responses[:, 1]
+    answer_index = answer_index[valid]
+    submission_ids = responses[valid, 0]
+
+    question_ids, answer_question_index = np.unique(answer_question_ids, return_inverse=True)
+    question_index = answer_question_index[answer_index]
+    correct = answer_is_correct[answer_index].astype(np.float64)
+
+    # Total score per submission, then the rest score for each response
+    _, submission_index = np.unique(submission_ids, return_inverse=True)
+    totals = np.bincount(submission_index, weights=correct)
+    rest = totals[submission_index] - correct
+
+    n_questions = len(question_ids)
+    n = np.bincount(question_index, minlength=n_questions).astype(np.float64)
+    sx = np.bincount(question_index, weights=correct, minlength=n_questions)
+    sy = np.bincount(question_index, weights=rest, minlength=n_questions)
+    syy = np.bincount(question_index, weights=rest * rest, minlength=n_questions)
+    sxy = np.bincount(question_index, weights=correct * rest, minlength=n_questions)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p_value = np.where(n > 0, sx / n, np.nan)
+    # correct is 0/1, so its sum of squares equals its sum
+    discrimination = _correlation(n, sx, sy, sx, syy, sxy)
+
+    selections = np.bincount(answer_index, minlength=len(answer_ids))
+    question_responses = n[answer_question_index]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        selection_rate = np.where(
+            question_responses > 0, selections / question_responses, np.nan
+        )
+
+    questions = {
+        "question_id": question_ids,
+        "responses": n.astype(np.int64),
+        "p_value": p_value,
+        "discrimination": discrimination,
+    }
+    answers = {
+        "answer_id": answer_ids,
+        "question_id": answer_question_ids,
+        "selections": selections,
+        "selection_rate": selection_rate,
+    }
+    return questions, answers
+
+
+def _nullable(value) -> Optional[float]:
+    return None if np.isnan(value) else round(float(value), 6)
+
+
+def analyze_quiz(quiz_id: int) -> int:
+    """Recompute and store the item statistics of one quiz; returns the response count."""
+    with get_db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute(QUIZ_ANSWERS_SQL, (quiz_id,))
+        answer_rows = cur.fetchall()
+        responses = load_responses(cur, quiz_id)
+
+        cur.execute("DELETE FROM question_item_stats WHERE quiz_id = %s", (quiz_id,))
+        cur.execute("DELETE FROM answer_item_stats WHERE quiz_id = %s", (quiz_id,))
+        if answer_rows:
+            answer_ids, answer_question_ids, answer_is_correct = (
+                np.array(column) for column in zip(*answer_rows)
+            )
+            questions, answers = compute_item_statistics(
+                responses,
+                answer_ids.astype(np.int64),
+                answer_question_ids.astype(np.int64),
+                answer_is_correct.astype(bool),
+            )
+            psycopg2.extras.execute_values(
+                cur,
+                """
+                INSERT INTO question_item_stats
+                    (question_id, quiz_id, responses, p_value, discrimination)
+                VALUES %s
+                """,
+                [
+                    (int(question_id), quiz_id, int(count), _nullable(p), _nullable(d))
+                    for question_id, count, p, d in zip(
+                        questions["question_id"],
+                        questions["responses"],
+                        questions["p_value"],
+                        questions["discrimination"],
+                    )
+                ],
+                page_size=1000,
+            )
+            psycopg2.extras.execute_values(
+                cur,
+                """
+                INSERT INTO answer_item_stats
+                    (answer_id, question_id, quiz_id, selections, selection_rate)
+                VALUES %s
+                """,
+                [
+                    (int(answer_id), int(question_id), quiz_id, int(count), _nullable(rate))
+                    for answer_id, question_id, count, rate in zip(
+                        answers["answer_id"],
+                        answers["question_id"],
+                        answers["selections"],
+                        answers["selection_rate"],
+                    )
+                ],
+                page_size=1000,
+            )
+
+        conn.commit()
+        cur.close()
+
+    logging.info("Analyzed %s responses for quiz %s", len(responses), quiz_id)
+    return len(responses)
+
+
+def analyze_all_quizzes() -> int:
+    """Run ``analyze_quiz`` for every quiz with stored answers; returns the quiz count."""
+    with get_db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            SELECT DISTINCT s.quiz_id
+            FROM submission s
+            WHERE EXISTS (SELECT 1 FROM user_answers ua WHERE ua.submission_id = s.submission_id)
+            ORDER BY s.quiz_id
+            """
+        )
+        quiz_ids = [row[0] for row in cur.fetchall()]
+        cur.close()
+
+    for quiz_id in quiz_ids:
+        analyze_quiz(quiz_id)
+    return len(quiz_ids)
+
+
+def build_item_statistics(question_rows, answer_rows) -> list:
+    """Nest the stored answer statistics under their question."""
+    answers_by_question = {}
+    for row in answer_rows:
+        answers_by_question.setdefault(row["question_id"], []).append(
+            {
+                "answer_id": row["answer_id"],
+                "is_correct": row["is_correct"],
+                "selections": row["selections"],
+                "selection_rate": row["selection_rate"],
+            }
+        )
+    return [
+        {
+            "question_id": row["question_id"],
+            "responses": row["responses"],
+            "p_value": row["p_value"],
+            "discrimination": row["discrimination"],
+            "computed_at": row["computed_at"],
+            "answers": answers_by_question.get(row["question_id"], []),
+        }
+        for row in question_rows
+    ]
+
+
+def get_item_statistics(quiz_id: int) -> list:
+    try:
+        with get_db_connection() as conn:
+            cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
+            cur.execute(QUESTION_ITEM_STATS_SQL, (quiz_id,))
+            question_rows = cur.fetchall()
+            cur.execute(ANSWER_ITEM_STATS_SQL, (quiz_id,))
+            answer_rows = cur.fetchall()
+            cur.close()
+
+        return build_item_statistics(question_rows, answer_rows)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(e)
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,98 @@
+import logging
+from datetime import datetime
+from typing import Optional
+from ..models.Submission_Model import LeaderboardEntry, LeaderboardPage
+from ..database import get_db_connection
+from ..leaderboard import QuizLeaderboard, leaderboards
+from ..utils.pagination import encode_cursor, decode_cursor
+from fastapi import HTTPException
+
+import psycopg2.extras
+
+# Rank order, served by idx_quiz_leaderboard_rank
+LEADERBOARD_LOAD_SQL = """
+    SELECT user_id, best_score, submitted_at, submission_id
+    FROM quiz_leaderboard
+    WHERE quiz_id = %s
+    ORDER BY best_score DESC, submitted_at, user_id
+"""
+
+
+def parse_leaderboard_cursor(cursor: Optional[str]) -> Optional[tuple]:
+    """Sort key of the last player on the previous page, or None for the first page."""
+    if not cursor:
+        return None
+    after = decode_cursor(cursor, "best_score", "submitted_at", "user_id")
+    try:
+        return QuizLeaderboard.sort_key(
+            int(after["best_score"]),
+            datetime.fromisoformat(after["submitted_at"]),
+            int(after["user_id"]),
+        )
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+
+def build_leaderboard_page(
+    quiz_id: int, board: QuizLeaderboard, limit: int, cursor: Optional[str] = None
+) -> LeaderboardPage:
+    # One extra entry tells whether another page exists
+    entries = board.page(limit + 1, parse_leaderboard_cursor(cursor))
+    items = [LeaderboardEntry(**entry) for entry in entries[:limit]]
+    next_cursor = None
+    if len(entries) > limit and items:
+        last = items[-1]
+        next_cursor = encode_cursor(
+            {
+                "best_score": last.best_score,
+                "submitted_at": last.submitted_at.isoformat(),
+                "user_id": last.user_id,
+            }
+        )
+    return LeaderboardPage(
+        quiz_id=quiz_id, total_players=len(board), items=items, next_cursor=next_cursor
+    )
+
+
+def get_leaderboard(quiz_id: int) -> QuizLeaderboard:
+    """The quiz's in-process leaderboard, loaded from quiz_leaderboard on a miss."""
+    board = leaderboards.get(quiz_id)
+    if board is not None:
+        return board
+
+    leaderboards.begin_load(quiz_id)
+    try:
+        with get_db_connection() as conn:
+            cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
+            cur.execute(LEADERBOARD_LOAD_SQL, (quiz_id,))
+            board = QuizLeaderboard(cur)
+            cur.close()
+    except Exception:
+        leaderboards.cancel_load(quiz_id)
+        raise
+    return leaderboards.install(quiz_id, board)
+
+
+def get_leaderboard_page(quiz_id: int, limit: int, cursor: Optional[str] = None):
+    try:
+        return build_leaderboard_page(quiz_id, get_leaderboard(quiz_id), limit, cursor)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def get_user_rank(quiz_id: int, user_id: int):
+    try:
+        entry = get_leaderboard(quiz_id).rank(user_id)
+        if entry is None:
+            raise HTTPException(status_code=404, detail="No Submission found for user in Quiz")
+        return LeaderboardEntry(**entry)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(e)
+        raise HTTPException(status_code=500, detail=str(e))
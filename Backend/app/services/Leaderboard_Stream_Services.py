@@ -0,0 +1,231 @@
+"""
+Live Leaderboard Stream
+Server-Sent Events feed of a quiz's top LEADERBOARD_STREAM_TOP_K players.
+
+All viewers of a quiz share one channel. The channel's task is woken by the
+leaderboard registry when a committed attempt changes the in-process board,
+re-reads the top K from memory, and pushes the difference to every viewer as
+one pre-encoded event. Viewers never query the database: the board is loaded
+once per LEADERBOARD_TTL_SECONDS, however many viewers there are.
+
+Attempts committed by other workers are picked up when the board reloads,
+which the channel checks every LEADERBOARD_STREAM_REFRESH_SECONDS.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+from typing import AsyncIterator, Dict, List, Optional, Set
+from ..leaderboard import leaderboards
+from ..config import (
+    USE_ASYNC_DB,
+    LEADERBOARD_STREAM_TOP_K,
+    LEADERBOARD_STREAM_MIN_INTERVAL_MS,
+    LEADERBOARD_STREAM_REFRESH_SECONDS,
+    LEADERBOARD_STREAM_KEEPALIVE_SECONDS,
+    LEADERBOARD_STREAM_QUEUE_MAX,
+)
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+
+KEEPALIVE = ": keep-alive\n\n"
+
+# Ends a viewer's stream: the server is shutting down or the viewer fell behind
+_CLOSE = None
+
+
+async def _load_board(quiz_id: int):
+    if USE_ASYNC_DB:
+        from .Async_Leaderboard_Services import get_leaderboard as get_leaderboard_async
+
+        return await get_leaderboard_async(quiz_id)
+    from .Leaderboard_Services import get_leaderboard
+
+    return await run_in_threadpool(get_leaderboard, quiz_id)
+
+
+def format_event(event: str, data: dict) -> str:
+    payload = json.dumps(jsonable_encoder(data), separators=(",", ":"))
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+def diff_top(previous: List[dict], current: List[dict]) -> Optional[dict]:
+    """Entries that are new or moved, and players who left the top K; None if unchanged."""
+    before = {entry["user_id"]: entry for entry in previous}
+    changed = [entry for entry in current if before.get(entry["user_id"]) != entry]
+    kept = {entry["user_id"] for entry in current}
+    removed = [user_id for user_id in before if user_id not in kept]
+    if not changed and not removed:
+        return None
+    return {"changed": changed, "removed": removed}
+
+
+class _Channel:
+    __slots__ = ("quiz_id", "loop", "viewers", "wake", "top", "snapshot", "task")
+
+    def __init__(self, quiz_id: int, loop: asyncio.AbstractEventLoop):
+        self.quiz_id = quiz_id
+        self.loop = loop
+        self.viewers: Set[asyncio.Queue] = set()
+        self.wake = asyncio.Event()
+        self.top: Optional[List[dict]] = None
+        # The current top K as an encoded snapshot event, sent to new viewers
+        self.snapshot: Optional[str] = None
+        self.task: Optional[asyncio.Task] = None
+
+
+class LeaderboardBroadcaster:
+    """One channel per watched quiz; channels exist only while someone watches."""
+
+    def __init__(
+        self,
+        top_k: int,
+        min_interval_ms: float,
+        refresh_seconds: float,
+        queue_max: int,
+    ):
+        self.top_k = top_k
+        self.min_interval = min_interval_ms / 1000
+        self.refresh_seconds = refresh_seconds
+        self.queue_max = queue_max
+        # notify() runs on request threads; channels are created on the event loop
+        self._lock = threading.Lock()
+        self._channels: Dict[int, _Channel] = {}
+        self._events = 0
+        self._dropped = 0
+        leaderboards.add_listener(self.notify)
+
+    def notify(self, quiz_id: int) -> None:
+        """Wake the quiz's channel, if anyone watches it. Safe from any thread."""
+        with self._lock:
+            channel = self._channels.get(quiz_id)
+        if channel is not None:
+            channel.loop.call_soon_threadsafe(channel.wake.set)
+
+    def subscribe(self, quiz_id: int) -> asyncio.Queue:
+        """Register a viewer; its queue receives encoded events. Call on the event loop."""
+        viewer: asyncio.Queue = asyncio.Queue(maxsize=self.queue_max)
+        with self._lock:
+            channel = self._channels.get(quiz_id)
+            if channel is None:
+                channel = _Channel(quiz_id, asyncio.get_running_loop())
+                self._channels[quiz_id] = channel
+            channel.viewers.add(viewer)
+        if channel.task is None:
+            channel.task = asyncio.create_task(self._run(channel))
+        elif channel.snapshot is not None:
+            viewer.put_nowait(channel.snapshot)
+        return viewer
+
+    def unsubscribe(self, quiz_id: int, viewer: asyncio.Queue) -> None:
+        """Remove a viewer; the last one to leave stops the channel."""
+        with self._lock:
+            channel = self._channels.get(quiz_id)
+            if channel is None:
+                return
+            channel.viewers.discard(viewer)
+            if channel.viewers:
+                return
+            del self._channels[quiz_id]
+        if channel.task is not None:
+            channel.task.cancel()
+
+    def close(self) -> None:
+        """End every stream, e.g. on shutdown."""
+        with self._lock:
+            channels, self._channels = list(self._channels.values()), {}
+        for channel in channels:
+            if channel.task is not None:
+                channel.task.cancel()
+            for viewer in channel.viewers:
+                self._close_viewer(viewer)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "channels": len(self._channels),
+                "viewers": sum(len(channel.viewers) for channel in self._channels.values()),
+                "events": self._events,
+                "dropped_viewers": self._dropped,
+            }
+
+    async def _run(self, channel: _Channel) -> None:
+        while True:
+            try:
+                await self._publish(channel)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Keep the stream open; the next wake-up or refresh retries
+                logging.error("Leaderboard stream for quiz %s failed: %s", channel.quiz_id, e)
+            # Bursts of submissions collapse into one push per interval
+            await asyncio.sleep(self.min_interval)
+            try:
+                await asyncio.wait_for(channel.wake.wait(), self.refresh_seconds)
+            except asyncio.TimeoutError:
+                pass
+            channel.wake.clear()
+
+    async def _publish(self, channel: _Channel) -> None:
+        board = await _load_board(channel.quiz_id)
+        top = board.page(self.top_k)
+        if channel.top is None:
+            event = format_event(
+                "snapshot", {"quiz_id": channel.quiz_id, "total_players": len(board), "items": top}
+            )
+        else:
+            diff = diff_top(channel.top, top)
+            if diff is None:
+                return
+            event = format_event(
+                "update", {"quiz_id": channel.quiz_id, "total_players": len(board), **diff}
+            )
+        channel.top = top
+        channel.snapshot = format_event(
+            "snapshot", {"quiz_id": channel.quiz_id, "total_players": len(board), "items": top}
+        )
+        self._events += 1
+        for viewer in list(channel.viewers):
+            try:
+                viewer.put_nowait(event)
+            except asyncio.QueueFull:
+                # A viewer that stopped reading is cut off rather than buffered
+                # without bound; its EventSource reconnects and gets a snapshot
+                self._dropped += 1
+                channel.viewers.discard(viewer)
+                self._close_viewer(viewer)
+
+    @staticmethod
+    def _close_viewer(viewer: asyncio.Queue) -> None:
+        while True:
+            try:
+                viewer.put_nowait(_CLOSE)
+                return
+            except asyncio.QueueFull:
+                viewer.get_nowait()
+
+
+leaderboard_broadcaster = LeaderboardBroadcaster(
+    LEADERBOARD_STREAM_TOP_K,
+    LEADERBOARD_STREAM_MIN_INTERVAL_MS,
+    LEADERBOARD_STREAM_REFRESH_SECONDS,
+    LEADERBOARD_STREAM_QUEUE_MAX,
+)
+
+
+async def stream_leaderboard(quiz_id: int) -> AsyncIterator[str]:
+    """SSE body for one viewer: a snapshot, then updates, with keep-alive comments."""
+    viewer = leaderboard_broadcaster.subscribe(quiz_id)
+    try:
+        while True:
+            try:
+                event = await asyncio.wait_for(viewer.get(), LEADERBOARD_STREAM_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield KEEPALIVE
+                continue
+            if event is _CLOSE:
+                return
+            yield event
+    finally:
+        leaderboard_broadcaster.unsubscribe(quiz_id, viewer)
@@ -17,9 +17,22 @@ from langchain_core.output_parsers import StrOutputParser
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 USE_AI_PROVIDER = os.getenv("AI_PROVIDER")  # Options: "groq", "simple" - Default: "groq"
 
-# Initialize Groq client if key is present
+# Groq client, created by the app lifespan (or on first use) rather than at import
 _groq_llm = None
-if GROQ_API_KEY:
+_groq_init_attempted = False
+
+
+def init_groq_llm():
+    """Create the Groq client if an API key is configured. Safe to call repeatedly."""
+    global _groq_llm, _groq_init_attempted
+    if _groq_init_attempted:
+        return _groq_llm
+    _groq_init_attempted = True
+
+    if not GROQ_API_KEY:
+        logging.warning("Groq API key not provided")
+        return None
+
     try:
         _groq_llm = ChatGroq(
             api_key=GROQ_API_KEY,
@@ -31,8 +44,21 @@ if GROQ_API_KEY:
     except Exception as e:
         logging.error(f"Failed to initialize Groq LLM: {e}")
         _groq_llm = None
-else:
-    logging.warning("Groq API key not provided")
+    return _groq_llm
+
+
+def get_groq_llm():
+    """Return the Groq client, initializing it on first use."""
+    if not _groq_init_attempted:
+        init_groq_llm()
+    return _groq_llm
+
+
+def close_groq_llm() -> None:
+    """Drop the Groq client so its HTTP connections are released on shutdown."""
+    global _groq_llm, _groq_init_attempted
+    _groq_llm = None
+    _groq_init_attempted = False
 
 
 def extract_text_from_pdf(pdf_file: UploadFile) -> str:
@@ -56,6 +82,8 @@ def extract_text_from_pdf(pdf_file: UploadFile) -> str:
             )
 
         return text
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(f"Error extracting PDF text: {str(e)}")
         raise HTTPException(
@@ -65,7 +93,8 @@ def extract_text_from_pdf(pdf_file: UploadFile) -> str:
 
 def generate_mcqs_with_groq(text: str, num_questions: int = 5) -> List[Dict]:
     """Generate MCQs using Groq AI (Llama 3.3 70B)."""
-    if not _groq_llm:
+    groq_llm = get_groq_llm()
+    if not groq_llm:
         logging.warning("Groq LLM not initialized, falling back to simple generator")
         return generate_mcqs_simple(text, num_questions)
 
@@ -134,7 +163,7 @@ Correct Answer: [correct option]
         )
 
         # Create chain
-        mcq_chain = mcq_prompt | _groq_llm | StrOutputParser()
+        mcq_chain = mcq_prompt | groq_llm | StrOutputParser()
 
         # Generate MCQs
         response = mcq_chain.invoke({
@@ -279,10 +308,11 @@ def generate_mcqs_simple(text: str, num_questions: int = 5) -> List[Dict]:
 def generate_mcqs_from_text(text: str, num_questions: int = 5) -> List[Dict]:
     """Generate MCQ questions from text - tries Groq first, then simple fallback"""
     try:
-        logging.info(f"AI provider: {USE_AI_PROVIDER}, Groq available: {_groq_llm is not None}")
+        groq_llm = get_groq_llm()
+        logging.info(f"AI provider: {USE_AI_PROVIDER}, Groq available: {groq_llm is not None}")
 
         # Choose provider based on configuration
-        if USE_AI_PROVIDER == "groq" and _groq_llm:
+        if USE_AI_PROVIDER == "groq" and groq_llm:
             try:
                 return generate_mcqs_with_groq(text, num_questions)
             except:
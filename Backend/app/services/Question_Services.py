@@ -1,11 +1,37 @@
 import logging
 from ..models.Question_Model import QuestionBase, UpdateQuestionBase
 from ..database import get_db_connection
+from ..cache import quiz_content_cache, invalidate_quiz_content
+from ..utils.http_cache import CachedPayload
+from .Quiz_Stats_Services import record_questions_added, record_questions_removed
 from fastapi import HTTPException
 from fastapi.responses import JSONResponse
 
 import psycopg2.extras
 
+# Public quiz content leaves out which answers are correct; grading and the
+# creator's answer key read QUIZ_ANSWER_KEY_SQL instead
+QUIZ_QUESTIONS_SQL = "SELECT q.question_id,q.question_text,a.answer_id,a.answer_text FROM question q JOIN answer a ON q.question_id = a.question_id WHERE q.quiz_id = %s ORDER BY q.question_id, a.answer_id;"
+QUIZ_ANSWER_KEY_SQL = "SELECT q.question_id,q.question_text,a.answer_id,a.answer_text,a.is_correct FROM question q JOIN answer a ON q.question_id = a.question_id WHERE q.quiz_id = %s ORDER BY q.question_id, a.answer_id;"
+
+
+def group_answers(rows, with_key: bool = False) -> list:
+    """Nest question/answer rows into one dict per question, in row order."""
+    result = {}
+    for row in rows:
+        q_id = row["question_id"]
+        if q_id not in result:
+            result[q_id] = {
+                "question_id": q_id,
+                "question_text": row["question_text"],
+                "answers": [],
+            }
+        answer = {"answer_id": row["answer_id"], "answer_text": row["answer_text"]}
+        if with_key:
+            answer["is_correct"] = row["is_correct"]
+        result[q_id]["answers"].append(answer)
+    return list(result.values())
+
 
 def create_question(question: QuestionBase):
     try:
@@ -19,11 +45,15 @@ def create_question(question: QuestionBase):
                 ),
             )
             new_question = cur.fetchone()
+            record_questions_added(cur, question.quiz_id)
             conn.commit()
             cur.close()
 
+        invalidate_quiz_content(question.quiz_id)
         return JSONResponse(status_code=200, content={"Question": dict(new_question)})
 
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(e)
         raise HTTPException(status_code=500, detail=str(e))
@@ -47,42 +77,57 @@ def get_question_by_quiz(quiz_id: int, question_id: int):
             raise HTTPException(status_code=404, detail="No Question found for Quiz")
         return QuestionBase(**row)
 
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 def get_quiz_questions(quiz_id: int):
+    return get_quiz_questions_payload(quiz_id).data
+
+
+def get_quiz_questions_payload(quiz_id: int) -> CachedPayload:
+    """Serialized getQuizQuestions payload, served from the quiz content cache."""
+    cached = quiz_content_cache.get(quiz_id)
+    if cached is not None:
+        return cached
+
+    # Read the version before querying so a concurrent write is not cached over
+    version = quiz_content_cache.version(quiz_id)
     try:
         with get_db_connection() as conn:
             cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
-            cur.execute(
-                "SELECT q.question_id,q.question_text,a.answer_id,a.answer_text,a.is_correct FROM question q JOIN answer a ON q.question_id = a.question_id WHERE q.quiz_id = %s ORDER BY q.question_id, a.answer_id;",
-                (quiz_id,),
-            )
+            cur.execute(QUIZ_QUESTIONS_SQL, (quiz_id,))
             rows = cur.fetchall()
             cur.close()
 
-        result = {}
-        for row in rows:
-            q_id = row["question_id"]
-            if q_id not in result:
-                result[q_id] = {
-                    "question_id": q_id,
-                    "question_text": row["question_text"],
-                    "answers": [],
-                }
-            result[q_id]["answers"].append(
-                {
-                    "answer_id": row["answer_id"],
-                    "answer_text": row["answer_text"],
-                    "is_correct": row["is_correct"],
-                }
-            )
+        payload = CachedPayload(group_answers(rows))
+        quiz_content_cache.put(quiz_id, version, payload)
+        return payload
 
-        return list(result.values())
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
+
+def get_quiz_answer_key(quiz_id: int) -> list:
+    """Questions of a quiz with is_correct on every answer. Not cached; grading
+    keeps its own reduced copy in answer_key_cache."""
+    try:
+        with get_db_connection() as conn:
+            cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
+            cur.execute(QUIZ_ANSWER_KEY_SQL, (quiz_id,))
+            rows = cur.fetchall()
+            cur.close()
+        return group_answers(rows, with_key=True)
+
+    except HTTPException:
+        raise
     except Exception as e:
+        logging.error(e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -99,6 +144,8 @@ def get_question_by_id(question_id: int):
 
         return QuestionBase(**row)
 
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(e)
         raise HTTPException(status_code=500, detail=str(e))
@@ -126,8 +173,11 @@ def edit_question(question: UpdateQuestionBase):
             conn.commit()
             cur.close()
 
+        invalidate_quiz_content(question.quiz_id)
         return JSONResponse(status_code=200, content={"Question": "Updated"})
 
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(e)
         raise HTTPException(status_code=500, detail=str(e))
@@ -147,11 +197,15 @@ def delete_question(quiz_id: int, question_id: int):
 
             if cur.rowcount == 0:
                 raise HTTPException(status_code=404, detail="Question not found")
+            record_questions_removed(cur, quiz_id)
 
             conn.commit()
             cur.close()
 
+        invalidate_quiz_content(quiz_id)
         return JSONResponse(status_code=200, content={"Question": "Deleted"})
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,265 @@
+import csv
+import io
+import json
+import logging
+from datetime import datetime
+from typing import Iterable, Iterator, List
+from ..models.Quiz_Model import ImportAnswer, ImportQuestion, QuizImport
+from ..database import get_db_connection
+from ..cache import ALL_QUIZZES_KEY, quiz_cache
+from ..config import IMPORT_MAX_QUESTIONS, IMPORT_MAX_FILE_MB
+from ..utils.validation import (
+    sanitize_quiz_title,
+    sanitize_creator_name,
+    validate_question_text,
+    validate_answer_text,
+    validate_file_size,
+)
+from .Quiz_Stats_Services import record_questions_added
+from fastapi import HTTPException, UploadFile
+from fastapi.responses import JSONResponse
+
+import psycopg2.extras
+
+# Max error messages returned for a rejected import
+MAX_REPORTED_ERRORS = 50
+
+TRUE_VALUES = {"true", "1", "yes", "y", "x"}
+FALSE_VALUES = {"false", "0", "no", "n", ""}
+
+
+def validate_quiz_import(quiz: QuizImport) -> QuizImport:
+    """Validate and sanitize a whole quiz in one pass.
+
+    Every problem is collected and reported together in a single 400 rather
+    than failing on the first one.
+    """
+    errors = []
+
+    def check(label, validator, value):
+        try:
+            return validator(value)
+        except HTTPException as e:
+            errors.append(f"{label}: {e.detail}")
+            return value
+
+    quiz.quiz_title = check("quiz_title", sanitize_quiz_title, quiz.quiz_title)
+    quiz.created_by = check("created_by", sanitize_creator_name, quiz.created_by)
+
+    if not quiz.questions:
+        errors.append("questions: At least one question is required")
+    if len(quiz.questions) > IMPORT_MAX_QUESTIONS:
+        errors.append(f"questions: Cannot import more than {IMPORT_MAX_QUESTIONS} questions")
+
+    for q_index, question in enumerate(quiz.questions[:IMPORT_MAX_QUESTIONS], start=1):
+        label = f"question {q_index}"
+        question.question_text = check(label, validate_question_text, question.question_text)
+        if len(question.answers) < 2:
+            errors.append(f"{label}: At least two answers are required")
+        if not any(answer.is_correct for answer in question.answers):
+            errors.append(f"{label}: At least one answer must be correct")
+        for a_index, answer in enumerate(question.answers, start=1):
+            answer.answer_text = check(
+                f"{label} answer {a_index}", validate_answer_text, answer.answer_text
+            )
+
+    if errors:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "message": f"Quiz import failed validation ({len(errors)} errors)",
+                "errors": errors[:MAX_REPORTED_ERRORS],
+            },
+        )
+    return quiz
+
+
+def persist_quiz_bundle(
+    cur,
+    quiz_title: str,
+    created_by: str,
+    created_at: datetime,
+    questions: List[ImportQuestion],
+):
+    """Insert a quiz with all its questions and answers on ``cur``.
+
+    Uses a fixed number of round trips however many questions there are:
+    the quiz row (which also reserves the question ids from their sequence),
+    one multi-row INSERT for the questions, one for the answers and one for
+    the quiz_stats counter. The caller owns the transaction.
+
+    Returns ``(quiz_id, question_ids)`` with ids in the order of ``questions``.
+    """
+    cur.execute(
+        """
+        INSERT INTO quiz(quiz_title,created_by,created_at) VALUES(%s,%s,%s)
+        RETURNING quiz_id,
+            ARRAY(
+                SELECT nextval(pg_get_serial_sequence('question', 'question_id'))
+                FROM generate_series(1, %s)
+            ) AS question_ids
+        """,
+        (quiz_title, created_by, created_at, len(questions)),
+    )
+    row = cur.fetchone()
+    quiz_id, question_ids = row[0], list(row[1])
+
+    # Explicit ids let the answers reference their question without relying on
+    # the order of a multi-row RETURNING
+    psycopg2.extras.execute_values(
+        cur,
+        "INSERT INTO question(question_id,quiz_id,question_text) VALUES %s",
+        [
+            (question_id, quiz_id, question.question_text)
+            for question_id, question in zip(question_ids, questions)
+        ],
+        page_size=max(len(questions), 1),
+    )
+
+    answer_rows = [
+        (question_id, answer.answer_text, answer.is_correct)
+        for question_id, question in zip(question_ids, questions)
+        for answer in question.answers
+    ]
+    if answer_rows:
+        psycopg2.extras.execute_values(
+            cur,
+            "INSERT INTO answer(question_id,answer_text,is_correct) VALUES %s",
+            answer_rows,
+            page_size=len(answer_rows),
+        )
+
+    record_questions_added(cur, quiz_id, len(questions))
+    return quiz_id, question_ids
+
+
+def create_quiz_with_questions(
+    quiz_title: str,
+    created_by: str,
+    created_at: datetime,
+    questions: List[ImportQuestion],
+):
+    """Persist a quiz and its questions atomically; nothing is written on failure.
+
+    Returns ``(quiz_id, question_ids)``.
+    """
+    with get_db_connection() as conn:
+        cur = conn.cursor()
+        quiz_id, question_ids = persist_quiz_bundle(
+            cur, quiz_title, created_by, created_at, questions
+        )
+        conn.commit()
+        cur.close()
+
+    quiz_cache.invalidate(ALL_QUIZZES_KEY)
+    return quiz_id, question_ids
+
+
+def import_quiz(quiz: QuizImport):
+    try:
+        quiz_id, question_ids = create_quiz_with_questions(
+            quiz.quiz_title,
+            quiz.created_by,
+            quiz.created_at,
+            quiz.questions,
+        )
+        return JSONResponse(
+            status_code=201,
+            content={
+                "quiz_id": quiz_id,
+                "questions_imported": len(question_ids),
+                "answers_imported": sum(len(q.answers) for q in quiz.questions),
+            },
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _parse_bool(value: str, label: str) -> bool:
+    normalized = (value or "").strip().lower()
+    if normalized in TRUE_VALUES:
+        return True
+    if normalized in FALSE_VALUES:
+        return False
+    raise HTTPException(status_code=400, detail=f"{label}: Invalid is_correct value '{value}'")
+
+
+def _questions_from_csv(lines: Iterable[str]) -> Iterator[ImportQuestion]:
+    """One row per answer: question_text,answer_text,is_correct.
+
+    Consecutive rows with the same question_text form one question.
+    """
+    reader = csv.DictReader(lines)
+    required = {"question_text", "answer_text", "is_correct"}
+    if not reader.fieldnames or not required.issubset(reader.fieldnames):
+        raise HTTPException(
+            status_code=400,
+            detail="CSV header must contain question_text, answer_text and is_correct",
+        )
+
+    current = None
+    for line_no, row in enumerate(reader, start=2):
+        question_text = (row.get("question_text") or "").strip()
+        answer = ImportAnswer(
+            answer_text=row.get("answer_text") or "",
+            is_correct=_parse_bool(row.get("is_correct"), f"line {line_no}"),
+        )
+        if current is None or question_text != current.question_text:
+            if current is not None:
+                yield current
+            current = ImportQuestion(question_text=question_text, answers=[])
+        current.answers.append(answer)
+    if current is not None:
+        yield current
+
+
+def _questions_from_ndjson(lines: Iterable[str]) -> Iterator[ImportQuestion]:
+    """One question object per line: {"question_text": ..., "answers": [...]}."""
+    for line_no, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield ImportQuestion(**json.loads(line))
+        except (ValueError, TypeError) as e:
+            raise HTTPException(status_code=400, detail=f"line {line_no}: {e}")
+
+
+def parse_import_file(file: UploadFile) -> List[ImportQuestion]:
+    """Stream questions out of an uploaded CSV or NDJSON file.
+
+    The upload is read line by line from its spooled temp file and parsing
+    stops as soon as the question limit is exceeded.
+    """
+    if file.size is not None:
+        validate_file_size(file.size, max_size_mb=IMPORT_MAX_FILE_MB)
+
+    filename = (file.filename or "").lower()
+    if filename.endswith(".csv"):
+        parser = _questions_from_csv
+    elif filename.endswith((".ndjson", ".jsonl")):
+        parser = _questions_from_ndjson
+    else:
+        raise HTTPException(
+            status_code=400, detail="Only .csv and .ndjson/.jsonl files are supported"
+        )
+
+    lines = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    questions = []
+    try:
+        for question in parser(lines):
+            questions.append(question)
+            if len(questions) > IMPORT_MAX_QUESTIONS:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Cannot import more than {IMPORT_MAX_QUESTIONS} questions",
+                )
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="File must be UTF-8 encoded")
+    finally:
+        # Leave the underlying upload open for Starlette to clean up
+        lines.detach()
+    return questions
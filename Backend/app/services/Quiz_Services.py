@@ -1,6 +1,12 @@
 import logging
-from ..models.Quiz_Model import QuizBase
+from datetime import datetime
+from typing import Optional
+from ..models.Quiz_Model import QuizBase, QuizCatalogItem, QuizCatalogPage
 from ..database import get_db_connection
+from ..cache import ALL_QUIZZES_KEY, quiz_cache, invalidate_quiz_content
+from ..leaderboard import leaderboards
+from ..utils.http_cache import CachedPayload
+from ..utils.pagination import encode_cursor, decode_cursor
 from fastapi import HTTPException
 from fastapi.responses import JSONResponse
 
@@ -24,8 +30,11 @@ def create_quiz(quiz: QuizBase):
             conn.commit()
             cur.close()
 
+        quiz_cache.invalidate(ALL_QUIZZES_KEY)
         return QuizBase(**new_quiz)
 
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(e)
         raise HTTPException(status_code=500, detail=str(e))
@@ -43,6 +52,8 @@ def get_quizzes():
             raise HTTPException(status_code=404, detail="No quizzes found")
         return [QuizBase(**row) for row in rows]
 
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(e)
         raise HTTPException(status_code=500, detail=str(e))
@@ -61,6 +72,130 @@ def get_quiz(quiz_id: int):
 
         return QuizBase(**row)
 
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def require_quiz_owner(quiz_id: int, user) -> None:
+    """Raise unless ``user`` (a principal from get_current_user) created the quiz.
+
+    401 without a user, 404 for an unknown quiz, 403 for anyone else.
+    """
+    if user is None:
+        raise HTTPException(
+            status_code=401,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    if get_quiz(quiz_id).created_by != user["user_email"]:
+        raise HTTPException(status_code=403, detail="Only the creator of this quiz can do this")
+
+
+def get_quizzes_payload() -> CachedPayload:
+    """Serialized getQuizzes response, cached until a quiz is created, edited or deleted."""
+    cached = quiz_cache.get(ALL_QUIZZES_KEY)
+    if cached is not None:
+        return cached
+
+    version = quiz_cache.version(ALL_QUIZZES_KEY)
+    payload = CachedPayload(get_quizzes())
+    quiz_cache.put(ALL_QUIZZES_KEY, version, payload)
+    return payload
+
+
+def get_quiz_payload(quiz_id: int) -> CachedPayload:
+    """Serialized getQuiz response, cached until the quiz is edited or deleted."""
+    cached = quiz_cache.get(quiz_id)
+    if cached is not None:
+        return cached
+
+    version = quiz_cache.version(quiz_id)
+    payload = CachedPayload(get_quiz(quiz_id))
+    quiz_cache.put(quiz_id, version, payload)
+    return payload
+
+
+def build_catalog_query(
+    limit: int,
+    cursor: Optional[str] = None,
+    created_by: Optional[str] = None,
+    title_prefix: Optional[str] = None,
+):
+    """SQL and parameters for one catalog page, ordered by (created_at, quiz_id).
+
+    Each page is an index range scan that starts after the cursor, so its cost
+    does not depend on how many quizzes come before it.
+    """
+    conditions = []
+    params = []
+    if created_by:
+        conditions.append("q.created_by = %s")
+        params.append(created_by)
+    if title_prefix:
+        # Titles are stored HTML-escaped; escape LIKE wildcards in the prefix
+        escaped = (
+            title_prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        )
+        conditions.append("q.quiz_title LIKE %s")
+        params.append(escaped + "%")
+    if cursor:
+        after = decode_cursor(cursor, "created_at", "quiz_id")
+        try:
+            after_created_at = datetime.fromisoformat(after["created_at"])
+            after_quiz_id = int(after["quiz_id"])
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+        conditions.append("(q.created_at, q.quiz_id) > (%s, %s)")
+        params.extend([after_created_at, after_quiz_id])
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    sql = f"""
+        SELECT q.quiz_id, q.quiz_title, q.created_by, q.created_at,
+               COALESCE(s.question_count, 0) AS question_count,
+               COALESCE(s.attempt_count, 0) AS attempt_count
+        FROM quiz q
+        LEFT JOIN quiz_stats s ON s.quiz_id = q.quiz_id
+        {where}
+        ORDER BY q.created_at, q.quiz_id
+        LIMIT %s
+    """
+    # Fetch one extra row to learn whether another page exists
+    params.append(limit + 1)
+    return sql, params
+
+
+def build_catalog_page(rows, limit: int) -> QuizCatalogPage:
+    items = [QuizCatalogItem(**row) for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit and items:
+        last = items[-1]
+        next_cursor = encode_cursor(
+            {"created_at": last.created_at.isoformat(), "quiz_id": last.quiz_id}
+        )
+    return QuizCatalogPage(items=items, next_cursor=next_cursor)
+
+
+def get_quiz_catalog(
+    limit: int,
+    cursor: Optional[str] = None,
+    created_by: Optional[str] = None,
+    title_prefix: Optional[str] = None,
+):
+    try:
+        sql, params = build_catalog_query(limit, cursor, created_by, title_prefix)
+        with get_db_connection() as conn:
+            cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
+            cur.execute(sql, params)
+            rows = cur.fetchall()
+            cur.close()
+
+        return build_catalog_page(rows, limit)
+
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(e)
         raise HTTPException(status_code=500, detail=str(e))
@@ -80,8 +215,12 @@ def edit_quiz(quiz_id: int, quiz_title: str, created_by: str):
             conn.commit()
             cur.close()
 
+        quiz_cache.invalidate(quiz_id)
+        quiz_cache.invalidate(ALL_QUIZZES_KEY)
         return JSONResponse(status_code=200, content={"Quiz": "Updated"})
 
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(e)
         raise HTTPException(status_code=500, detail=str(e))
@@ -99,7 +238,13 @@ def delete_quiz(quiz_id: int):
             conn.commit()
             cur.close()
 
+        invalidate_quiz_content(quiz_id)
+        quiz_cache.invalidate(quiz_id)
+        quiz_cache.invalidate(ALL_QUIZZES_KEY)
+        leaderboards.invalidate(quiz_id)
         return JSONResponse(status_code=200, content={"Quiz": "Deleted"})
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
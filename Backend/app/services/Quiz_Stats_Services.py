@@ -0,0 +1,278 @@
+"""
+Per-quiz summary counters kept in the quiz_stats, quiz_score_counts,
+quiz_hourly_stats and quiz_leaderboard tables.
+
+The statements are executed on the caller's cursor so they commit in the same
+transaction as the write they account for. They use %s placeholders and work
+unchanged with psycopg2 and psycopg 3 cursors.
+"""
+
+from datetime import datetime
+from typing import Optional
+
+import psycopg2.extras
+
+QUESTIONS_ADDED_SQL = """
+    INSERT INTO quiz_stats (quiz_id, question_count) VALUES (%s, %s)
+    ON CONFLICT (quiz_id) DO UPDATE
+    SET question_count = quiz_stats.question_count + EXCLUDED.question_count
+"""
+
+QUESTIONS_REMOVED_SQL = """
+    UPDATE quiz_stats SET question_count = GREATEST(question_count - %s, 0)
+    WHERE quiz_id = %s
+"""
+
+# Submission statements come in a single-row form and a multi-row form for
+# psycopg2.extras.execute_values; multi-row input must hold one row per key
+
+_SUBMISSION_ADDED = """
+    INSERT INTO quiz_stats (quiz_id, attempt_count, score_sum, score_sq_sum, best_score)
+    VALUES {values}
+    ON CONFLICT (quiz_id) DO UPDATE
+    SET attempt_count = quiz_stats.attempt_count + EXCLUDED.attempt_count,
+        score_sum = quiz_stats.score_sum + EXCLUDED.score_sum,
+        score_sq_sum = quiz_stats.score_sq_sum + EXCLUDED.score_sq_sum,
+        best_score = GREATEST(quiz_stats.best_score, EXCLUDED.best_score)
+"""
+SUBMISSION_ADDED_SQL = _SUBMISSION_ADDED.format(values="(%s, %s, %s, %s, %s)")
+SUBMISSIONS_ADDED_SQL = _SUBMISSION_ADDED.format(values="%s")
+
+# Keeps the user's best attempt: a higher score, or the same score reached earlier
+_LEADERBOARD_UPSERT = """
+    INSERT INTO quiz_leaderboard (quiz_id, user_id, best_score, submitted_at, submission_id)
+    VALUES {values}
+    ON CONFLICT (quiz_id, user_id) DO UPDATE
+    SET best_score = EXCLUDED.best_score,
+        submitted_at = EXCLUDED.submitted_at,
+        submission_id = EXCLUDED.submission_id
+    WHERE (EXCLUDED.best_score, quiz_leaderboard.submitted_at)
+        > (quiz_leaderboard.best_score, EXCLUDED.submitted_at)
+"""
+LEADERBOARD_UPSERT_SQL = _LEADERBOARD_UPSERT.format(values="(%s, %s, %s, %s, %s)")
+LEADERBOARD_UPSERTS_SQL = _LEADERBOARD_UPSERT.format(values="%s")
+
+# One row per distinct score: a fixed-bucket histogram of the quiz's attempts
+_SCORE_COUNT = """
+    INSERT INTO quiz_score_counts (quiz_id, score, attempt_count) VALUES {values}
+    ON CONFLICT (quiz_id, score) DO UPDATE
+    SET attempt_count = quiz_score_counts.attempt_count + EXCLUDED.attempt_count
+"""
+SCORE_COUNT_SQL = _SCORE_COUNT.format(values="(%s, %s, %s)")
+SCORE_COUNTS_SQL = _SCORE_COUNT.format(values="%s")
+
+# Hourly rollup for time-series charts; the multi-row form takes hours already
+# truncated (see hour_bucket)
+_HOURLY_ROLLUP = """
+    INSERT INTO quiz_hourly_stats (quiz_id, hour, attempt_count, score_sum, best_score)
+    VALUES {values}
+    ON CONFLICT (quiz_id, hour) DO UPDATE
+    SET attempt_count = quiz_hourly_stats.attempt_count + EXCLUDED.attempt_count,
+        score_sum = quiz_hourly_stats.score_sum + EXCLUDED.score_sum,
+        best_score = GREATEST(quiz_hourly_stats.best_score, EXCLUDED.best_score)
+"""
+HOURLY_ROLLUP_SQL = _HOURLY_ROLLUP.format(
+    values="(%s, date_trunc('hour', %s::timestamp), %s, %s, %s)"
+)
+HOURLY_ROLLUPS_SQL = _HOURLY_ROLLUP.format(values="%s")
+
+# Recomputes every counter from the base tables; the trailing %s is an optional
+# quiz_id filter (NULL rebuilds all quizzes)
+REBUILD_STATS_SQL = """
+    INSERT INTO quiz_stats
+        (quiz_id, question_count, attempt_count, score_sum, score_sq_sum, best_score)
+    SELECT q.quiz_id,
+           COALESCE(qc.question_count, 0),
+           COALESCE(sc.attempt_count, 0),
+           COALESCE(sc.score_sum, 0),
+           COALESCE(sc.score_sq_sum, 0),
+           sc.best_score
+    FROM quiz q
+    LEFT JOIN (
+        SELECT quiz_id, COUNT(*) AS question_count FROM question GROUP BY quiz_id
+    ) qc ON qc.quiz_id = q.quiz_id
+    LEFT JOIN (
+        SELECT quiz_id,
+               COUNT(*) AS attempt_count,
+               SUM(COALESCE(score, 0)) AS score_sum,
+               SUM(COALESCE(score, 0)::bigint * COALESCE(score, 0)) AS score_sq_sum,
+               MAX(score) AS best_score
+        FROM submission GROUP BY quiz_id
+    ) sc ON sc.quiz_id = q.quiz_id
+    WHERE %(quiz_id)s::int IS NULL OR q.quiz_id = %(quiz_id)s::int
+    ON CONFLICT (quiz_id) DO UPDATE
+    SET question_count = EXCLUDED.question_count,
+        attempt_count = EXCLUDED.attempt_count,
+        score_sum = EXCLUDED.score_sum,
+        score_sq_sum = EXCLUDED.score_sq_sum,
+        best_score = EXCLUDED.best_score
+"""
+
+REBUILD_SCORE_COUNTS_SQL = [
+    """
+    DELETE FROM quiz_score_counts
+    WHERE %(quiz_id)s::int IS NULL OR quiz_id = %(quiz_id)s::int
+    """,
+    """
+    INSERT INTO quiz_score_counts (quiz_id, score, attempt_count)
+    SELECT quiz_id, COALESCE(score, 0), COUNT(*)
+    FROM submission
+    WHERE %(quiz_id)s::int IS NULL OR quiz_id = %(quiz_id)s::int
+    GROUP BY quiz_id, COALESCE(score, 0)
+    """,
+]
+
+# Same ordering as LEADERBOARD_UPSERT_SQL: highest score, reached earliest.
+# Legacy rows without submitted_at rank as the epoch
+REBUILD_LEADERBOARD_SQL = [
+    """
+    DELETE FROM quiz_leaderboard
+    WHERE %(quiz_id)s::int IS NULL OR quiz_id = %(quiz_id)s::int
+    """,
+    """
+    INSERT INTO quiz_leaderboard (quiz_id, user_id, best_score, submitted_at, submission_id)
+    SELECT DISTINCT ON (quiz_id, user_id)
+           quiz_id, user_id, COALESCE(score, 0),
+           COALESCE(submitted_at, 'epoch'::timestamp), submission_id
+    FROM submission
+    WHERE %(quiz_id)s::int IS NULL OR quiz_id = %(quiz_id)s::int
+    ORDER BY quiz_id, user_id, COALESCE(score, 0) DESC,
+             COALESCE(submitted_at, 'epoch'::timestamp), submission_id
+    """,
+]
+
+# Submissions without submitted_at (legacy rows) have no hour and are left out
+REBUILD_HOURLY_ROLLUPS_SQL = [
+    """
+    DELETE FROM quiz_hourly_stats
+    WHERE %(quiz_id)s::int IS NULL OR quiz_id = %(quiz_id)s::int
+    """,
+    """
+    INSERT INTO quiz_hourly_stats (quiz_id, hour, attempt_count, score_sum, best_score)
+    SELECT quiz_id, date_trunc('hour', submitted_at), COUNT(*),
+           SUM(COALESCE(score, 0)), MAX(score)
+    FROM submission
+    WHERE submitted_at IS NOT NULL
+      AND (%(quiz_id)s::int IS NULL OR quiz_id = %(quiz_id)s::int)
+    GROUP BY 1, 2
+    """,
+]
+
+
+def hour_bucket(submitted_at: datetime) -> datetime:
+    return submitted_at.replace(minute=0, second=0, microsecond=0)
+
+
+def record_questions_added(cur, quiz_id: int, count: int = 1) -> None:
+    cur.execute(QUESTIONS_ADDED_SQL, (quiz_id, count))
+
+
+def record_questions_removed(cur, quiz_id: int, count: int = 1) -> None:
+    cur.execute(QUESTIONS_REMOVED_SQL, (count, quiz_id))
+
+
+def record_submission(
+    cur, quiz_id: int, user_id: int, score: int, submission_id: int, submitted_at
+) -> None:
+    cur.execute(SUBMISSION_ADDED_SQL, (quiz_id, 1, score, score * score, score))
+    cur.execute(SCORE_COUNT_SQL, (quiz_id, score, 1))
+    cur.execute(HOURLY_ROLLUP_SQL, (quiz_id, submitted_at, 1, score, score))
+    cur.execute(
+        LEADERBOARD_UPSERT_SQL, (quiz_id, user_id, score, submitted_at, submission_id)
+    )
+
+
+def record_submissions(cur, submissions) -> None:
+    """Batch form of ``record_submission`` (psycopg2 only).
+
+    ``submissions`` are (quiz_id, user_id, score, submission_id, submitted_at)
+    tuples. They are folded per key first, so every statement writes each row
+    once, in key order to keep concurrent batches from deadlocking.
+    """
+    stats = {}
+    score_counts = {}
+    hours = {}
+    best_attempts = {}
+    for quiz_id, user_id, score, submission_id, submitted_at in submissions:
+        quiz = stats.setdefault(quiz_id, [0, 0, 0, score])
+        quiz[0] += 1
+        quiz[1] += score
+        quiz[2] += score * score
+        quiz[3] = max(quiz[3], score)
+        score_counts[quiz_id, score] = score_counts.get((quiz_id, score), 0) + 1
+        hour = hours.setdefault((quiz_id, hour_bucket(submitted_at)), [0, 0, score])
+        hour[0] += 1
+        hour[1] += score
+        hour[2] = max(hour[2], score)
+        best = best_attempts.get((quiz_id, user_id))
+        if best is None or (-score, submitted_at) < (-best[0], best[1]):
+            best_attempts[quiz_id, user_id] = (score, submitted_at, submission_id)
+
+    psycopg2.extras.execute_values(
+        cur,
+        SUBMISSIONS_ADDED_SQL,
+        [(quiz_id, *totals) for quiz_id, totals in sorted(stats.items())],
+    )
+    psycopg2.extras.execute_values(
+        cur,
+        SCORE_COUNTS_SQL,
+        [(*key, count) for key, count in sorted(score_counts.items())],
+    )
+    psycopg2.extras.execute_values(
+        cur,
+        HOURLY_ROLLUPS_SQL,
+        [(*key, *totals) for key, totals in sorted(hours.items())],
+    )
+    psycopg2.extras.execute_values(
+        cur,
+        LEADERBOARD_UPSERTS_SQL,
+        [(*key, *best) for key, best in sorted(best_attempts.items())],
+        page_size=1000,
+    )
+
+
+async def record_questions_added_async(conn, quiz_id: int, count: int = 1) -> None:
+    await conn.execute(QUESTIONS_ADDED_SQL, (quiz_id, count))
+
+
+async def record_questions_removed_async(conn, quiz_id: int, count: int = 1) -> None:
+    await conn.execute(QUESTIONS_REMOVED_SQL, (count, quiz_id))
+
+
+async def record_submission_async(
+    conn, quiz_id: int, user_id: int, score: int, submission_id: int, submitted_at
+) -> None:
+    await conn.execute(SUBMISSION_ADDED_SQL, (quiz_id, 1, score, score * score, score))
+    await conn.execute(SCORE_COUNT_SQL, (quiz_id, score, 1))
+    await conn.execute(HOURLY_ROLLUP_SQL, (quiz_id, submitted_at, 1, score, score))
+    await conn.execute(
+        LEADERBOARD_UPSERT_SQL, (quiz_id, user_id, score, submitted_at, submission_id)
+    )
+
+
+def rebuild_quiz_stats(cur, quiz_id: Optional[int] = None) -> int:
+    """Recompute quiz_stats, quiz_score_counts, quiz_leaderboard and
+    quiz_hourly_stats from question and submission.
+
+    Returns the number of quiz_stats rows written. Every submission updates
+    quiz_stats first, so locking it blocks concurrent counter updates until
+    the caller commits and no submission can land between recount and commit.
+    """
+    cur.execute("LOCK TABLE quiz_stats IN EXCLUSIVE MODE")
+    cur.execute(REBUILD_STATS_SQL, {"quiz_id": quiz_id})
+    rows = cur.rowcount
+    for statement in REBUILD_SCORE_COUNTS_SQL + REBUILD_LEADERBOARD_SQL:
+        cur.execute(statement, {"quiz_id": quiz_id})
+    rebuild_hourly_rollups(cur, quiz_id)
+    return rows
+
+
+def rebuild_hourly_rollups(cur, quiz_id: Optional[int] = None) -> int:
+    """Recompute quiz_hourly_stats from submission; returns the rows written.
+
+    Takes the same lock as ``rebuild_quiz_stats``, for the same reason.
+    """
+    cur.execute("LOCK TABLE quiz_stats IN EXCLUSIVE MODE")
+    for statement in REBUILD_HOURLY_ROLLUPS_SQL:
+        cur.execute(statement, {"quiz_id": quiz_id})
+    return cur.rowcount
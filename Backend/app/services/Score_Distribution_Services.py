@@ -0,0 +1,84 @@
+import logging
+import math
+from bisect import bisect_left
+from itertools import accumulate
+from typing import Iterable, Tuple
+from ..database import get_db_connection
+from fastapi import HTTPException
+
+import psycopg2.extras
+
+# Percentiles reported by getScoreDistribution
+REPORTED_PERCENTILES = (25, 50, 75, 90, 99)
+
+SCORE_DISTRIBUTION_SQL = """
+    SELECT c.score, c.attempt_count, s.question_count
+    FROM quiz_score_counts c
+    LEFT JOIN quiz_stats s ON s.quiz_id = c.quiz_id
+    WHERE c.quiz_id = %s AND c.attempt_count > 0
+    ORDER BY c.score
+"""
+
+
+class ScoreHistogram:
+    """Exact histogram of integer scores with one bucket per distinct score.
+
+    Scores are bounded by the question count, so the histogram stays small
+    however many attempts it summarizes, and two histograms merge by adding
+    their counts (which is what the quiz_score_counts upserts do).
+    """
+
+    __slots__ = ("scores", "counts", "_cumulative")
+
+    def __init__(self, buckets: Iterable[Tuple[int, int]]):
+        # buckets must be (score, count) pairs in ascending score order
+        pairs = list(buckets)
+        self.scores = [score for score, _ in pairs]
+        self.counts = [count for _, count in pairs]
+        self._cumulative = list(accumulate(self.counts))
+
+    @property
+    def total(self) -> int:
+        return self._cumulative[-1] if self._cumulative else 0
+
+    def percentile(self, p: float) -> int:
+        """Nearest-rank percentile: the smallest score reached by ``p`` % of attempts."""
+        rank = max(math.ceil(p / 100 * self.total), 1)
+        return self.scores[bisect_left(self._cumulative, rank)]
+
+
+def build_score_distribution(quiz_id: int, rows) -> dict:
+    if not rows:
+        raise HTTPException(status_code=404, detail="No submissions found for quiz")
+
+    histogram = ScoreHistogram((row["score"], row["attempt_count"]) for row in rows)
+    return {
+        "quiz_id": quiz_id,
+        "total_attempts": histogram.total,
+        "total_questions": rows[0]["question_count"] or 0,
+        "min_score": histogram.scores[0],
+        "max_score": histogram.scores[-1],
+        "median": histogram.percentile(50),
+        "percentiles": {f"p{p}": histogram.percentile(p) for p in REPORTED_PERCENTILES},
+        "histogram": [
+            {"score": score, "count": count}
+            for score, count in zip(histogram.scores, histogram.counts)
+        ],
+    }
+
+
+def get_score_distribution(quiz_id: int):
+    try:
+        with get_db_connection() as conn:
+            cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
+            cur.execute(SCORE_DISTRIBUTION_SQL, (quiz_id,))
+            rows = cur.fetchall()
+            cur.close()
+
+        return build_score_distribution(quiz_id, rows)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(e)
+        raise HTTPException(status_code=500, detail=str(e))
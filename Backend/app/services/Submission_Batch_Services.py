@@ -0,0 +1,247 @@
+"""
+Group-Commit Submission Writer
+Optional write-behind buffer for createSubmission and gradeSubmission bursts
+(SUBMISSION_BATCHING).
+
+Requests enqueue their submission, with the selected answers of a graded one,
+and wait on a future. A single flusher thread takes up to
+SUBMISSION_BATCH_MAX_ROWS queued submissions, waiting at most
+SUBMISSION_BATCH_MAX_DELAY_MS after the first one, and writes them in one
+transaction with multi-row inserts. Each future resolves only after that
+transaction commits, so a caller is acknowledged exactly when its row is
+durable, as with the direct path.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Iterable, List, Optional, Sequence, Tuple
+from ..models.Submission_Model import SubmissionBase
+from ..database import get_db_connection
+from ..config import (
+    SUBMISSION_BATCH_MAX_ROWS,
+    SUBMISSION_BATCH_MAX_DELAY_MS,
+    SUBMISSION_QUEUE_MAX,
+    DB_SHUTDOWN_TIMEOUT,
+)
+from .Quiz_Stats_Services import record_submission, record_submissions
+from fastapi import HTTPException
+
+import psycopg2.extras
+
+INSERT_SUBMISSION_SQL = """
+    INSERT INTO submission(user_id,quiz_id,score,submitted_at)
+    VALUES(%s,%s,%s,COALESCE(%s, CURRENT_TIMESTAMP))
+    RETURNING submission_id, submitted_at;
+"""
+
+# Batch insert with ids reserved up front, so results map back to callers
+# without relying on the order of a multi-row RETURNING
+INSERT_SUBMISSIONS_SQL = """
+    INSERT INTO submission(submission_id,user_id,quiz_id,score,submitted_at)
+    VALUES %s
+    RETURNING submission_id, submitted_at
+"""
+
+INSERT_USER_ANSWERS_SQL = """
+    INSERT INTO user_answers(submission_id,question_id,answer_id)
+    VALUES %s
+"""
+
+RESERVE_SUBMISSION_IDS_SQL = """
+    SELECT nextval(pg_get_serial_sequence('submission', 'submission_id'))
+    FROM generate_series(1, %s)
+"""
+
+_STOP = object()
+
+
+class SubmissionBatchWriter:
+    """Bounded queue of pending submissions drained by one flusher thread."""
+
+    def __init__(self, max_rows: int, max_delay_ms: float, max_queue: int):
+        self.max_rows = max_rows
+        self.max_delay = max_delay_ms / 1000
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(
+            target=self._run, name="submission-batch-writer", daemon=True
+        )
+        # Orders submit() against close() so nothing is queued behind the stop marker
+        self._lock = threading.Lock()
+        self._closed = False
+        self._batches = 0
+        self._rows = 0
+        self._thread.start()
+
+    def submit(
+        self, submission: SubmissionBase, answers: Sequence[Tuple[int, int]] = ()
+    ) -> Future:
+        """Queue a submission and its (question_id, answer_id) selections; the
+        future resolves to its (submission_id, submitted_at)."""
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise HTTPException(status_code=503, detail="Submission writer is shutting down")
+            try:
+                self._queue.put_nowait((submission, answers, future))
+            except queue.Full:
+                raise HTTPException(status_code=503, detail="Submission queue is full, retry shortly")
+        return future
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Flush everything already queued, then stop the flusher."""
+        with self._lock:
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "batches": self._batches,
+            "rows": self._rows,
+            "average_batch": round(self._rows / self._batches, 2) if self._batches else None,
+        }
+
+    def _collect(self, first) -> Tuple[List, bool]:
+        """Gather a batch starting with ``first``; also reports whether to stop."""
+        batch = [first]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_rows:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+            batch, stop = self._collect(first)
+            try:
+                self._flush(batch)
+            except Exception as e:
+                logging.error("Submission batch failed, retrying rows one by one: %s", e)
+                self._flush_each(batch)
+
+    def _flush(self, batch) -> None:
+        with get_db_connection() as conn:
+            cur = conn.cursor()
+            cur.execute(RESERVE_SUBMISSION_IDS_SQL, (len(batch),))
+            ids = [row[0] for row in cur.fetchall()]
+            returned = psycopg2.extras.execute_values(
+                cur,
+                INSERT_SUBMISSIONS_SQL,
+                [
+                    (submission_id, s.user_id, s.quiz_id, s.score, s.submitted_at)
+                    for submission_id, (s, _, _) in zip(ids, batch)
+                ],
+                template="(%s,%s,%s,%s,COALESCE(%s, CURRENT_TIMESTAMP))",
+                page_size=len(batch),
+                fetch=True,
+            )
+            submitted_at = dict(returned)
+            record_submissions(
+                cur,
+                [
+                    (s.quiz_id, s.user_id, s.score, submission_id, submitted_at[submission_id])
+                    for submission_id, (s, _, _) in zip(ids, batch)
+                ],
+            )
+            insert_user_answers(
+                cur,
+                [
+                    (submission_id, question_id, answer_id)
+                    for submission_id, (_, answers, _) in zip(ids, batch)
+                    for question_id, answer_id in answers
+                ],
+            )
+            conn.commit()
+            cur.close()
+
+        self._batches += 1
+        self._rows += len(batch)
+        for submission_id, (_, _, future) in zip(ids, batch):
+            future.set_result((submission_id, submitted_at[submission_id]))
+
+    def _flush_each(self, batch) -> None:
+        """Write rows in their own transactions so one bad row fails only its caller."""
+        for submission, answers, future in batch:
+            try:
+                future.set_result(write_submission(submission, answers))
+            except Exception as e:
+                future.set_exception(e)
+
+
+def insert_user_answers(cur, rows: Iterable[Tuple[int, int, int]]) -> None:
+    """Insert (submission_id, question_id, answer_id) rows into user_answers."""
+    rows = list(rows)
+    if rows:
+        psycopg2.extras.execute_values(cur, INSERT_USER_ANSWERS_SQL, rows, page_size=len(rows))
+
+
+def write_submission(submission: SubmissionBase, answers: Sequence[Tuple[int, int]] = ()):
+    """Insert one submission with its selected answers and summary updates;
+    returns (submission_id, submitted_at)."""
+    with get_db_connection() as conn:
+        cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
+        cur.execute(
+            INSERT_SUBMISSION_SQL,
+            (
+                submission.user_id,
+                submission.quiz_id,
+                submission.score,
+                submission.submitted_at,
+            ),
+        )
+        row = cur.fetchone()
+        insert_user_answers(
+            cur,
+            [(row["submission_id"], question_id, answer_id) for question_id, answer_id in answers],
+        )
+        record_submission(
+            cur,
+            submission.quiz_id,
+            submission.user_id,
+            submission.score,
+            row["submission_id"],
+            row["submitted_at"],
+        )
+
+        conn.commit()
+        cur.close()
+
+    return row["submission_id"], row["submitted_at"]
+
+
+_WRITER: Optional[SubmissionBatchWriter] = None
+_WRITER_LOCK = threading.Lock()
+
+
+def get_submission_writer() -> SubmissionBatchWriter:
+    """The process-wide batch writer, started on first use."""
+    global _WRITER
+    with _WRITER_LOCK:
+        if _WRITER is None:
+            _WRITER = SubmissionBatchWriter(
+                SUBMISSION_BATCH_MAX_ROWS, SUBMISSION_BATCH_MAX_DELAY_MS, SUBMISSION_QUEUE_MAX
+            )
+        return _WRITER
+
+
+def close_submission_writer(timeout: float = DB_SHUTDOWN_TIMEOUT) -> None:
+    """Flush queued submissions and stop the flusher, if it was started."""
+    global _WRITER
+    with _WRITER_LOCK:
+        writer, _WRITER = _WRITER, None
+    if writer is not None:
+        writer.close(timeout)
@@ -1,6 +1,12 @@
 import logging
-from ..models.Submission_Model import SubmissionBase
+from datetime import datetime
+from typing import Optional
+from ..models.Submission_Model import SubmissionBase, SubmissionHistoryPage
 from ..database import get_db_connection
+from ..leaderboard import leaderboards
+from ..config import SUBMISSION_BATCHING
+from ..utils.pagination import encode_cursor, decode_cursor
+from .Submission_Batch_Services import get_submission_writer, write_submission
 from fastapi import HTTPException
 from fastapi.responses import JSONResponse
 
@@ -9,28 +15,66 @@ import psycopg2.extras
 
 def create_submission(submission: SubmissionBase):
     try:
-        with get_db_connection() as conn:
-            cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
-            cur.execute(
-                "INSERT INTO submission(user_id,quiz_id,score,submitted_at) VALUES(%s,%s,%s,%s);",
-                (
-                    submission.user_id,
-                    submission.quiz_id,
-                    submission.score,
-                    submission.submitted_at,
-                ),
-            )
-
-            conn.commit()
-            cur.close()
-
+        if SUBMISSION_BATCHING:
+            # Blocks until the batch holding this submission has committed
+            submission_id, submitted_at = get_submission_writer().submit(submission).result()
+        else:
+            submission_id, submitted_at = write_submission(submission)
+
+        leaderboards.offer(
+            submission.quiz_id,
+            submission.user_id,
+            submission.score,
+            submitted_at,
+            submission_id,
+        )
         return JSONResponse(status_code=200, content={"Submission": "Submitted"})
 
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+QUIZ_STATISTICS_SQL = """
+    SELECT question_count, attempt_count, score_sum, score_sq_sum, best_score
+    FROM quiz_stats
+    WHERE quiz_id = %s
+"""
+
+
+def build_quiz_statistics(quiz_id: int, row) -> dict:
+    """Turn a quiz_stats row into the getQuizStatistics response."""
+    if not row or row["attempt_count"] == 0:
+        raise HTTPException(status_code=404, detail="No submissions found for quiz")
+
+    attempts = row["attempt_count"]
+    total_questions = row["question_count"]
+    average_score = row["score_sum"] / attempts
+    best_score = row["best_score"] or 0
+    # Population standard deviation from the running sums
+    variance = max(row["score_sq_sum"] / attempts - average_score * average_score, 0.0)
+
+    if total_questions and total_questions > 0:
+        average_percentage = round((average_score / total_questions) * 100, 2)
+        best_percentage = round((best_score / total_questions) * 100, 2)
+    else:
+        average_percentage = None
+        best_percentage = None
+
+    return {
+        "quiz_id": quiz_id,
+        "total_attempts": attempts,
+        "average_score": average_score,
+        "best_score": best_score,
+        "score_stddev": round(variance ** 0.5, 4),
+        "total_questions": total_questions,
+        "average_percentage": average_percentage,
+        "best_percentage": best_percentage,
+    }
+
+
 def get_quiz_statistics(quiz_id: int):
     """Return basic statistics for a given quiz based on submissions.
 
@@ -38,58 +82,23 @@ def get_quiz_statistics(quiz_id: int):
     - total_attempts
     - average_score
     - best_score
+    - score_stddev
     - total_questions
     - average_percentage
     - best_percentage
+
+    They are read from the running aggregates in quiz_stats, which are kept
+    current by the submission and question write paths.
     """
 
     try:
         with get_db_connection() as conn:
             cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
-
-            # Get question count for this quiz
-            cur.execute("SELECT COUNT(*) AS total_questions FROM question WHERE quiz_id = %s", (quiz_id,))
-            q_row = cur.fetchone()
-            total_questions = q_row["total_questions"] if q_row else 0
-
-            # Get aggregate stats from submissions
-            cur.execute(
-                """
-                SELECT
-                    COUNT(*) AS attempts,
-                    AVG(score)::float AS average_score,
-                    MAX(score) AS best_score
-                FROM submission
-                WHERE quiz_id = %s
-                """,
-                (quiz_id,),
-            )
-            s_row = cur.fetchone()
+            cur.execute(QUIZ_STATISTICS_SQL, (quiz_id,))
+            row = cur.fetchone()
             cur.close()
 
-        if not s_row or s_row["attempts"] == 0:
-            raise HTTPException(status_code=404, detail="No submissions found for quiz")
-
-        attempts = s_row["attempts"] or 0
-        average_score = s_row["average_score"] or 0.0
-        best_score = s_row["best_score"] or 0
-
-        if total_questions and total_questions > 0:
-            average_percentage = round((average_score / total_questions) * 100, 2)
-            best_percentage = round((best_score / total_questions) * 100, 2)
-        else:
-            average_percentage = None
-            best_percentage = None
-
-        return {
-            "quiz_id": quiz_id,
-            "total_attempts": attempts,
-            "average_score": average_score,
-            "best_score": best_score,
-            "total_questions": total_questions,
-            "average_percentage": average_percentage,
-            "best_percentage": best_percentage,
-        }
+        return build_quiz_statistics(quiz_id, row)
 
     except HTTPException:
         # Re-raise HTTPExceptions directly
@@ -114,6 +123,8 @@ def get_leaderboard_by_quiz(quiz_id: int):
             raise HTTPException(status_code=404, detail="No Submission found for Quiz")
         return [SubmissionBase(**row) for row in rows]
 
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(e)
         raise HTTPException(status_code=500, detail=str(e))
@@ -131,6 +142,103 @@ def get_submission_by_user(user_id: int):
             raise HTTPException(status_code=404, detail="No Submission found for user")
         return [SubmissionBase(**row) for row in rows]
 
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# Sort key of the history endpoints; matches the expression in the
+# idx_submission_user_*history indexes
+HISTORY_SORT_KEY = "COALESCE(submitted_at, 'epoch'::timestamp)"
+
+
+def build_history_query(
+    user_id: int,
+    limit: int,
+    cursor: Optional[str] = None,
+    quiz_id: Optional[int] = None,
+    latest: bool = False,
+):
+    """SQL and parameters for one page of a user's submissions, newest first.
+
+    With ``latest`` only the most recent attempt per quiz is listed; Postgres
+    picks it with DISTINCT ON while walking idx_submission_user_quiz_history.
+    """
+    conditions = ["user_id = %s"]
+    params = [user_id]
+    if quiz_id is not None:
+        conditions.append("quiz_id = %s")
+        params.append(quiz_id)
+    where = " AND ".join(conditions)
+
+    if latest:
+        source = f"""(
+            SELECT DISTINCT ON (quiz_id) *, {HISTORY_SORT_KEY} AS sort_key
+            FROM submission
+            WHERE {where}
+            ORDER BY quiz_id, {HISTORY_SORT_KEY} DESC, submission_id DESC
+        ) latest"""
+        sort_key = "sort_key"
+        where = "TRUE"
+    else:
+        source = "submission"
+        sort_key = HISTORY_SORT_KEY
+
+    if cursor:
+        after = decode_cursor(cursor, "submitted_at", "submission_id")
+        try:
+            after_submitted_at = datetime.fromisoformat(after["submitted_at"])
+            after_submission_id = int(after["submission_id"])
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+        where += f" AND ({sort_key}, submission_id) < (%s, %s)"
+        params.extend([after_submitted_at, after_submission_id])
+
+    sql = f"""
+        SELECT submission_id, user_id, quiz_id, score, submitted_at,
+               {sort_key} AS sort_key
+        FROM {source}
+        WHERE {where}
+        ORDER BY {sort_key} DESC, submission_id DESC
+        LIMIT %s
+    """
+    # Fetch one extra row to learn whether another page exists
+    params.append(limit + 1)
+    return sql, params
+
+
+def build_history_page(rows, limit: int) -> SubmissionHistoryPage:
+    items = [SubmissionBase(**row) for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit and items:
+        last = rows[limit - 1]
+        next_cursor = encode_cursor(
+            {"submitted_at": last["sort_key"].isoformat(), "submission_id": last["submission_id"]}
+        )
+    return SubmissionHistoryPage(items=items, next_cursor=next_cursor)
+
+
+def get_submission_history(
+    user_id: int,
+    limit: int,
+    cursor: Optional[str] = None,
+    quiz_id: Optional[int] = None,
+    latest: bool = False,
+):
+    try:
+        sql, params = build_history_query(user_id, limit, cursor, quiz_id, latest)
+        with get_db_connection() as conn:
+            cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
+            cur.execute(sql, params)
+            rows = cur.fetchall()
+            cur.close()
+
+        return build_history_page(rows, limit)
+
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(e)
         raise HTTPException(status_code=500, detail=str(e))
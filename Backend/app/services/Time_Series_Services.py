@@ -0,0 +1,119 @@
+"""
+Submission Time Series
+Attempts and average score per hour or day, for one quiz or all quizzes,
+read only from the quiz_hourly_stats rollup (never from submission).
+
+Times are compared with submitted_at as stored, i.e. in the database's time
+zone; buckets without attempts are returned with an attempt_count of 0.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+from ..database import get_db_connection
+from ..config import TIME_SERIES_MAX_BUCKETS
+from fastapi import HTTPException
+
+import psycopg2.extras
+
+BUCKET_WIDTHS = {"hour": timedelta(hours=1), "day": timedelta(days=1)}
+
+# Series returned when no start is given
+DEFAULT_BUCKETS = {"hour": 24, "day": 30}
+
+# %(bucket)s is 'hour' or 'day'; hour rows roll up into days by date_trunc
+_TIME_SERIES = """
+    SELECT date_trunc(%(bucket)s, hour) AS bucket_start,
+           SUM(attempt_count) AS attempt_count,
+           SUM(score_sum) AS score_sum,
+           MAX(best_score) AS best_score
+    FROM quiz_hourly_stats
+    WHERE {quiz_filter}hour >= %(start)s AND hour < %(end)s
+    GROUP BY 1
+    ORDER BY 1
+"""
+QUIZ_TIME_SERIES_SQL = _TIME_SERIES.format(quiz_filter="quiz_id = %(quiz_id)s AND ")
+ALL_QUIZZES_TIME_SERIES_SQL = _TIME_SERIES.format(quiz_filter="")
+
+
+def truncate(value: datetime, bucket: str) -> datetime:
+    value = value.replace(minute=0, second=0, microsecond=0)
+    return value.replace(hour=0) if bucket == "day" else value
+
+
+def time_range(
+    bucket: str, start: Optional[datetime], end: Optional[datetime]
+) -> Tuple[datetime, datetime]:
+    """Bucket-aligned start and exclusive end of the requested series."""
+    # Aware timestamps are taken at face value, like the naive submitted_at
+    end = (end or datetime.now()).replace(tzinfo=None)
+    width = BUCKET_WIDTHS[bucket]
+    if start is None:
+        start = end - width * DEFAULT_BUCKETS[bucket]
+    start = truncate(start.replace(tzinfo=None), bucket)
+    if end <= start:
+        raise HTTPException(status_code=400, detail="end must be after start")
+    if (end - start) / width > TIME_SERIES_MAX_BUCKETS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Time range is limited to {TIME_SERIES_MAX_BUCKETS} {bucket} buckets",
+        )
+    return start, end
+
+
+def time_series_params(quiz_id: Optional[int], bucket: str, start: datetime, end: datetime):
+    sql = ALL_QUIZZES_TIME_SERIES_SQL if quiz_id is None else QUIZ_TIME_SERIES_SQL
+    return sql, {"quiz_id": quiz_id, "bucket": bucket, "start": start, "end": end}
+
+
+def build_time_series(
+    quiz_id: Optional[int], bucket: str, start: datetime, end: datetime, rows
+) -> dict:
+    by_start = {row["bucket_start"]: row for row in rows}
+    width = BUCKET_WIDTHS[bucket]
+    points = []
+    bucket_start = start
+    while bucket_start < end:
+        row = by_start.get(bucket_start)
+        attempts = int(row["attempt_count"]) if row else 0
+        points.append(
+            {
+                "bucket_start": bucket_start,
+                "attempt_count": attempts,
+                "average_score": round(float(row["score_sum"]) / attempts, 2) if attempts else None,
+                "best_score": row["best_score"] if row else None,
+            }
+        )
+        bucket_start += width
+    return {
+        "quiz_id": quiz_id,
+        "bucket": bucket,
+        "start": start,
+        "end": end,
+        "total_attempts": sum(point["attempt_count"] for point in points),
+        "points": points,
+    }
+
+
+def get_submission_time_series(
+    quiz_id: Optional[int],
+    bucket: str = "hour",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+):
+    try:
+        start, end = time_range(bucket, start, end)
+        sql, params = time_series_params(quiz_id, bucket, start, end)
+        with get_db_connection() as conn:
+            cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
+            cur.execute(sql, params)
+            rows = cur.fetchall()
+            cur.close()
+
+        return build_time_series(quiz_id, bucket, start, end, rows)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(e)
+        raise HTTPException(status_code=500, detail=str(e))
@@ -6,20 +6,24 @@ from fastapi.responses import JSONResponse
 import psycopg2.extras
 import logging
 from datetime import datetime
-from ..configAndAuth import get_password_hash, verify_password
+from ..configAndAuth import get_password_hash, verify_password, invalidate_user
+
+# Only replaces the hash that was verified, so a concurrent change wins
+REHASH_PASSWORD_SQL = "UPDATE users SET hashed_password = %s WHERE user_id = %s AND hashed_password = %s"
 
 
 def create_user(user: User):
     try:
-        with get_db_connection() as conn:
-            cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
+        # Hash the password before saving (truncate if too long), before
+        # taking a connection so it is not held while bcrypt runs
+        password = user.hashed_password[:72]  # bcrypt max 72 bytes
+        hashed_pw = get_password_hash(password)
 
-            # Hash the password before saving (truncate if too long)
-            password = user.hashed_password[:72]  # bcrypt max 72 bytes
-            hashed_pw = get_password_hash(password)
+        # Use current timestamp for created_at to avoid client-side date issues
+        created_at = datetime.utcnow()
 
-            # Use current timestamp for created_at to avoid client-side date issues
-            created_at = datetime.utcnow()
+        with get_db_connection() as conn:
+            cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
 
             cur.execute(
                 "INSERT INTO users(user_email, hashed_password, created_at) VALUES(%s, %s, %s) RETURNING user_id, user_email, created_at",
@@ -33,6 +37,8 @@ def create_user(user: User):
             conn.commit()
             row = cur.fetchone()
             cur.close()
+        # The email may be cached as unknown
+        invalidate_user(user.user_email)
 
         # Convert DB row (which may contain date/datetime) into JSON-serializable dict
         if row is not None:
@@ -49,6 +55,8 @@ def create_user(user: User):
 
         return JSONResponse(status_code=201, content=result)
 
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(e)
         raise HTTPException(status_code=500, detail=str(e))
@@ -64,6 +72,8 @@ def get_user(user_id: int):
 
         return User(**row)
 
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(e)
         raise HTTPException(status_code=500, detail=str(e))
@@ -87,6 +97,26 @@ def check_UserExist_in_db(user: UserLogin):
                 return {"Exist": False}
         return {"Exist": False}
 
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(e)
         raise HTTPException(status_code=500, detail=str(e))
+
+
+def rehash_password(user_id: int, password: str, old_hash: str) -> None:
+    """Store a hash with the current cost factor; run after a successful login.
+
+    Meant as a background task: failures (including a saturated password
+    pool) are logged and the rehash is retried on the next login.
+    """
+    try:
+        new_hash = get_password_hash(password[:72])
+        with get_db_connection() as conn:
+            cur = conn.cursor()
+            cur.execute(REHASH_PASSWORD_SQL, (new_hash, user_id, old_hash))
+            conn.commit()
+            cur.close()
+        logging.info("Rehashed password for user %s", user_id)
+    except Exception as e:
+        logging.warning("Could not rehash password for user %s: %s", user_id, e)
@@ -0,0 +1,60 @@
+"""
+HTTP Conditional Request Helpers
+Pre-serialized JSON payloads with strong ETags and If-None-Match handling
+"""
+
+import hashlib
+import json
+from typing import Any
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+
+class CachedPayload:
+    """A response body serialized once, with its decoded data and strong ETag.
+
+    Instances are shared between requests through the in-process caches and
+    must be treated as read-only.
+    """
+
+    __slots__ = ("data", "body", "etag")
+
+    def __init__(self, data: Any):
+        self.data = data
+        # Same encoding as JSONResponse, so cached and uncached bodies match
+        self.body = json.dumps(
+            jsonable_encoder(data),
+            ensure_ascii=False,
+            allow_nan=False,
+            indent=None,
+            separators=(",", ":"),
+        ).encode("utf-8")
+        self.etag = '"' + hashlib.blake2b(self.body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match header matches ``etag``.
+
+    If-None-Match uses weak comparison, so a ``W/`` prefix is ignored.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def conditional_json_response(request: Request, payload: CachedPayload) -> Response:
+    """Return ``304 Not Modified`` when the client already has ``payload``."""
+    # no-cache lets browsers keep the body but revalidate it on every poll
+    headers = {"ETag": payload.etag, "Cache-Control": "no-cache"}
+    if etag_matches(request, payload.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=payload.body, media_type="application/json", headers=headers)
@@ -0,0 +1,26 @@
+"""
+Keyset Pagination Helpers
+Opaque cursors that carry the sort key of the last row on a page
+"""
+
+import base64
+import json
+from fastapi import HTTPException
+
+
+def encode_cursor(values: dict) -> str:
+    """Encode the last row's sort key as an opaque, URL-safe cursor."""
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, *fields: str) -> dict:
+    """Decode a cursor produced by ``encode_cursor`` and check it has ``fields``."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    if not isinstance(values, dict) or any(field not in values for field in fields):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    return values
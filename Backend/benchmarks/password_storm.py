@@ -0,0 +1,122 @@
+"""
+Login storm benchmark: bcrypt inline on request threads vs. the worker pool.
+
+For each bcrypt cost factor, --concurrency clients run --total logins
+(verify) and then --total registrations (hash), once inline on the client
+threads (the old behaviour) and once through a PasswordWorkerPool. While
+they run, a probe thread times a small pure-Python task every 10 ms as a
+stand-in for the other endpoints sharing the process. Reports throughput,
+latency percentiles, 503 rejections and probe p99 per mode.
+
+No database is needed. Run from Backend/:
+    python -m benchmarks.password_storm [--rounds 4,8,10,12] [--total N]
+        [--concurrency C] [--workers W] [--queue-max Q]
+"""
+
+import argparse
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException
+from passlib.hash import bcrypt
+
+from app.configAndAuth import _verify_bcrypt
+from app.password_pool import PasswordWorkerPool
+
+PASSWORD = "correct horse battery staple"
+
+
+def hash_with_rounds(password, rounds):
+    return bcrypt.using(rounds=rounds).hash(password)
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(p / 100 * len(sorted_values)))]
+
+
+class Probe(threading.Thread):
+    """Times a fixed small CPU task at a steady rate."""
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.latencies = []
+        self.stop = threading.Event()
+
+    def run(self):
+        while not self.stop.is_set():
+            started = time.perf_counter()
+            sum(i * i for i in range(2000))
+            self.latencies.append(time.perf_counter() - started)
+            time.sleep(0.01)
+
+
+def run(label, call, total, concurrency):
+    def one(_):
+        started = time.perf_counter()
+        try:
+            call()
+        except HTTPException:
+            return None
+        return time.perf_counter() - started
+
+    probe = Probe()
+    probe.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = list(executor.map(one, range(total)))
+    elapsed = time.perf_counter() - started
+    probe.stop.set()
+    probe.join()
+
+    ok = sorted(latency for latency in latencies if latency is not None)
+    probe_latencies = sorted(probe.latencies)
+    print(
+        f"  {label:<16} {len(ok):>5} ok {total - len(ok):>5} rejected "
+        f"{len(ok) / elapsed:>7.1f}/s  "
+        f"p50 {statistics.median(ok) * 1000 if ok else 0:>8.1f} ms  "
+        f"p99 {percentile(ok, 99) * 1000:>8.1f} ms  "
+        f"probe p99 {percentile(probe_latencies, 99) * 1000:>6.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", default="4,8,10,12")
+    parser.add_argument("--total", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--queue-max", type=int, default=32)
+    args = parser.parse_args()
+
+    pool = PasswordWorkerPool(args.workers, args.queue_max)
+    # Start the worker processes before timing anything
+    for _ in range(args.workers):
+        pool.run(hash_with_rounds, PASSWORD, 4)
+
+    for rounds in (int(value) for value in args.rounds.split(",")):
+        hashed = hash_with_rounds(PASSWORD, rounds)
+        print(f"bcrypt rounds={rounds}")
+        run("login inline", lambda: _verify_bcrypt(PASSWORD, hashed), args.total, args.concurrency)
+        run(
+            "login pool",
+            lambda: pool.run(_verify_bcrypt, PASSWORD, hashed),
+            args.total,
+            args.concurrency,
+        )
+        run("register inline", lambda: hash_with_rounds(PASSWORD, rounds), args.total, args.concurrency)
+        run(
+            "register pool",
+            lambda: pool.run(hash_with_rounds, PASSWORD, rounds),
+            args.total,
+            args.concurrency,
+        )
+    print("pool:", pool.stats())
+    pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Rate limit check overhead: per-process memory storage vs. the shared table.
+
+Runs --checks limiter hits (what slowapi does once per limited request)
+over --keys client keys with the fixed-window and sliding-window-counter
+strategies, against memory:// and shm://, single-threaded, and reports mean
+and p99 microseconds per check. Then --processes spawned processes hit one
+shared key --checks times in total through shm:// and the final count is
+compared with the total, which is the property memory:// cannot give across
+workers.
+
+No database is needed. Run from Backend/:
+    python -m benchmarks.rate_limit_storage [--checks N] [--keys K]
+        [--processes P] [--path /dev/shm/quiz-rate-limits-bench]
+"""
+
+import argparse
+import multiprocessing
+import os
+import statistics
+import time
+
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import FixedWindowRateLimiter, SlidingWindowCounterRateLimiter
+
+from app import rate_limit_storage  # noqa: F401  (registers shm://)
+
+LIMIT = parse("1000000/minute")
+
+STRATEGIES = {
+    "fixed-window": FixedWindowRateLimiter,
+    "sliding-window-counter": SlidingWindowCounterRateLimiter,
+}
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(p / 100 * len(sorted_values)))]
+
+
+def run(label, limiter, checks, keys):
+    identifiers = [f"10.0.{i // 256}.{i % 256}" for i in range(keys)]
+    latencies = []
+    for i in range(checks):
+        started = time.perf_counter()
+        limiter.hit(LIMIT, identifiers[i % keys], "/Quiz/getQuizzes")
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    print(
+        f"  {label:<34} mean {statistics.fmean(latencies) * 1e6:>6.1f} us  "
+        f"p99 {percentile(latencies, 99) * 1e6:>6.1f} us"
+    )
+
+
+def hammer(uri, checks):
+    limiter = FixedWindowRateLimiter(storage_from_string(uri))
+    for _ in range(checks):
+        limiter.hit(LIMIT, "shared-client")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--checks", type=int, default=100000)
+    parser.add_argument("--keys", type=int, default=1000)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--path", default="/dev/shm/quiz-rate-limits-bench")
+    args = parser.parse_args()
+
+    if os.path.exists(args.path):
+        os.remove(args.path)
+    uri = f"shm://{args.path}"
+
+    print(f"{args.checks} checks over {args.keys} keys, one thread")
+    shared = storage_from_string(uri)
+    for strategy, limiter_class in STRATEGIES.items():
+        for label, storage in (("memory://", storage_from_string("memory://")), ("shm://", shared)):
+            run(f"{strategy} {label}", limiter_class(storage), args.checks, args.keys)
+
+    per_process = args.checks // args.processes
+    context = multiprocessing.get_context("spawn")
+    workers = [
+        context.Process(target=hammer, args=(uri, per_process)) for _ in range(args.processes)
+    ]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+    counted = shared.get(LIMIT.key_for("shared-client"))
+    print(
+        f"{args.processes} processes x {per_process} checks on one key: "
+        f"counted {counted} of {per_process * args.processes} "
+        f"({per_process * args.processes / elapsed:,.0f} checks/s incl. process start)"
+    )
+    print("table:", shared.stats())
+    shared.close()
+    os.remove(args.path)
+
+
+if __name__ == "__main__":
+    main()
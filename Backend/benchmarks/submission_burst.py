@@ -0,0 +1,99 @@
+"""
+Submission burst benchmark: direct commits vs. the group-commit writer.
+
+Simulates an exam closing: --concurrency clients each post submissions as fast
+as they can until --total submissions were written, once through the direct
+path (one transaction per submission) and once through the batch writer.
+Reports throughput and latency percentiles per mode.
+
+Run from Backend/ against a disposable database:
+    DATABASE_URL=postgresql://... python -m benchmarks.submission_burst \
+        [--total N] [--concurrency C] [--users U]
+
+It creates one quiz and --users users and leaves the written submissions behind.
+"""
+
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.database import get_db_connection, close_connection_pool
+from app.schema import ensure_schema
+from app.models.Submission_Model import SubmissionBase
+from app.services.Submission_Batch_Services import (
+    get_submission_writer,
+    close_submission_writer,
+    write_submission,
+)
+
+
+def create_fixtures(users):
+    with get_db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            INSERT INTO users(user_email,hashed_password)
+            SELECT %s || g || '@example.com', 'x' FROM generate_series(1, %s) g
+            RETURNING user_id
+            """,
+            (f"bench-{time.time_ns()}-", users),
+        )
+        user_ids = [row[0] for row in cur.fetchall()]
+        cur.execute(
+            "INSERT INTO quiz(quiz_title,created_by) VALUES('Burst benchmark','bench') RETURNING quiz_id"
+        )
+        quiz_id = cur.fetchone()[0]
+        conn.commit()
+        cur.close()
+    return user_ids, quiz_id
+
+
+def batched_submission(submission):
+    return get_submission_writer().submit(submission).result()
+
+
+def run(label, write, total, concurrency, user_ids, quiz_id):
+    def one(i):
+        submission = SubmissionBase(
+            user_id=user_ids[i % len(user_ids)], quiz_id=quiz_id, score=i % 20
+        )
+        started = time.perf_counter()
+        try:
+            write(submission)
+        except Exception:
+            return None
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = list(executor.map(one, range(total)))
+    elapsed = time.perf_counter() - started
+
+    ok = sorted(latency for latency in latencies if latency is not None)
+    quantiles = statistics.quantiles(ok, n=100) if len(ok) > 1 else [0] * 99
+    print(
+        f"{label:<8} {len(ok):>6} ok {total - len(ok):>5} failed "
+        f"{len(ok) / elapsed:>9.0f} sub/s  "
+        f"p50 {quantiles[49] * 1000:>7.1f} ms  p99 {quantiles[98] * 1000:>7.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--total", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--users", type=int, default=1000)
+    args = parser.parse_args()
+
+    ensure_schema()
+    user_ids, quiz_id = create_fixtures(args.users)
+    run("direct", write_submission, args.total, args.concurrency, user_ids, quiz_id)
+    run("batched", batched_submission, args.total, args.concurrency, user_ids, quiz_id)
+    print("writer:", get_submission_writer().stats())
+    close_submission_writer()
+    close_connection_pool()
+
+
+if __name__ == "__main__":
+    main()
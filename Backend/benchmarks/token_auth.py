@@ -0,0 +1,72 @@
+"""
+Per-request token check: jwt.decode on every call vs. the verified-token cache.
+
+Times decode_access_token over --requests calls spread across --sessions
+tokens (each token presented requests/sessions times, as a session would),
+first with a full jwt.decode per call (the old behaviour) and then through
+verified_token_cache. A third run uses a fresh token per call to show the
+cost a miss adds on top of jwt.decode. Reports mean and p99 microseconds per
+call and the cache counters.
+
+No database is needed. Run from Backend/:
+    python -m benchmarks.token_auth [--requests N] [--sessions S]
+"""
+
+import argparse
+import statistics
+import time
+
+from jose import jwt
+
+from app.cache import verified_token_cache
+from app.configAndAuth import ALGORITHM, SECRET_KEY, create_access_token, decode_access_token
+
+
+def uncached_decode(token):
+    return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(p / 100 * len(sorted_values)))]
+
+
+def run(label, decode, tokens):
+    latencies = []
+    for token in tokens:
+        started = time.perf_counter()
+        decode(token)
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    print(
+        f"  {label:<20} mean {statistics.fmean(latencies) * 1e6:>7.1f} us  "
+        f"p99 {percentile(latencies, 99) * 1e6:>7.1f} us"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=50000)
+    parser.add_argument("--sessions", type=int, default=500)
+    args = parser.parse_args()
+
+    sessions = [
+        create_access_token({"sub": f"user{i}@example.com", "user_id": i})
+        for i in range(args.sessions)
+    ]
+    presented = [sessions[i % args.sessions] for i in range(args.requests)]
+    fresh = [
+        create_access_token({"sub": f"new{i}@example.com", "user_id": i})
+        for i in range(min(args.requests, 10000))
+    ]
+
+    print(f"{args.requests} requests over {args.sessions} tokens")
+    run("jwt.decode per call", uncached_decode, presented)
+    run("cached", decode_access_token, presented)
+    run("fresh token (miss)", decode_access_token, fresh)
+    print("cache:", verified_token_cache.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""BoundedConnectionPool with stand-in connections; no database needed."""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from psycopg2 import extensions, pool
+
+from app.database import BoundedConnectionPool, PoolTimeout
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.info = SimpleNamespace(transaction_status=extensions.TRANSACTION_STATUS_IDLE)
+        self.rollbacks = 0
+
+    def close(self):
+        self.closed = 1
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.info.transaction_status = extensions.TRANSACTION_STATUS_IDLE
+
+
+class FakePool(BoundedConnectionPool):
+    def _connect(self):
+        return FakeConnection()
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.005)
+
+
+def start_waiter(db_pool, served, name):
+    """Check out a connection on a new thread once it is this thread's turn."""
+
+    def run():
+        conn = db_pool.getconn(timeout=5)
+        served.append(name)
+        db_pool.putconn(conn)
+
+    queued = len(db_pool._waiters)
+    thread = threading.Thread(target=run)
+    thread.start()
+    wait_for(lambda: len(db_pool._waiters) > queued)
+    return thread
+
+
+def test_reuses_returned_connections():
+    db_pool = FakePool(1, 2)
+    first = db_pool.getconn()
+    db_pool.putconn(first)
+    assert db_pool.getconn() is first
+
+
+def test_times_out_when_exhausted():
+    db_pool = FakePool(0, 1, timeout=0.05)
+    db_pool.getconn()
+    started = time.monotonic()
+    with pytest.raises(PoolTimeout):
+        db_pool.getconn()
+    assert time.monotonic() - started >= 0.05
+    assert not db_pool._waiters
+
+
+def test_fails_fast_when_wait_queue_is_full():
+    db_pool = FakePool(0, 1, max_waiters=1)
+    conn = db_pool.getconn()
+    served = []
+    waiter = start_waiter(db_pool, served, "queued")
+
+    started = time.monotonic()
+    with pytest.raises(PoolTimeout, match="wait queue is full"):
+        db_pool.getconn(timeout=5)
+    assert time.monotonic() - started < 1
+
+    db_pool.putconn(conn)
+    waiter.join(5)
+    assert served == ["queued"]
+
+
+def test_waiters_are_served_in_arrival_order():
+    db_pool = FakePool(0, 1)
+    conn = db_pool.getconn()
+    served = []
+    threads = [start_waiter(db_pool, served, name) for name in ("first", "second", "third")]
+
+    db_pool.putconn(conn)
+    for thread in threads:
+        thread.join(5)
+    assert served == ["first", "second", "third"]
+
+
+def test_putconn_rolls_back_open_transactions():
+    db_pool = FakePool(0, 1)
+    conn = db_pool.getconn()
+    conn.info.transaction_status = extensions.TRANSACTION_STATUS_INTRANS
+    db_pool.putconn(conn)
+    assert conn.rollbacks == 1
+    assert db_pool.getconn() is conn
+
+
+def test_drain_waits_for_checked_out_connections():
+    db_pool = FakePool(0, 2)
+    conn = db_pool.getconn()
+    assert not db_pool.drain(0.01)
+
+    returner = threading.Timer(0.05, db_pool.putconn, (conn,))
+    returner.start()
+    assert db_pool.drain(5)
+    returner.join()
+
+
+def test_closeall_wakes_waiters_and_rejects_checkouts():
+    db_pool = FakePool(1, 1)
+    conn = db_pool.getconn()
+    errors = []
+
+    def wait():
+        try:
+            db_pool.getconn(timeout=5)
+        except pool.PoolError as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=wait)
+    thread.start()
+    wait_for(lambda: db_pool._waiters)
+
+    db_pool.closeall()
+    thread.join(5)
+    assert len(errors) == 1 and not isinstance(errors[0], PoolTimeout)
+    with pytest.raises(pool.PoolError):
+        db_pool.getconn()
+
+    # Connections checked out before the close are closed on return
+    db_pool.putconn(conn)
+    assert conn.closed
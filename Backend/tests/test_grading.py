@@ -0,0 +1,89 @@
+"""Server-side grading with an AnswerKey (services/Grading_Services.py)."""
+
+import pytest
+from fastapi import HTTPException
+
+from app.models.Submission_Model import SelectedAnswer
+from app.services.Grading_Services import AnswerKey
+
+# Question 1: answer 11 is correct; question 2: answer 22 is correct;
+# question 3 has two correct answers
+QUESTIONS = [
+    {
+        "question_id": 1,
+        "answers": [
+            {"answer_id": 11, "is_correct": True},
+            {"answer_id": 12, "is_correct": False},
+        ],
+    },
+    {
+        "question_id": 2,
+        "answers": [
+            {"answer_id": 21, "is_correct": False},
+            {"answer_id": 22, "is_correct": True},
+        ],
+    },
+    {
+        "question_id": 3,
+        "answers": [
+            {"answer_id": 31, "is_correct": True},
+            {"answer_id": 32, "is_correct": True},
+            {"answer_id": 33, "is_correct": False},
+        ],
+    },
+]
+
+
+def selected(*pairs):
+    return [SelectedAnswer(question_id=q, answer_id=a) for q, a in pairs]
+
+
+@pytest.fixture
+def key():
+    return AnswerKey(QUESTIONS)
+
+
+def test_builds_lookup_tables(key):
+    assert key.total_questions == 3
+    assert key.correct_answers == {11, 22, 31, 32}
+    assert key.answer_question[33] == 3
+
+
+def test_counts_correct_answers(key):
+    assert key.grade(selected((1, 11), (2, 22), (3, 32))) == 3
+    assert key.grade(selected((1, 12), (2, 22), (3, 33))) == 1
+
+
+def test_unanswered_questions_score_nothing(key):
+    assert key.grade(selected((2, 22))) == 1
+    assert key.grade([]) == 0
+
+
+@pytest.mark.parametrize(
+    "answers",
+    [
+        # Not an answer of this quiz
+        selected((1, 99)),
+        # An answer of another question
+        selected((1, 22)),
+        # A question that is not in the quiz
+        selected((4, 11)),
+    ],
+)
+def test_rejects_answers_outside_the_question(key, answers):
+    with pytest.raises(HTTPException) as rejected:
+        key.grade(answers)
+    assert rejected.value.status_code == 400
+
+
+def test_rejects_a_question_answered_twice(key):
+    with pytest.raises(HTTPException) as rejected:
+        key.grade(selected((3, 31), (3, 32)))
+    assert rejected.value.status_code == 400
+    assert "more than once" in rejected.value.detail
+
+
+def test_quiz_without_questions():
+    key = AnswerKey([])
+    assert key.total_questions == 0
+    assert key.grade([]) == 0
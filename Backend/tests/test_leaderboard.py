@@ -0,0 +1,133 @@
+"""In-process leaderboards (app/leaderboard.py)."""
+
+from datetime import datetime, timedelta
+
+from app.leaderboard import LeaderboardRegistry, QuizLeaderboard
+
+START = datetime(2024, 1, 1, 12, 0)
+
+
+def at(minutes: int) -> datetime:
+    return START + timedelta(minutes=minutes)
+
+
+def ranking(board: QuizLeaderboard):
+    return [(entry["user_id"], entry["best_score"]) for entry in board.page(len(board))]
+
+
+def test_orders_by_score_then_time_then_user():
+    board = QuizLeaderboard()
+    board.offer(1, 5, at(3), 101)
+    board.offer(2, 8, at(4), 102)
+    board.offer(3, 5, at(1), 103)
+    board.offer(4, 5, at(1), 104)
+    assert ranking(board) == [(2, 8), (3, 5), (4, 5), (1, 5)]
+
+
+def test_keeps_best_attempt_per_user():
+    board = QuizLeaderboard()
+    assert board.offer(1, 5, at(0), 101)
+    assert not board.offer(1, 3, at(1), 102)
+    # Equal score later does not replace the earlier attempt
+    assert not board.offer(1, 5, at(2), 103)
+    assert board.rank(1)["submission_id"] == 101
+
+    assert board.offer(1, 9, at(3), 104)
+    assert len(board) == 1
+    assert board.rank(1) == {
+        "rank": 1,
+        "user_id": 1,
+        "best_score": 9,
+        "submitted_at": at(3),
+        "submission_id": 104,
+    }
+
+
+def test_reoffering_an_attempt_is_a_no_op():
+    board = QuizLeaderboard()
+    assert board.offer(1, 5, at(0), 101)
+    assert not board.offer(1, 5, at(0), 101)
+    assert len(board) == 1
+
+
+def test_rank_moves_with_better_attempts():
+    board = QuizLeaderboard()
+    for user_id in range(1, 6):
+        board.offer(user_id, 10 - user_id, at(user_id), 100 + user_id)
+    assert board.rank(5)["rank"] == 5
+    board.offer(5, 10, at(9), 200)
+    assert board.rank(5)["rank"] == 1
+    assert board.rank(1)["rank"] == 2
+    assert board.rank(42) is None
+
+
+def test_loads_rows_in_rank_order():
+    rows = [
+        {"user_id": 7, "best_score": 9, "submitted_at": at(0), "submission_id": 1},
+        {"user_id": 3, "best_score": 4, "submitted_at": at(2), "submission_id": 2},
+    ]
+    board = QuizLeaderboard(rows)
+    assert ranking(board) == [(7, 9), (3, 4)]
+    board.offer(5, 6, at(1), 3)
+    assert ranking(board) == [(7, 9), (5, 6), (3, 4)]
+
+
+def test_pages_continue_after_the_last_key():
+    board = QuizLeaderboard()
+    for user_id in range(1, 8):
+        board.offer(user_id, user_id % 3, at(user_id), 100 + user_id)
+
+    seen = []
+    after = None
+    while True:
+        page = board.page(3, after)
+        if not page:
+            break
+        seen.extend(page)
+        last = page[-1]
+        after = QuizLeaderboard.sort_key(last["best_score"], last["submitted_at"], last["user_id"])
+
+    assert [entry["rank"] for entry in seen] == list(range(1, 8))
+    assert [entry["user_id"] for entry in seen] == [entry["user_id"] for entry in board.page(7)]
+    assert len({entry["user_id"] for entry in seen}) == 7
+
+
+def test_registry_replays_offers_made_while_loading():
+    registry = LeaderboardRegistry(max_quizzes=2)
+    registry.begin_load(1)
+    registry.offer(1, 9, 7, at(5), 500)
+    board = registry.install(1, QuizLeaderboard())
+    assert board.rank(9)["best_score"] == 7
+    assert registry.get(1) is board
+
+
+def test_registry_ignores_offers_for_unloaded_quizzes():
+    registry = LeaderboardRegistry(max_quizzes=2)
+    registry.offer(1, 9, 7, at(5), 500)
+    assert registry.get(1) is None
+    board = registry.install(1, QuizLeaderboard())
+    assert len(board) == 0
+
+
+def test_registry_evicts_least_recently_used_and_invalidates():
+    registry = LeaderboardRegistry(max_quizzes=2)
+    for quiz_id in (1, 2):
+        registry.install(quiz_id, QuizLeaderboard())
+    registry.get(1)
+    registry.install(3, QuizLeaderboard())
+    assert registry.get(2) is None
+    assert registry.get(1) is not None
+
+    registry.invalidate(1)
+    assert registry.get(1) is None
+    assert registry.stats()["evictions"] == 1
+
+
+def test_registry_notifies_listeners_of_changes():
+    registry = LeaderboardRegistry(max_quizzes=2)
+    changed = []
+    registry.add_listener(changed.append)
+    registry.install(1, QuizLeaderboard())
+    registry.offer(1, 9, 7, at(0), 500)
+    registry.offer(1, 9, 3, at(1), 501)
+    assert changed == [1]
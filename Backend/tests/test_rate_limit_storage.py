@@ -0,0 +1,159 @@
+"""shm:// rate limit storage on a temporary file."""
+
+import multiprocessing
+import threading
+
+import pytest
+from limits.storage import storage_from_string
+
+from app import rate_limit_storage
+from app.rate_limit_storage import PROBE_SLOTS, SharedMemoryStorage
+
+
+class FakeClock:
+    """Stands in for the time module so slots get distinct last-used times."""
+
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def time(self):
+        self.now += 0.001
+        return self.now
+
+
+@pytest.fixture
+def uri(tmp_path):
+    return f"shm://{tmp_path / 'rate-limits'}"
+
+
+@pytest.fixture
+def storage(uri):
+    storage = SharedMemoryStorage(uri, slots=256, stripes=4)
+    yield storage
+    storage.close()
+
+
+def hit(uri, key, times):
+    """Worker process: count ``times`` hits on ``key`` through its own mapping."""
+    storage = SharedMemoryStorage(uri, slots=256, stripes=4)
+    try:
+        for _ in range(times):
+            storage.incr(key, 60)
+    finally:
+        storage.close()
+
+
+def test_registered_for_shm_scheme(uri):
+    storage = storage_from_string(uri, slots=64, stripes=2)
+    try:
+        assert isinstance(storage, SharedMemoryStorage)
+        assert storage.check()
+    finally:
+        storage.close()
+
+
+def test_fixed_window_counts(storage):
+    assert storage.incr("login/1.2.3.4", 60) == 1
+    assert storage.incr("login/1.2.3.4", 60, amount=2) == 3
+    assert storage.get("login/1.2.3.4") == 3
+    assert storage.get("login/5.6.7.8") == 0
+
+    storage.clear("login/1.2.3.4")
+    assert storage.get("login/1.2.3.4") == 0
+
+
+def test_fixed_window_expires(storage, monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit_storage, "time", clock)
+    storage.incr("key", 10)
+    assert storage.get("key") == 1
+    clock.now += 10
+    assert storage.get("key") == 0
+    assert storage.incr("key", 10) == 1
+
+
+def test_sliding_window_rejects_over_limit(storage):
+    # An hour-long window, so the test cannot straddle a window boundary
+    for _ in range(3):
+        assert storage.acquire_sliding_window_entry("key", 3, 3600)
+    assert not storage.acquire_sliding_window_entry("key", 3, 3600)
+
+    previous, _, current, _ = storage.get_sliding_window("key", 3600)
+    assert (previous, current) == (0, 3)
+    assert storage.stats()["rejects"] == 1
+
+
+def test_sliding_window_weighs_previous_window(storage, monkeypatch):
+    clock = FakeClock(now=3600.0)
+    monkeypatch.setattr(rate_limit_storage, "time", clock)
+    for _ in range(4):
+        assert storage.acquire_sliding_window_entry("key", 4, 60)
+
+    # 16s into the next window, 44/60 of the previous one still overlaps
+    # the sliding window: 4 * 44 / 60 = 2.93 counts, so two more hits fit
+    clock.now = 3600.0 + 60 + 16
+    assert storage.acquire_sliding_window_entry("key", 4, 60)
+    assert storage.acquire_sliding_window_entry("key", 4, 60)
+    assert not storage.acquire_sliding_window_entry("key", 4, 60)
+    previous, _, current, _ = storage.get_sliding_window("key", 60)
+    assert (previous, current) == (4, 2)
+
+
+def test_evicts_least_recently_used_key(uri, monkeypatch):
+    monkeypatch.setattr(rate_limit_storage, "time", FakeClock())
+    # One stripe of PROBE_SLOTS slots: every key competes for the same slots
+    storage = SharedMemoryStorage(uri, slots=PROBE_SLOTS, stripes=1)
+    try:
+        keys = [f"key-{n}" for n in range(PROBE_SLOTS)]
+        for key in keys:
+            storage.incr(key, 60)
+        # Reading a key makes it recently used
+        assert storage.get(keys[0]) == 1
+
+        storage.incr("newcomer", 60)
+        assert storage.get("newcomer") == 1
+        assert storage.get(keys[0]) == 1
+        assert storage.get(keys[1]) == 0
+
+        stats = storage.stats()
+        assert stats["evictions"] == 1
+        assert stats["live_keys"] == PROBE_SLOTS
+    finally:
+        storage.close()
+
+
+def test_concurrent_threads_do_not_lose_hits(storage):
+    threads = [
+        threading.Thread(target=lambda: [storage.incr("key", 60) for _ in range(500)])
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert storage.get("key") == 4000
+
+
+def test_processes_share_counts(uri, storage):
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=hit, args=(uri, "key", 300)) for _ in range(2)]
+    for worker in workers:
+        worker.start()
+    for _ in range(300):
+        storage.incr("key", 60)
+    for worker in workers:
+        worker.join(60)
+        assert worker.exitcode == 0
+    assert storage.get("key") == 900
+
+
+def test_replaces_table_with_another_layout(uri, storage):
+    storage.incr("key", 60)
+    resized = SharedMemoryStorage(uri, slots=512, stripes=4)
+    try:
+        assert resized.slots == 512
+        assert resized.get("key") == 0
+        # The old mapping keeps working for processes that still hold it
+        assert storage.get("key") == 1
+    finally:
+        resized.close()
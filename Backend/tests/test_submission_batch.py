@@ -0,0 +1,199 @@
+"""Group-commit submission writer, with the database writes replaced."""
+
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from app.models.Submission_Model import SubmissionBase
+from app.services import Submission_Batch_Services
+from app.services.Submission_Batch_Services import SubmissionBatchWriter
+
+SUBMITTED_AT = datetime(2024, 1, 1, 12, 0)
+
+
+def submission(score: int = 1) -> SubmissionBase:
+    return SubmissionBase(user_id=1, quiz_id=2, score=score)
+
+
+class RecordingWriter(SubmissionBatchWriter):
+    """Records each batch instead of writing it; ``gate`` holds the first flush."""
+
+    def __init__(self, *args, gate=None, fail=False, **kwargs):
+        self.batches = []
+        self.flushing = threading.Event()
+        self.gate = gate
+        self.fail = fail
+        super().__init__(*args, **kwargs)
+
+    def _flush(self, batch):
+        self.flushing.set()
+        if self.gate is not None:
+            self.gate.wait(5)
+            self.gate = None
+        self.batches.append([s.score for s, _, _ in batch])
+        if self.fail:
+            raise RuntimeError("batch failed")
+        for s, _, future in batch:
+            future.set_result((s.score, SUBMITTED_AT))
+
+
+def test_collects_queued_submissions_into_batches():
+    gate = threading.Event()
+    writer = RecordingWriter(max_rows=3, max_delay_ms=0, max_queue=100, gate=gate)
+    futures = [writer.submit(submission(0))]
+    # The flusher is now held inside the first batch while the rest queue up
+    assert writer.flushing.wait(5)
+    futures += [writer.submit(submission(score)) for score in range(1, 8)]
+    gate.set()
+
+    assert [future.result(5)[0] for future in futures] == list(range(8))
+    writer.close(5)
+    assert writer.batches == [[0], [1, 2, 3], [4, 5, 6], [7]]
+    assert writer.stats()["queued"] == 0
+
+
+def test_waits_up_to_max_delay_for_more_rows():
+    writer = RecordingWriter(max_rows=10, max_delay_ms=1000, max_queue=100)
+    futures = [writer.submit(submission(score)) for score in range(3)]
+    for future in futures:
+        future.result(5)
+    writer.close(5)
+    assert writer.batches == [[0, 1, 2]]
+
+
+def test_failed_batch_is_retried_row_by_row(monkeypatch):
+    written = []
+
+    def write_submission(s, answers=()):
+        if s.score < 0:
+            raise RuntimeError("bad row")
+        written.append((s.score, list(answers)))
+        return s.score, SUBMITTED_AT
+
+    monkeypatch.setattr(Submission_Batch_Services, "write_submission", write_submission)
+    gate = threading.Event()
+    writer = RecordingWriter(max_rows=10, max_delay_ms=0, max_queue=100, gate=gate, fail=True)
+    first = writer.submit(submission(0))
+    assert writer.flushing.wait(5)
+    good = writer.submit(submission(1), [(10, 100), (11, 110)])
+    bad = writer.submit(submission(-1))
+    gate.set()
+
+    assert first.result(5) == (0, SUBMITTED_AT)
+    assert good.result(5) == (1, SUBMITTED_AT)
+    with pytest.raises(RuntimeError, match="bad row"):
+        bad.result(5)
+    writer.close(5)
+    assert writer.batches == [[0], [1, -1]]
+    assert written == [(0, []), (1, [(10, 100), (11, 110)])]
+
+
+def test_close_flushes_queued_rows_without_waiting_for_max_delay():
+    writer = RecordingWriter(max_rows=100, max_delay_ms=60_000, max_queue=100)
+    futures = [writer.submit(submission(score)) for score in range(3)]
+
+    started = time.monotonic()
+    writer.close(5)
+    assert time.monotonic() - started < 5
+    assert all(future.done() for future in futures)
+    assert writer.batches == [[0, 1, 2]]
+
+    with pytest.raises(HTTPException) as rejected:
+        writer.submit(submission())
+    assert rejected.value.status_code == 503
+
+
+def test_full_queue_is_rejected():
+    gate = threading.Event()
+    writer = RecordingWriter(max_rows=10, max_delay_ms=0, max_queue=1, gate=gate)
+    writer.submit(submission(0))
+    assert writer.flushing.wait(5)
+    queued = writer.submit(submission(1))
+    with pytest.raises(HTTPException) as rejected:
+        writer.submit(submission(2))
+    assert rejected.value.status_code == 503
+
+    gate.set()
+    assert queued.result(5)[0] == 1
+    writer.close(5)
+
+
+class FakeCursor:
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, sql, params=None):
+        self.statements.append((sql, params))
+
+    def fetchall(self):
+        # Ids reserved by RESERVE_SUBMISSION_IDS_SQL
+        return [(500 + n,) for n in range(self.statements[-1][1][0])]
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self):
+        self.cursor_ = FakeCursor()
+        self.commits = 0
+
+    def cursor(self, *args, **kwargs):
+        return self.cursor_
+
+    def commit(self):
+        self.commits += 1
+
+
+def test_flush_writes_answers_under_each_reserved_id(monkeypatch):
+    conn = FakeConnection()
+    values = {}
+    recorded = []
+
+    @contextmanager
+    def get_db_connection():
+        yield conn
+
+    def execute_values(cur, sql, rows, template=None, page_size=100, fetch=False):
+        values[sql] = rows
+        if fetch:
+            return [(row[0], SUBMITTED_AT) for row in reversed(rows)]
+
+    monkeypatch.setattr(Submission_Batch_Services, "get_db_connection", get_db_connection)
+    monkeypatch.setattr(Submission_Batch_Services.psycopg2.extras, "execute_values", execute_values)
+    monkeypatch.setattr(
+        Submission_Batch_Services, "record_submissions", lambda cur, rows: recorded.extend(rows)
+    )
+
+    writer = SubmissionBatchWriter(max_rows=10, max_delay_ms=0, max_queue=10)
+    futures = [Submission_Batch_Services.Future() for _ in range(3)]
+    batch = [
+        (submission(4), [(1, 11), (2, 21)], futures[0]),
+        (submission(0), (), futures[1]),
+        (submission(2), [(1, 12)], futures[2]),
+    ]
+    writer._flush(batch)
+    writer.close(5)
+
+    assert [future.result(0) for future in futures] == [
+        (500, SUBMITTED_AT),
+        (501, SUBMITTED_AT),
+        (502, SUBMITTED_AT),
+    ]
+    assert [row[:4] for row in values[Submission_Batch_Services.INSERT_SUBMISSIONS_SQL]] == [
+        (500, 1, 2, 4),
+        (501, 1, 2, 0),
+        (502, 1, 2, 2),
+    ]
+    assert values[Submission_Batch_Services.INSERT_USER_ANSWERS_SQL] == [
+        (500, 1, 11),
+        (500, 2, 21),
+        (502, 1, 12),
+    ]
+    assert [row[3] for row in recorded] == [500, 501, 502]
+    assert conn.commits == 1
+    assert writer.stats()["rows"] == 3
@@ -1,5 +1,5 @@
 import React, { useEffect, useState } from "react";
-import { getQustionsByQuiz, createSubmission } from "../services/api";
+import { getQustionsByQuiz, gradeSubmission } from "../services/api";
 import { useParams, useNavigate } from "react-router-dom";
 import "../styles/question.css";
 
@@ -13,6 +13,8 @@ function Question() {
   const [loading, setLoading] = useState(true);
   const [timeLeft, setTimeLeft] = useState(300); // 5 minutes per quiz by default
   const [isSubmitting, setIsSubmitting] = useState(false);
+  // One key per attempt, so a retried submit is not stored twice
+  const [attemptKey] = useState(() => crypto.randomUUID());
 
   useEffect(() => {
     getQustionsByQuiz(quizId)
@@ -59,32 +61,24 @@ function Question() {
   const handleSubmit = async () => {
     if (isSubmitting) return;
     setIsSubmitting(true);
-    let correct = 0,
-      wrong = 0;
-
-    questions.forEach((q) => {
-      const chosen = userAnswers[q.question_id];
-      const correctAns = q.answers.find((a) => a.is_correct);
-      if (chosen === correctAns?.answer_id) {
-        correct++;
-      } else {
-        wrong++;
-      }
-    });
 
     const userId = localStorage.getItem("user_id");
 
+    // The server knows the correct answers and computes the score
     const resultData = {
       user_id: parseInt(userId),
       quiz_id: parseInt(quizId),
-      score: correct,
-      submitted_at: new Date().toISOString(),
+      answers: Object.entries(userAnswers).map(([questionId, answerId]) => ({
+        question_id: parseInt(questionId),
+        answer_id: answerId,
+      })),
     };
 
     try {
-      await createSubmission(resultData);
+      const res = await gradeSubmission(resultData, attemptKey);
+      const correct = res.data.score;
       navigate(`/result/${quizId}`, {
-        state: { correct, wrong, total: questions.length },
+        state: { correct, wrong: questions.length - correct, total: questions.length },
       });
     } catch (err) {
       console.error("Error creating submission:", err);
@@ -76,8 +76,12 @@ export const updateAnswer = async (
   });
 };
 
-export const createSubmission = async (payload) => {
-  return API.post("/Submissions/createSubmission", payload);
+// Scores the selected answers on the server and stores the submission.
+// Retries with the same idempotencyKey are stored only once.
+export const gradeSubmission = async (payload, idempotencyKey) => {
+  return API.post("/Submissions/gradeSubmission", payload, {
+    headers: { "Idempotency-Key": idempotencyKey },
+  });
 };
 
 export const getQuizStatistics = async (quiz_id) => {